@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the HTML parser backends (core.parser_backends) on saved grant pages.
+
+Fixture pages are read from <fixtures>/<site_name>/*.html. They can be saved
+from the live portals with --fetch, which downloads the first detail pages of
+every regional site through its crawler (and the HTTP response cache).
+
+For every site and backend the script reports the median parse time per page
+and the memory growth of a fresh process holding all the site's parsed pages
+at once, which includes the memory allocated by the C parsers.
+
+Usage:
+    python -m benchmarks.parser_benchmark --fetch 5
+    python -m benchmarks.parser_benchmark --repeat 20 --json results.json
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.parser_backends import PARSER_BACKENDS, LXML_AVAILABLE, LexborHTMLParser, parse_html
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fetch_fixtures(fixtures_dir: str, pages_per_site: int):
+    """
+    Save the first detail pages of every regional site as fixtures.
+    
+    Args:
+        fixtures_dir (str): Directory receiving one sub-directory per site
+        pages_per_site (int): Number of detail pages saved per site
+    """
+    from crawlers.registry import create_crawler
+    
+    for site_name in config.REGIONAL_SITES:
+        crawler, _ = create_crawler("regional", site_name, max_pages=1)
+        if crawler is None:
+            continue
+        
+        try:
+            urls = crawler.get_grant_listing_urls()[:pages_per_site]
+        except Exception as e:
+            print(f"{site_name}: could not list grants ({e})")
+            continue
+        
+        site_dir = os.path.join(fixtures_dir, site_name)
+        os.makedirs(site_dir, exist_ok=True)
+        saved = 0
+        for i, url in enumerate(urls):
+            html = crawler.fetch_page(url)
+            if html:
+                with open(os.path.join(site_dir, f"{i}.html"), "w", encoding="utf-8") as f:
+                    f.write(html)
+                saved += 1
+        print(f"{site_name}: saved {saved} pages")
+
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, List[str]]:
+    """Read the fixture pages of every site."""
+    fixtures = {}
+    for site_dir in sorted(glob.glob(os.path.join(fixtures_dir, "*"))):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(site_dir, "*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+        if pages:
+            fixtures[os.path.basename(site_dir)] = pages
+    return fixtures
+
+
+def available_backends() -> List[str]:
+    """Backends that can run in this environment (no silent fallback to html.parser)."""
+    backends = ["html.parser"]
+    if LXML_AVAILABLE:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def time_parse(pages: List[str], backend: str, repeat: int) -> float:
+    """Median parse time of a page, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        for html in pages:
+            start = time.perf_counter()
+            parse_html(html, backend)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _rss_mb() -> float:
+    # Current resident set size where /proc is available, peak resident set size otherwise
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _memory_worker(pages: List[str], backend: str, queue: multiprocessing.Queue):
+    # Warm up the backend so that its imports are part of the baseline
+    parse_html("<html></html>", backend)
+    baseline = _rss_mb()
+    documents = [parse_html(html, backend) for html in pages]
+    queue.put(_rss_mb() - baseline)
+    del documents
+
+
+def measure_memory(pages: List[str], backend: str) -> Optional[float]:
+    """Memory growth, in MB, of a fresh process holding all pages parsed."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_memory_worker, args=(pages, backend, queue))
+    process.start()
+    try:
+        return queue.get(timeout=300)
+    except Exception:
+        return None
+    finally:
+        process.join()
+
+
+def run_benchmark(fixtures: Dict[str, List[str]], backends: List[str], repeat: int) -> List[Dict[str, Any]]:
+    """
+    Benchmark every backend on the fixture pages of every site.
+    
+    Returns:
+        List[Dict[str, Any]]: One result per site and backend
+    """
+    results = []
+    for site_name, pages in fixtures.items():
+        for backend in backends:
+            results.append({
+                "site": site_name,
+                "backend": backend,
+                "pages": len(pages),
+                "avg_page_kb": round(sum(len(html) for html in pages) / len(pages) / 1024, 1),
+                "median_parse_ms": round(time_parse(pages, backend, repeat), 3),
+                "memory_mb": measure_memory(pages, backend),
+            })
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"{'site':<24}{'backend':<14}{'pages':>6}{'page KB':>9}{'parse ms':>10}{'memory MB':>11}")
+    for result in results:
+        memory = "n/a" if result["memory_mb"] is None else f"{result['memory_mb']:.1f}"
+        print(f"{result['site']:<24}{result['backend']:<14}{result['pages']:>6}{result['avg_page_kb']:>9}"
+              f"{result['median_parse_ms']:>10.2f}{memory:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends on saved grant pages")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="Directory of the fixture pages (one sub-directory per site)")
+    parser.add_argument("--fetch", type=int, metavar="N", help="Save the first N detail pages of every regional site before benchmarking")
+    parser.add_argument("--backends", nargs="+", choices=PARSER_BACKENDS, help="Backends to benchmark (default: all available)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times every page is parsed for timing")
+    parser.add_argument("--json", type=str, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    
+    if args.fetch:
+        fetch_fixtures(args.fixtures, args.fetch)
+    
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No fixture pages found in {args.fixtures} (save some with --fetch N)")
+        return
+    
+    backends = [backend for backend in (args.backends or PARSER_BACKENDS) if backend in available_backends()]
+    results = run_benchmark(fixtures, backends, args.repeat)
+    print_results(results)
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,14 @@ from typing import Dict, Any, List
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 LOG_DIR = os.path.join(BASE_DIR, "logs")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, "checkpoints")
 
 # Create directories if they don't exist
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(LOG_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+os.makedirs(CHECKPOINT_DIR, exist_ok=True)
 
 # Request settings
 DEFAULT_TIMEOUT = 30  # seconds
@@ -16,6 +20,92 @@ DEFAULT_DELAY = 2.0  # seconds between requests
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_MAX_PAGES_PER_SITE = 100
 
+# Persistent HTTP response cache (can be overridden per site with a "cache" entry)
+HTTP_CACHE = {
+    "enabled": True,
+    "path": os.path.join(CACHE_DIR, "http_cache.sqlite"),
+    "max_age": 0,  # seconds a cached page is served without revalidation (0 = always revalidate)
+    "ttl": 7 * 24 * 3600,  # seconds after which a cached page is evicted
+    "max_size_mb": 500,  # least recently used pages are evicted above this size
+}
+
+# Adaptive per-host concurrency (AIMD, see core.adaptive_concurrency). The number of
+# requests in flight to a host grows while its latency and error rate stay healthy and
+# is cut on 429/503 responses or latency spikes. Can be overridden per site with an
+# "adaptive_concurrency" entry
+ADAPTIVE_CONCURRENCY = {
+    "enabled": True,
+    "initial_limit": 2,  # concurrent requests allowed to a host at first
+    "min_limit": 1,
+    "max_limit": 8,
+    "window": 20,  # recent responses whose p95 latency and error rate are evaluated
+    "latency_spike": 2.0,  # p95 above this multiple of the host's best p95 is a spike
+    "max_error_rate": 0.1,  # share of failed requests (5xx, timeouts) tolerated
+    "decrease_factor": 0.5,  # limit multiplier on throttling, errors or latency spikes
+    "max_retries": 2,  # retries of a 429/503 response after its Retry-After delay
+    "max_retry_after": 120,  # seconds, longer Retry-After values are capped
+}
+
+# Per-host circuit breaker (see core.circuit_breaker): after consecutive failed requests
+# (connection errors, timeouts, 5xx) a host is no longer requested until a trial request
+# succeeds, and its sites are reported as skipped. Can be overridden per site with a
+# "circuit_breaker" entry
+CIRCUIT_BREAKER = {
+    "enabled": True,
+    "failure_threshold": 5,  # consecutive failures opening the circuit
+    "recovery_timeout": 120,  # seconds before a trial request is sent to an open host
+    "half_open_max_calls": 1,  # trial requests allowed at once
+}
+
+# HTML parser backend: "html.parser", "lxml" (requires lxml) or "selectolax" (requires
+# selectolax, only for crawlers limited to select/select_one/text). Can be overridden
+# per site with a "parser" key
+PARSER_BACKEND = "html.parser"
+# Available values of PARSER_BACKEND and of the per-site "parser" key
+PARSER_BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+# Headless Chrome WebDrivers shared by all Selenium-based crawlers of a run
+SELENIUM_POOL = {
+    "size": 2,  # maximum number of Chrome instances alive at once
+    "max_pages": 200,  # a driver is restarted after loading this many pages...
+    "max_memory_mb": 1024,  # ...or once its JavaScript heap grows beyond this size
+    "checkout_timeout": 600,  # seconds a crawler waits for a free driver
+}
+
+# Requests blocked in headless Chrome, since they never affect the extracted grant data
+# (can be overridden per site with a "block_resources" entry)
+SELENIUM_BLOCKING = {
+    # "image", "font", "stylesheet" and/or "media"
+    "resource_types": ["image", "font", "media"],
+    # Chrome URL patterns ("*" matches any characters)
+    "url_patterns": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*connect.facebook.net*", "*hotjar.com*", "*matomo.js*", "*piwik.js*",
+        "*youtube.com/embed*", "*player.vimeo.com*", "*maps.googleapis.com*",
+    ],
+}
+
+# State of previously crawled grants used by incremental runs (main.py --incremental)
+INCREMENTAL_STATE_PATH = os.path.join(CACHE_DIR, "crawl_state.sqlite")
+
+# JSON endpoints called by the pages rendered with Selenium, recorded per site so that
+# later runs can request them directly (SeleniumCrawler.get_api_json)
+API_ENDPOINTS_PATH = os.path.join(CACHE_DIR, "api_endpoints.json")
+
+# Offline record/replay of fetched pages (main.py --record / --replay, see
+# core.fetch_archive). "mode" is None, "record" or "replay"; "latency" is the number
+# of seconds added to each replayed response, or "recorded" for the original duration
+FETCH_ARCHIVE = {
+    "mode": None,
+    "path": os.path.join(CACHE_DIR, "fetch_archive.warc.gz"),
+    "latency": 0,
+}
+
+# Settings overridden at run time (command line arguments, see main.run_crawler),
+# forwarded to the worker processes of the parse pool (see core.parse_pool)
+RUNTIME_SETTINGS = ["HTTP_CACHE", "PARSER_BACKEND", "SELENIUM_POOL", "FETCH_ARCHIVE", "CIRCUIT_BREAKER",
+                    "ADAPTIVE_CONCURRENCY", "CACHE_DIR", "INCREMENTAL_STATE_PATH", "API_ENDPOINTS_PATH"]
+
 # User agent rotation (to avoid getting blocked)
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -25,7 +115,42 @@ USER_AGENTS = [
     'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
 ]
 
-# Website configurations
+# Website configurations (the crawler class of each site is registered in crawlers/registry.py)
+#
+# Optional per-site keys:
+#   "rate_limit": {"requests_per_second": float, "burst": int}
+#       Token bucket shared by every crawler and thread requesting the site's host.
+#       Defaults to one request every `delay` seconds of the crawler, with no burst.
+#   "cache": {"enabled": bool, "max_age": int, "ttl": int}
+#       Overrides of the HTTP_CACHE settings for the site.
+#   "adaptive_concurrency": {"enabled": bool, "max_limit": int, ...}
+#       Overrides of the ADAPTIVE_CONCURRENCY settings for the site.
+#   "circuit_breaker": {"enabled": bool, "failure_threshold": int, ...}
+#       Overrides of the CIRCUIT_BREAKER settings for the site.
+#   "parser": "html.parser" | "lxml" | "selectolax"
+#       HTML parser backend of the site's crawler, overriding PARSER_BACKEND.
+#   "block_resources": {"resource_types": [...], "url_patterns": [...]}
+#       Overrides of the SELENIUM_BLOCKING settings for the site's Selenium pages.
+#   "regions": [selector, ...]
+#       Outermost containers of the detail page content (tag, class, id and attribute
+#       selectors such as "main", "div.scheda" or "#content"). Only these subtrees
+#       of the detail pages are parsed, overriding the crawler's detail_regions.
+#   "crawler": "generic"
+#       Crawl the site with core.generic_crawler.GenericCrawler (registered in
+#       crawlers.registry.CONFIG_CRAWLERS), driven only by this
+#       configuration, instead of a dedicated crawler class. It reads these keys:
+#       "selectors": {
+#           "list_items": items of the grants list, "link": grant link within an item,
+#           "next_page": link to the next list page (optional),
+#           "fields": {CSV column: selector of its text on the detail page},
+#           "dates": {date column ("Scadenza", "Data di apertura", ...): selector},
+#           "attachments": section holding the attachment links (optional),
+#           "fingerprint": section used to detect changed grants (optional),
+#       }
+#       "static": {CSV column: value set on every grant of the site}
+#       "max_listing_pages": list pages followed at most (default 20), pagination
+#           also stops once the crawler's max_pages grants are found
+#       "document_target_words": site-specific document types to detect
 REGIONAL_SITES = {
     "vda": {
         "name": "Valle d'Aosta",
@@ -55,7 +180,8 @@ REGIONAL_SITES = {
             "list_items": ".card.card-bg.card-big",
             "link": "a:contains('Scopri di più')",
             "title": "h1",
-        }
+        },
+        "rate_limit": {"requests_per_second": 2.0, "burst": 4},
     },
     "veneto": {
         "name": "Veneto",
@@ -79,8 +205,8 @@ REGIONAL_SITES = {
     },
     "emilia_romagna": {
         "name": "Emilia Romagna",
-        "base_url": "https://bandi.regione.emilia-romagna.it",
-        "grants_url": "/it/ricerca-bandi",
+        "base_url": "https://imprese.regione.emilia-romagna.it",
+        "grants_url": "/bandi",
         "selectors": {
             "list_items": ".item",
             "link": "a",
@@ -89,8 +215,8 @@ REGIONAL_SITES = {
     },
     "trentino_alto_adige": {
         "name": "Trentino Alto Adige",
-        "base_url": "https://www.regione.taa.it",
-        "grants_url": "/it/bandi",
+        "base_url": "https://www.provincia.tn.it",
+        "grants_url": "/contributi-finanziamenti",
         "selectors": {
             "list_items": ".article",
             "link": "a",
@@ -171,10 +297,30 @@ REGIONAL_SITES = {
         "name": "Campania",
         "base_url": "https://www.regione.campania.it",
         "grants_url": "/tematiche/attivita-economiche/bandi",
+        "crawler": "generic",
+        "regions": ["main"],
         "selectors": {
             "list_items": ".item",
             "link": "a",
             "title": "h4",
+            "next_page": ".pagination a[rel='next']",
+            "fields": {
+                "Nome del bando": "h1",
+                "Descrizione breve (Plain text)": ".abstract",
+                "Descrizione del bando": ".content-text",
+                "A chi si rivolge": ".destinatari",
+                "Dotazione": ".dotazione",
+            },
+            "dates": {
+                "Scadenza": ".scadenza",
+                "Data di apertura": ".data-apertura",
+            },
+            "attachments": ".allegati",
+            "fingerprint": "main",
+        },
+        "static": {
+            "Emanazione": "Regionale",
+            "Località_MR": "Campania",
         }
     },
     "puglia": {
@@ -215,16 +361,36 @@ REGIONAL_SITES = {
             "list_items": ".list-item",
             "link": "a",
             "title": "h3",
-        }
+        },
+        "rate_limit": {"requests_per_second": 0.5, "burst": 1},
     },
     "sardegna": {
         "name": "Sardegna",
         "base_url": "https://www.regione.sardegna.it",
         "grants_url": "/it/bandi-e-gare",
+        "crawler": "generic",
+        "regions": ["main"],
         "selectors": {
             "list_items": ".article",
             "link": "a",
             "title": "h3",
+            "next_page": ".pager a[rel='next']",
+            "fields": {
+                "Nome del bando": "h1",
+                "Descrizione breve (Plain text)": ".sommario",
+                "Descrizione del bando": ".testo",
+                "Promotore del bando": ".struttura",
+            },
+            "dates": {
+                "Scadenza": ".scadenza",
+                "Data di apertura": ".data-pubblicazione",
+            },
+            "attachments": ".allegati",
+            "fingerprint": "main",
+        },
+        "static": {
+            "Emanazione": "Regionale",
+            "Località_MR": "Sardegna",
         }
     }
 }
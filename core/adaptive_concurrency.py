@@ -0,0 +1,261 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import config
+from core.site_config import find_site_config
+
+logger = logging.getLogger("AdaptiveConcurrency")
+
+# Status codes of a host asking its clients to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value (str, optional): Header value, in seconds or as an HTTP date
+    
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe AIMD limit on the number of requests in flight to a single host.
+    
+    Every healthy response raises the limit by 1/limit (about one more concurrent
+    request per round of responses) up to max_limit. The limit is multiplied by
+    decrease_factor when the host answers 429 or 503, when the share of failed
+    requests among the last `window` responses exceeds max_error_rate, or when
+    their p95 latency exceeds latency_spike times the best p95 seen for the host.
+    Responses to requests sent before the last decrease belong to the same episode
+    and do not cut the limit again.
+    
+    429/503 responses also pause the host for their Retry-After delay (or an
+    exponential backoff without one); acquire waits for the pause to end.
+    """
+    
+    def __init__(self, host: str, enabled: bool = True, initial_limit: int = 2, min_limit: int = 1,
+                 max_limit: int = 8, window: int = 20, latency_spike: float = 2.0,
+                 max_error_rate: float = 0.1, decrease_factor: float = 0.5, max_retries: int = 2,
+                 max_retry_after: float = 120):
+        """
+        Initialize the limiter with the settings of config.ADAPTIVE_CONCURRENCY.
+        
+        Args:
+            host (str): Host of the limited requests, used in log messages
+            enabled (bool): Limit the concurrency (when False only pauses are applied)
+            initial_limit (int): Concurrent requests allowed at first
+            min_limit (int): Lower bound of the limit
+            max_limit (int): Upper bound of the limit
+            window (int): Number of recent responses evaluated
+            latency_spike (float): Multiple of the best p95 latency considered a spike
+            max_error_rate (float): Share of failed requests tolerated in the window
+            decrease_factor (float): Multiplier of the limit on a decrease
+            max_retries (int): Retries of a 429/503 response (see BaseCrawler.send_request)
+            max_retry_after (float): Upper bound of a pause in seconds
+        """
+        self.host = host
+        self.enabled = enabled
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.window = max(1, window)
+        self.latency_spike = latency_spike
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        
+        self.in_flight = 0
+        self.best_p95: Optional[float] = None
+        # Latencies of the recent responses (None for failed requests)
+        self._samples: deque = deque(maxlen=self.window)
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._throttled = 0  # Consecutive 429/503 responses
+        self._condition = threading.Condition()
+    
+    @property
+    def max_in_flight(self) -> Optional[int]:
+        """Current number of concurrent requests allowed (None if not limited)."""
+        return int(self.limit) if self.enabled else None
+    
+    def ready_in(self) -> float:
+        """
+        Time until the host's pause ends, without acquiring a slot.
+        
+        Returns:
+            float: Seconds until requests may be sent (0 if the host is not paused)
+        """
+        with self._condition:
+            return max(0.0, self._paused_until - time.monotonic())
+    
+    def acquire(self):
+        """Block until the host is not paused and a request slot is free."""
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif not self.enabled or self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                else:
+                    self._condition.wait()
+    
+    def try_acquire(self, poll_interval: float = 0.05) -> float:
+        """
+        Take a request slot without blocking, for callers on an event loop (see AsyncFetchEngine).
+        
+        Args:
+            poll_interval (float): Seconds to wait before trying again when all slots are taken
+        
+        Returns:
+            float: 0 if a slot was taken, otherwise seconds to wait before trying again
+        """
+        with self._condition:
+            wait = self._paused_until - time.monotonic()
+            if wait > 0:
+                return wait
+            if not self.enabled or self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return 0.0
+            return poll_interval
+    
+    def release(self, started: float, status: Optional[int], retry_after: Optional[str] = None):
+        """
+        Free the slot of a completed request and adapt the limit to its outcome.
+        
+        Args:
+            started (float): time.monotonic() when the request was sent
+            status (int, optional): HTTP status, or None if the request failed without response
+            retry_after (str, optional): Retry-After header of the response
+        """
+        latency = time.monotonic() - started
+        
+        with self._condition:
+            self.in_flight -= 1
+            
+            if status in THROTTLE_STATUSES:
+                self._pause(parse_retry_after(retry_after))
+                self._decrease(started, f"HTTP {status}")
+            else:
+                self._throttled = 0
+                failed = status is None or status >= 500
+                self._samples.append(None if failed else latency)
+                self._adapt(started)
+            
+            self._condition.notify_all()
+    
+    def _pause(self, retry_after: Optional[float]):
+        self._throttled += 1
+        if retry_after is None:
+            retry_after = 2.0 ** self._throttled
+        pause = min(retry_after, self.max_retry_after)
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        logger.warning(f"{self.host} is throttling requests, pausing for {pause:.1f}s")
+    
+    def _decrease(self, started: float, reason: str):
+        if not self.enabled or started < self._last_decrease:
+            return
+        
+        self._last_decrease = time.monotonic()
+        limit = max(self.min_limit, self.limit * self.decrease_factor)
+        if int(limit) < int(self.limit):
+            logger.info(f"Lowering concurrency of {self.host} to {int(limit)} ({reason})")
+        self.limit = limit
+        self._samples.clear()
+    
+    def _adapt(self, started: float):
+        if not self.enabled or len(self._samples) < max(1, self.window // 4):
+            return
+        
+        latencies = sorted(latency for latency in self._samples if latency is not None)
+        error_rate = 1 - len(latencies) / len(self._samples)
+        p95 = latencies[math.ceil(0.95 * len(latencies)) - 1] if latencies else None
+        
+        if error_rate > self.max_error_rate:
+            self._decrease(started, f"{error_rate:.0%} failed requests")
+            return
+        
+        if p95 is not None and self.best_p95 is not None and p95 > self.latency_spike * self.best_p95:
+            if int(self.limit) <= self.min_limit:
+                # Even a single request at a time is this slow: the host got slower
+                # rather than overloaded by us, so its new latency becomes the reference
+                self.best_p95 = p95
+            else:
+                self._decrease(started, f"p95 latency {p95:.2f}s")
+            return
+        
+        if p95 is not None:
+            self.best_p95 = p95 if self.best_p95 is None else min(self.best_p95, p95)
+        
+        limit = min(self.max_limit, self.limit + 1 / self.limit)
+        if int(limit) > int(self.limit):
+            logger.debug(f"Raising concurrency of {self.host} to {int(limit)}")
+        self.limit = limit
+
+
+def get_adaptive_settings(url: str) -> Dict[str, Any]:
+    """
+    Get the adaptive concurrency settings that apply to a URL.
+    
+    The global config.ADAPTIVE_CONCURRENCY values are overridden by the
+    "adaptive_concurrency" entry of the matching site configuration.
+    
+    Args:
+        url (str): Absolute URL
+    
+    Returns:
+        Dict[str, Any]: Keyword arguments of AdaptiveConcurrencyLimiter
+    """
+    settings = dict(config.ADAPTIVE_CONCURRENCY)
+    settings.update(find_site_config(url).get("adaptive_concurrency", {}))
+    return settings
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(url: str) -> AdaptiveConcurrencyLimiter:
+    """
+    Get the concurrency limiter shared by all crawlers and threads requesting a host.
+    
+    Args:
+        url (str): Absolute URL about to be requested
+    
+    Returns:
+        AdaptiveConcurrencyLimiter: Limiter of the URL's host
+    """
+    host = urlparse(url).netloc
+    
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(host, **get_adaptive_settings(url))
+            _limiters[host] = limiter
+        return limiter
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import threading
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+
+import config
+
+logger = logging.getLogger("ApiCapture")
+
+# Resource types of the DevTools Network domain issued by page scripts
+_SCRIPT_REQUEST_TYPES = {"XHR", "Fetch"}
+
+
+def extract_api_requests(log_entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract the JSON XHR/fetch requests of a page from Chrome's performance log.
+    
+    Args:
+        log_entries (List[Dict[str, Any]]): Entries of driver.get_log("performance")
+    
+    Returns:
+        List[Dict[str, Any]]: Successful JSON requests, as endpoints with "url", "method",
+        "post_data" and "content_type" keys, in the order they were sent
+    """
+    requests_by_id = {}
+    endpoints = []
+    
+    for entry in log_entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent" and params.get("type") in _SCRIPT_REQUEST_TYPES:
+            request = params["request"]
+            headers = {name.lower(): value for name, value in request.get("headers", {}).items()}
+            requests_by_id[params["requestId"]] = {
+                "url": request["url"],
+                "method": request.get("method", "GET"),
+                "post_data": request.get("postData"),
+                "content_type": headers.get("content-type"),
+            }
+        elif message.get("method") == "Network.responseReceived":
+            endpoint = requests_by_id.pop(params.get("requestId"), None)
+            response = params.get("response", {})
+            if endpoint and response.get("status") == 200 and "json" in response.get("mimeType", ""):
+                if endpoint not in endpoints:
+                    endpoints.append(endpoint)
+    
+    return endpoints
+
+
+class ApiEndpointStore:
+    """
+    JSON file of the API endpoints called by the pages of each site.
+    
+    Endpoints are recorded while a page is rendered with Selenium, so that later
+    runs can request the data directly with the crawler's requests session.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store, loading the endpoints recorded by previous runs.
+        
+        Args:
+            path (str): Path of the JSON file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._endpoints = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load API endpoints from {path}: {e}")
+    
+    @staticmethod
+    def _site(page_url: str) -> str:
+        return urlparse(page_url).netloc
+    
+    def get(self, page_url: str) -> List[Dict[str, Any]]:
+        """Endpoints recorded for a page, in the order the page called them."""
+        with self._lock:
+            return list(self._endpoints.get(self._site(page_url), {}).get(page_url, []))
+    
+    def _save(self):
+        # Write to a temporary file first so a crash never leaves a truncated store
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._endpoints, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def record(self, page_url: str, endpoints: List[Dict[str, Any]]):
+        """
+        Record the endpoints called by a page, replacing those of a previous discovery.
+        
+        Args:
+            page_url (str): URL of the rendered page
+            endpoints (List[Dict[str, Any]]): Endpoints returned by extract_api_requests
+        """
+        with self._lock:
+            self._endpoints.setdefault(self._site(page_url), {})[page_url] = endpoints
+            self._save()
+    
+    def forget(self, page_url: str):
+        """Drop the endpoints of a page, e.g. when they no longer answer."""
+        with self._lock:
+            if self._endpoints.get(self._site(page_url), {}).pop(page_url, None) is not None:
+                self._save()
+
+
+_store: Optional[ApiEndpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_api_endpoint_store() -> ApiEndpointStore:
+    """
+    Get the process-wide API endpoint store (config.API_ENDPOINTS_PATH).
+    
+    Returns:
+        ApiEndpointStore: Shared store
+    """
+    global _store
+    
+    with _store_lock:
+        if _store is None:
+            _store = ApiEndpointStore(config.API_ENDPOINTS_PATH)
+        return _store
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+
+from core.base_crawler import BaseCrawler
+from core.http_cache import get_response_cache, get_cache_settings, conditional_headers
+from core.rate_limiter import get_rate_limiter
+from core.adaptive_concurrency import THROTTLE_STATUSES, AdaptiveConcurrencyLimiter, get_concurrency_limiter
+from core.circuit_breaker import get_circuit_breaker
+from core.fetch_archive import REPLAY, get_fetch_archive
+
+
+class AsyncFetchEngine:
+    """
+    Event-loop based fetch engine that keeps many requests in flight across sites.
+    
+    Detail pages are downloaded concurrently with aiohttp and handed to the
+    crawler through BaseCrawler.prefetch_page, so the existing synchronous
+    parse_grant_details implementations work unchanged.
+    """
+    
+    def __init__(self, max_in_flight: int = 50, per_host: int = 2, timeout: int = 30):
+        """
+        Initialize the async fetch engine.
+        
+        Args:
+            max_in_flight (int): Maximum number of concurrent requests overall
+            per_host (int): Maximum number of concurrent requests per host
+            timeout (int): Request timeout in seconds
+        """
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self.timeout = timeout
+        self.logger = logging.getLogger("AsyncFetchEngine")
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+    
+    async def __aenter__(self):
+        self._global_slots = asyncio.Semaphore(self.max_in_flight)
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.per_host)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+    
+    async def fetch(self, url: str, crawler: BaseCrawler) -> Optional[str]:
+        """
+        Fetch a page body on behalf of a crawler.
+        
+        Args:
+            url (str): URL to fetch
+            crawler (BaseCrawler): Crawler whose headers and politeness settings apply
+        
+        Returns:
+            Optional[str]: Page body, or None if the request failed
+        """
+        url = crawler.absolute_url(url)
+        host = urlparse(url).netloc
+        host_slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        
+        # Same response cache as BaseCrawler.fetch_page
+        cache_key = requests.Request('GET', url).prepare().url
+        
+        # Same fetch archive as BaseCrawler.fetch_page, with the latency injected on the loop
+        archive = get_fetch_archive()
+        if archive is not None and archive.mode == REPLAY:
+            archived = archive.lookup(cache_key)
+            await asyncio.sleep(archive.delay(archived))
+            return archived.body if archived is not None and archived.ok else None
+        
+        cache_settings = get_cache_settings(url)
+        cache = get_response_cache() if cache_settings["enabled"] else None
+        cached = cache.get(cache_key, cache_settings["ttl"]) if cache else None
+        
+        if cached and time.time() - cached["stored_at"] < cache_settings["max_age"]:
+            if archive is not None:
+                archive.record(cache_key, cached["status"], cached["headers"], cached["body"])
+            return cached["body"]
+        
+        headers = dict(crawler.session.headers)
+        if cached:
+            headers.update(conditional_headers(cached))
+        
+        limiter = get_concurrency_limiter(url)
+        attempt = 0
+        
+        while True:
+            # Same per-host token bucket as the blocking crawlers, without blocking the loop
+            wait = get_rate_limiter(url, crawler.delay).reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            async with self._global_slots, host_slots:
+                # Hosts with an open circuit are left to the crawler's session, which fails fast
+                breaker = get_circuit_breaker(url)
+                if not breaker.allow_request():
+                    return None
+                
+                crawler.logger.info(f"Fetching page (async): {url}")
+                
+                settled = False
+                started = None
+                status = retry_after = html = None
+                try:
+                    # Same adaptive concurrency limit as BaseCrawler.send_request
+                    await self._acquire_slot(limiter)
+                    started = time.monotonic()
+                    async with self.session.get(url, headers=headers) as response:
+                        status, retry_after = response.status, response.headers.get("Retry-After")
+                        if status >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                        settled = True
+                        
+                        # Throttled requests are retried below once the host's pause is over
+                        if status not in THROTTLE_STATUSES or attempt >= limiter.max_retries:
+                            if cached and status == 304:
+                                cache.mark_revalidated(cache_key)
+                                if archive is not None:
+                                    archive.record(cache_key, cached["status"], cached["headers"], cached["body"],
+                                                   time.monotonic() - started)
+                                return cached["body"]
+                            
+                            response.raise_for_status()
+                            # Undecodable bytes are replaced, as requests does for response.text
+                            html = await response.text(errors="replace")
+                            if archive is not None:
+                                archive.record(cache_key, status, dict(response.headers), html,
+                                               time.monotonic() - started)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if not isinstance(e, aiohttp.ClientResponseError):
+                        breaker.record_failure()
+                        settled = True
+                        status = None
+                    crawler.logger.error(f"Error fetching page {url}: {e}")
+                    return None
+                except Exception as e:
+                    # The page is fetched again by the crawler's blocking session
+                    crawler.logger.error(f"Error fetching page {url}: {e}")
+                    return None
+                finally:
+                    if started is not None:
+                        limiter.release(started, status, retry_after)
+                    # As in BaseCrawler.send_request, errors unrelated to the host free the half-open trial
+                    if not settled:
+                        breaker.release_trial()
+            
+            if html is not None:
+                break
+            attempt += 1
+            crawler.logger.warning(f"HTTP {status} from {url}, retrying ({attempt}/{limiter.max_retries})")
+        
+        if cache:
+            cache.store(cache_key, status, response.headers, html)
+        
+        return html
+    
+    async def _acquire_slot(self, limiter: AdaptiveConcurrencyLimiter):
+        # The limiter is shared with the crawler threads, so its slots are polled
+        # instead of waited for on its condition
+        while True:
+            wait = limiter.try_acquire()
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+    
+    async def crawl(self, crawler: BaseCrawler) -> List[Dict[str, Any]]:
+        """
+        Crawl a site, downloading its grant detail pages concurrently.
+        
+        The listing is still collected by the crawler's own get_grant_listing_urls
+        (run in a worker thread), since pagination is discovered while parsing.
+        
+        Args:
+            crawler (BaseCrawler): Crawler of the site to crawl
+        
+        Returns:
+            List[Dict[str, Any]]: List of grant details
+        """
+        loop = asyncio.get_running_loop()
+        crawler.logger.info(f"Starting to crawl {crawler.base_url} (async)")
+        
+        grant_urls = await loop.run_in_executor(None, crawler.discover_grant_urls)
+        grant_urls = grant_urls[:crawler.max_pages]
+        crawler.logger.info(f"Found {len(grant_urls)} grant listings")
+        
+        # Grants already parsed by a checkpointed attempt are not downloaded again
+        if crawler.checkpoint is not None:
+            to_fetch = [url for url in grant_urls if crawler.checkpoint.get_grant(url) is None]
+        else:
+            to_fetch = grant_urls
+        
+        # A failing page must not cancel the others
+        pages = await asyncio.gather(*(self.fetch(url, crawler) for url in to_fetch), return_exceptions=True)
+        for url, html in zip(to_fetch, pages):
+            # Failed downloads fall back to the crawler's blocking session
+            if isinstance(html, BaseException):
+                crawler.logger.error(f"Error fetching page {url}: {html}")
+            elif html is not None:
+                crawler.prefetch_page(url, html)
+        
+        grants = await loop.run_in_executor(None, crawler.crawl_grants, grant_urls)
+        crawler.logger.info(f"Successfully crawled {len(grants)} grants")
+        return grants
@@ -1,19 +1,62 @@
+import hashlib
 import logging
 import time
 import requests
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+import config
+from core.http_cache import get_response_cache, get_cache_settings, conditional_headers
+from core.rate_limiter import get_rate_limiter
+from core.adaptive_concurrency import THROTTLE_STATUSES, get_concurrency_limiter
+from core.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from core.fetch_archive import REPLAY, get_fetch_archive
+from core.checkpoint import SiteCheckpoint
+from core.state_store import CrawlStateStore, StoredGrant
+from core.document_matcher import DOCUMENT_TARGET_WORDS, get_document_matcher
+from core.parser_backends import parse_html, strip_tags
+from core.site_config import find_site_config
+
+
+# Request errors caused by the host rather than the request, counted by its circuit breaker
+HOST_FAILURES = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.RetryError)
+
 
 class BaseCrawler(ABC):
     """
     Base crawler class providing common functionality for all website crawlers.
     """
     
+    # CSS selector of the detail page section used to detect changed grants in
+    # incremental runs (None = the text of the detail regions, or of the whole page)
+    fingerprint_selector: Optional[str] = None
+    
+    # Site-specific document types searched for in addition to DOCUMENT_TARGET_WORDS
+    document_target_words: List[str] = []
+    
+    # HTML parser backend of the crawler (see core.parser_backends). The "parser" key
+    # of the site configuration takes precedence, and None uses config.PARSER_BACKEND
+    parser_backend: Optional[str] = None
+    
+    # Regions of the detail pages read by parse_grant_details (simple CSS selectors of
+    # their outermost containers, see core.parser_backends.RegionStrainer). Only these
+    # subtrees are built; the "regions" key of the site configuration takes precedence,
+    # and None parses the whole page
+    detail_regions: Optional[List[str]] = None
+    
+    # Maximum number of the site's pages fetched at once by the crawl scheduler
+    # (see core.scheduler), for crawlers whose state is not thread-safe. None = no limit
+    max_concurrency: Optional[int] = None
+    
+    # Whether the crawler holds a WebDriver of the shared pool (see core.driver_pool)
+    # from its first page until it is closed
+    uses_webdriver: bool = False
+    
     def __init__(self, base_url: str, max_pages: int = 10, delay: float = 1.0, timeout: int = 30):
         """
         Initialize the base crawler.
@@ -21,7 +64,8 @@ class BaseCrawler(ABC):
         Args:
             base_url (str): The base URL of the website to crawl
             max_pages (int): Maximum number of pages to crawl
-            delay (float): Delay between requests in seconds
+            delay (float): Delay between requests in seconds, used when the site
+                has no "rate_limit" in config
             timeout (int): Request timeout in seconds
         """
         self.base_url = base_url
@@ -29,15 +73,21 @@ class BaseCrawler(ABC):
         self.delay = delay
         self.timeout = timeout
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        site_config = find_site_config(base_url)
+        self.parser_backend = site_config.get("parser") or self.parser_backend or config.PARSER_BACKEND
+        self.detail_regions = site_config.get("regions") or self.detail_regions
         
-        # Configure retry strategy
+        # Configure retry strategy (429 and 503 are retried by send_request, which
+        # honours Retry-After and reports them to the host's concurrency limiter)
         retry_strategy = Retry(
             total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 504],
+            respect_retry_after_header=False,
             allowed_methods=["GET"],
             backoff_factor=2
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Large enough connection pool for concurrent detail page fetching (see crawl)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=32)
         
         # Create session with retry strategy
         self.session = requests.Session()
@@ -46,35 +96,230 @@ class BaseCrawler(ABC):
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         })
+        
+        # Pages already downloaded by an external fetch engine (e.g. AsyncFetchEngine)
+        self._prefetched_pages: Dict[str, str] = {}
+        
+        # Incremental crawling: unchanged pages are answered from the state store
+        self.state_store: Optional[CrawlStateStore] = None
+        self.page_fingerprints: Dict[str, str] = {}
+        
+        # Checkpoint of the site within the current run, used to resume after a crash
+        self.checkpoint: Optional[SiteCheckpoint] = None
+        
+        # Hosts whose open circuit made requests of the crawler fail fast
+        self.skipped_hosts: Set[str] = set()
+        
+        # Pages that could not be fetched, and whether listing pages were among them
+        # (listing_incomplete), leaving no grant URL at all (listing_failed)
+        self.failed_fetches = 0
+        self.listing_incomplete = False
+        self.listing_failed = False
+    
+    def close(self):
+        """Release the resources held by the crawler (HTTP connections)."""
+        self.session.close()
+    
+    def absolute_url(self, url: str) -> str:
+        """
+        Resolve a possibly relative URL against the crawler's base URL.
+        
+        Args:
+            url (str): Absolute or relative URL
+            
+        Returns:
+            str: Absolute URL
+        """
+        if not url.startswith(('http://', 'https://')):
+            return urljoin(self.base_url, url)
+        return url
     
-    def get_page(self, url: str, params: Optional[Dict[str, Any]] = None) -> BeautifulSoup:
+    def prefetch_page(self, url: str, html: str):
+        """
+        Store a page body fetched outside the crawler so the next get_page call
+        for the same URL is served without touching the network.
+        
+        Args:
+            url (str): URL of the page
+            html (str): Raw HTML of the page
+        """
+        self._prefetched_pages[self.absolute_url(url)] = html
+    
+    def get_page(self, url: str, params: Optional[Dict[str, Any]] = None,
+                 regions: Optional[List[str]] = None) -> BeautifulSoup:
         """
         Fetch a page and return its BeautifulSoup object.
         
         Args:
             url (str): URL to fetch
             params (dict, optional): Query parameters
+            regions (List[str], optional): Only build the subtrees of these regions
+                (e.g. self.detail_regions)
             
         Returns:
             BeautifulSoup: Parsed HTML
         """
-        if not url.startswith(('http://', 'https://')):
-            url = urljoin(self.base_url, url)
+        html = self.fetch_page(url, params)
+        if html is None:
+            return None
+        
+        return self.parse_html(html, regions)
+    
+    def parse_html(self, html: str, regions: Optional[List[str]] = None) -> BeautifulSoup:
+        """
+        Parse HTML with the crawler's parser backend.
+        
+        Args:
+            html (str): Raw HTML
+            regions (List[str], optional): Only build the subtrees of these regions
+            
+        Returns:
+            BeautifulSoup: Parsed HTML (a SelectolaxDocument with the "selectolax" backend)
+        """
+        return parse_html(html, self.parser_backend, regions)
+    
+    def fetch_page(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Fetch the raw HTML of a page.
+        
+        Pages prefetched by an external engine are returned first. Otherwise the
+        response cache is consulted: fresh entries are served from disk and stale
+        ones are revalidated with a conditional GET. Pages are recorded in or
+        replayed from the fetch archive when one is configured (config.FETCH_ARCHIVE).
+        
+        Args:
+            url (str): URL to fetch
+            params (dict, optional): Query parameters
+            
+        Returns:
+            Optional[str]: Page HTML, or None if the request failed
+        """
+        url = self.absolute_url(url)
+        
+        if params is None:
+            html = self._prefetched_pages.pop(url, None)
+            if html is not None:
+                self.logger.debug(f"Using prefetched page: {url}")
+                return html
+        
+        cache_key = requests.Request('GET', url, params=params).prepare().url
+        
+        # Offline replay of a recorded run (see core.fetch_archive)
+        archive = get_fetch_archive()
+        if archive is not None and archive.mode == REPLAY:
+            archived = archive.replay(cache_key)
+            if archived is None:
+                self.logger.error(f"Page not in fetch archive: {cache_key}")
+                self.failed_fetches += 1
+                return None
+            if not archived.ok:
+                self.logger.error(f"Error fetching page {url}: HTTP {archived.status} (replayed)")
+                self.failed_fetches += 1
+                return None
+            return archived.body
+        
+        cache_settings = get_cache_settings(url)
+        cache = get_response_cache() if cache_settings["enabled"] else None
+        cached = cache.get(cache_key, cache_settings["ttl"]) if cache else None
+        
+        if cached and time.time() - cached["stored_at"] < cache_settings["max_age"]:
+            self.logger.debug(f"Using cached page: {cache_key}")
+            if archive is not None:
+                archive.record(cache_key, cached["status"], cached["headers"], cached["body"])
+            return cached["body"]
             
         self.logger.info(f"Fetching page: {url}")
         
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
+            headers = conditional_headers(cached) if cached else None
+            response = self.send_request(url, params=params, headers=headers)
+            
+            if cached and response.status_code == 304:
+                self.logger.debug(f"Page not modified, using cached copy: {cache_key}")
+                cache.mark_revalidated(cache_key)
+                if archive is not None:
+                    archive.record(cache_key, cached["status"], cached["headers"], cached["body"],
+                                   response.elapsed.total_seconds())
+                return cached["body"]
+            
+            if archive is not None:
+                archive.record(cache_key, response.status_code, response.headers, response.text,
+                               response.elapsed.total_seconds())
+            
             response.raise_for_status()
             
-            # Respect robots.txt and rate limit
-            time.sleep(self.delay)
+            if cache:
+                cache.store(cache_key, response.status_code, response.headers, response.text)
             
-            return BeautifulSoup(response.text, 'html.parser')
+            return response.text
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching page {url}: {e}")
+            self.failed_fetches += 1
             return None
     
+    def send_request(self, url: str, method: str = "GET", **kwargs) -> requests.Response:
+        """
+        Send a request within the host's rate limit and adaptive concurrency limit.
+        
+        Requests wait for a token of the host's rate limiter (shared with other crawlers
+        and threads) and a slot of its concurrency limiter, which adapts to the latency
+        and status of the response (see core.adaptive_concurrency). 429 and 503 responses
+        are retried once the host's Retry-After pause is over. Requests to a host whose
+        circuit breaker is open fail immediately (see core.circuit_breaker).
+        
+        Args:
+            url (str): Absolute URL
+            method (str): HTTP method
+            **kwargs: Arguments of requests.Session.request (timeout defaults to self.timeout)
+            
+        Returns:
+            requests.Response: Response, possibly a 429/503 if retries are exhausted
+            
+        Raises:
+            requests.exceptions.RequestException: If the request failed without response
+                (CircuitOpenError if it was not sent)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        breaker = get_circuit_breaker(url)
+        limiter = get_concurrency_limiter(url)
+        attempt = 0
+        
+        while True:
+            if not breaker.allow_request():
+                self.skipped_hosts.add(breaker.host)
+                raise CircuitOpenError(f"circuit of {breaker.host} is open")
+            
+            settled = False
+            try:
+                limiter.acquire()
+                started = None
+                try:
+                    get_rate_limiter(url, self.delay).acquire()
+                    started = time.monotonic()
+                    response = self.session.request(method, url, **kwargs)
+                except BaseException as e:
+                    limiter.release(started or time.monotonic(), None)
+                    if isinstance(e, HOST_FAILURES):
+                        breaker.record_failure()
+                        settled = True
+                    raise
+                limiter.release(started, response.status_code, response.headers.get("Retry-After"))
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                settled = True
+            finally:
+                # Other errors (invalid headers, too many redirects, ...) say nothing
+                # about the host, but must not keep a half-open trial reserved
+                if not settled:
+                    breaker.release_trial()
+            
+            if response.status_code not in THROTTLE_STATUSES or attempt >= limiter.max_retries:
+                return response
+            attempt += 1
+            self.logger.warning(f"HTTP {response.status_code} from {url}, retrying ({attempt}/{limiter.max_retries})")
+    
     @abstractmethod
     def get_grant_listing_urls(self) -> List[str]:
         """
@@ -85,6 +330,32 @@ class BaseCrawler(ABC):
         """
         pass
     
+    def first_listing_page(self) -> Optional[str]:
+        """
+        Get the URL of the first listing page, for crawlers that can read their
+        listing one page at a time with get_listing_page (see core.scheduler).
+        
+        Returns:
+            Optional[str]: URL of the first listing page, or None if the listing is
+            only available as a whole through get_grant_listing_urls
+        """
+        return None
+    
+    def get_listing_page(self, page_url: str, page: int) -> Tuple[Optional[List[str]], Optional[str]]:
+        """
+        Get the grant URLs of a single listing page (see first_listing_page).
+        
+        Args:
+            page_url (str): URL of the listing page
+            page (int): Number of the page, starting from 0
+            
+        Returns:
+            Tuple[Optional[List[str]], Optional[str]]: Grant URLs of the page (None if it
+            could not be fetched), and URL of the next listing page (None after the last
+            page or if the page could not be fetched)
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} has no paged listing")
+    
     @abstractmethod
     def parse_grant_details(self, url: str) -> Dict[str, Any]:
         """
@@ -98,27 +369,247 @@ class BaseCrawler(ABC):
         """
         pass
     
-    def crawl(self) -> List[Dict[str, Any]]:
+    def crawl(self, concurrency: int = 1) -> List[Dict[str, Any]]:
         """
         Crawl the website and collect grant data.
         
+        Args:
+            concurrency (int): Number of grant detail pages fetched and parsed in parallel
+            
         Returns:
             List[Dict[str, Any]]: List of grant details
         """
         self.logger.info(f"Starting to crawl {self.base_url}")
         
-        grant_urls = self.get_grant_listing_urls()
+        grant_urls = self.discover_grant_urls()
         self.logger.info(f"Found {len(grant_urls)} grant listings")
         
-        grants = []
-        for url in grant_urls[:self.max_pages]:
-            try:
-                grant_data = self.parse_grant_details(url)
-                if grant_data:
-                    grants.append(grant_data)
-            except Exception as e:
-                self.logger.error(f"Error parsing grant details from {url}: {e}")
-                continue
+        grants = self.crawl_grants(grant_urls[:self.max_pages], concurrency)
         
         self.logger.info(f"Successfully crawled {len(grants)} grants")
-        return grants
\ No newline at end of file
+        return grants
+    
+    def discover_grant_urls(self) -> List[str]:
+        """
+        Get the grant URLs of the site, reusing those of a checkpointed attempt.
+        
+        A listing collected while pages could not be fetched is not checkpointed
+        (see record_listing), so a resumed run lists the site again.
+        
+        Returns:
+            List[str]: List of URLs to individual grant pages
+        """
+        if self.checkpoint is not None and self.checkpoint.urls is not None:
+            self.logger.info("Resuming with grant listings from checkpoint")
+            return self.checkpoint.urls
+        
+        failed_fetches = self.failed_fetches
+        try:
+            grant_urls = self.get_grant_listing_urls()
+        except Exception:
+            self.record_listing([], complete=False)
+            raise
+        
+        self.record_listing(grant_urls, complete=self.failed_fetches == failed_fetches)
+        return grant_urls
+    
+    def record_listing(self, grant_urls: List[str], complete: bool):
+        """
+        Record the collected listing: checkpoint the grant URLs of a complete listing,
+        or flag an incomplete one (listing_incomplete, and listing_failed if it is empty).
+        
+        Args:
+            grant_urls (List[str]): Grant URLs found
+            complete (bool): Whether every listing page was fetched
+        """
+        if complete:
+            if self.checkpoint is not None:
+                self.checkpoint.record_urls(grant_urls)
+            return
+        
+        self.listing_incomplete = True
+        if not grant_urls:
+            self.logger.error("No grant listings found, the listing could not be fetched")
+            self.listing_failed = True
+        else:
+            self.logger.warning(f"Listing incomplete, found {len(grant_urls)} grant listings "
+                                f"but some listing pages could not be fetched")
+    
+    def crawl_grants(self, grant_urls: List[str], concurrency: int = 1) -> List[Dict[str, Any]]:
+        """
+        Parse the detail pages of the given grants.
+        
+        With concurrency > 1 the pages are fetched and parsed by a thread pool
+        sharing this crawler's session; requests still go through the host's
+        rate limiter and results keep the order of grant_urls.
+        
+        Args:
+            grant_urls (List[str]): URLs of the grant detail pages
+            concurrency (int): Number of pages fetched and parsed in parallel
+            
+        Returns:
+            List[Dict[str, Any]]: List of grant details
+        """
+        if concurrency > 1 and len(grant_urls) > 1:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=self.__class__.__name__) as executor:
+                results = list(executor.map(self.crawl_grant, grant_urls))
+        else:
+            results = [self.crawl_grant(url) for url in grant_urls]
+        
+        return [grant_data for grant_data in results if grant_data]
+    
+    def crawl_grant(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a single grant detail page, logging instead of raising on errors.
+        
+        Grants already parsed by a checkpointed attempt of the run are returned
+        without fetching. When a state store is attached, pages whose fingerprint is unchanged are
+        not parsed; the processed row stored by the previous run is returned as a
+        StoredGrant instead.
+        
+        Args:
+            url (str): URL of the grant detail page
+            
+        Returns:
+            Optional[Dict[str, Any]]: Grant details (or a StoredGrant), or None if parsing failed
+        """
+        if self.checkpoint is not None:
+            checkpointed_grant = self.checkpoint.get_grant(url)
+            if checkpointed_grant is not None:
+                return checkpointed_grant
+        
+        try:
+            if self.state_store is not None:
+                html = self.fetch_page(url)
+                if html is None:
+                    self.logger.error(f"Failed to fetch grant page: {url}")
+                    return None
+                
+                stored_grant = self._lookup_stored_grant(url, html)
+                if stored_grant is not None:
+                    return stored_grant
+                
+                self.prefetch_page(url, html)
+            
+            grant_data = self.parse_grant_details(url)
+            self._checkpoint_grant(url, grant_data)
+            return grant_data
+        except Exception as e:
+            self.logger.error(f"Error parsing grant details from {url}: {e}")
+            return None
+    
+    def fetch_grant_page(self, url: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Fetch the raw HTML of a grant detail page, to be parsed outside the crawler
+        (see core.parse_pool).
+        
+        Grants already parsed by a checkpointed attempt of the run, or unchanged since
+        the last incremental run, are returned instead of the page.
+        
+        Args:
+            url (str): URL of the grant detail page
+            
+        Returns:
+            Tuple[Optional[str], Optional[Dict[str, Any]]]: (html, None) for a page to parse,
+            (None, grant) for a known grant, or (None, None) if the fetch failed
+        """
+        if self.checkpoint is not None:
+            checkpointed_grant = self.checkpoint.get_grant(url)
+            if checkpointed_grant is not None:
+                return None, checkpointed_grant
+        
+        try:
+            html = self.fetch_page(url)
+            if html is None:
+                self.logger.error(f"Failed to fetch grant page: {url}")
+                return None, None
+            
+            if self.state_store is not None:
+                stored_grant = self._lookup_stored_grant(url, html)
+                if stored_grant is not None:
+                    return None, stored_grant
+            
+            return html, None
+        except Exception as e:
+            self.logger.error(f"Error fetching grant page {url}: {e}")
+            return None, None
+    
+    def _lookup_stored_grant(self, url: str, html: str) -> Optional[StoredGrant]:
+        # Fingerprint the page and reuse the grant stored by the previous run if unchanged
+        fingerprint = self.fingerprint_page(html)
+        self.page_fingerprints[url] = fingerprint
+        
+        stored_grant = self.state_store.lookup(url, fingerprint)
+        if stored_grant is not None:
+            self.logger.debug(f"Grant unchanged since last run: {url}")
+            self._checkpoint_grant(url, stored_grant)
+        return stored_grant
+    
+    def _checkpoint_grant(self, url: str, grant_data: Optional[Dict[str, Any]]):
+        if self.checkpoint is not None and grant_data:
+            self.checkpoint.record_grant(url, grant_data)
+    
+    def fingerprint_page(self, html: str) -> str:
+        """
+        Compute a content fingerprint of a grant detail page.
+        
+        Only the text of the section matched by fingerprint_selector (or of the
+        detail regions) is hashed, so changing markup, scripts or session tokens do
+        not mark a grant as changed. The page is parsed with the crawler's backend,
+        building only that section when it is a simple selector.
+        
+        Args:
+            html (str): Raw HTML of the page
+            
+        Returns:
+            str: Hex digest of the normalized section text
+        """
+        regions = [self.fingerprint_selector] if self.fingerprint_selector else self.detail_regions
+        try:
+            soup = self.parse_html(html, regions)
+        except ValueError:
+            # Not a simple selector, the section is selected in the whole page
+            soup = self.parse_html(html)
+        strip_tags(soup, ["script", "style", "noscript"])
+        
+        if self.fingerprint_selector:
+            sections = [soup.select_one(self.fingerprint_selector)]
+        elif regions:
+            # The selectolax backend returns the whole page even when regions are given
+            sections = soup.select(", ".join(regions))
+        else:
+            sections = []
+        text = " ".join(section.get_text(" ", strip=True) for section in sections if section is not None)
+        if not text:
+            text = soup.get_text(" ", strip=True)
+        
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def _get_document_target_words(self) -> List[str]:
+        """Return list of target words to search for in documents."""
+        return DOCUMENT_TARGET_WORDS + self.document_target_words
+    
+    def _extract_document_requirements(self, text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Extract document requirements from text using improved detection.
+        
+        Args:
+            text (str): Text to analyze
+            
+        Returns:
+            Tuple[List[str], Dict[str, List[str]]]: List of required documents and their contexts
+        """
+        return self.find_target_words(text, self._get_document_target_words())
+    
+    def find_target_words(self, text: str, target_words: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Find target words and phrases in text using advanced context verification.
+        
+        Args:
+            text (str): Text to analyze
+            target_words (List[str]): List of target words to search for
+            
+        Returns:
+            Tuple[List[str], Dict[str, List[str]]]: List of found words and their contexts
+        """
+        return get_document_matcher(target_words).find(text)
@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+from core.state_store import StoredGrant
+
+logger = logging.getLogger("Checkpoint")
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of a crawl run, used to resume it after a crash.
+    
+    Every unit of work is written as one JSON line as soon as it completes:
+    the grant URLs discovered for a site, each parsed grant, and the processed
+    grants of a completed site. Lines are flushed and fsynced immediately, so a
+    killed process loses at most the page being parsed.
+    """
+    
+    def __init__(self, run_id: str, directory: str):
+        """
+        Initialize the journal, loading the records of a previous attempt of the run.
+        
+        Args:
+            run_id (str): Identifier of the run
+            directory (str): Directory holding the journals
+        """
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self._lock = threading.Lock()
+        
+        self.completed_sites: Dict[str, List[Dict[str, Any]]] = {}
+        self.site_urls: Dict[str, List[str]] = {}
+        self.site_grants: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            self._load()
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line of a journal interrupted mid-write
+                    continue
+                
+                site = record["site"]
+                if record["event"] == "urls":
+                    self.site_urls[site] = record["urls"]
+                elif record["event"] == "grant":
+                    grant = StoredGrant(record["grant"]) if record.get("stored") else record["grant"]
+                    self.site_grants.setdefault(site, {})[record["url"]] = grant
+                elif record["event"] == "site_done":
+                    self.completed_sites[site] = record["grants"]
+        
+        logger.info(f"Loaded checkpoint {self.run_id}: {len(self.completed_sites)} sites completed, "
+                    f"{sum(len(g) for g in self.site_grants.values())} grants parsed")
+    
+    def _write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def site(self, site_key: str) -> "SiteCheckpoint":
+        """
+        Get the checkpoint view of a single site.
+        
+        Args:
+            site_key (str): Site identifier ("<site_type>.<site_name>")
+        
+        Returns:
+            SiteCheckpoint: Checkpoint of the site
+        """
+        return SiteCheckpoint(self, site_key)
+    
+    def record_urls(self, site_key: str, urls: List[str]):
+        """Record the grant URLs discovered for a site."""
+        self.site_urls[site_key] = urls
+        self._write({"event": "urls", "site": site_key, "urls": urls})
+    
+    def record_grant(self, site_key: str, url: str, grant: Dict[str, Any]):
+        """Record a grant parsed from one of the site's detail pages."""
+        self.site_grants.setdefault(site_key, {})[url] = grant
+        self._write({"event": "grant", "site": site_key, "url": url, "grant": grant,
+                     "stored": isinstance(grant, StoredGrant)})
+    
+    def record_site_done(self, site_key: str, processed_grants: List[Dict[str, Any]]):
+        """Record the processed grants of a site whose crawl has completed."""
+        self.completed_sites[site_key] = processed_grants
+        self._write({"event": "site_done", "site": site_key, "grants": processed_grants})
+    
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
+
+
+class SiteCheckpoint:
+    """
+    Checkpoint of a single site within a CheckpointJournal, attached to its crawler.
+    """
+    
+    def __init__(self, journal: CheckpointJournal, site_key: str):
+        self.journal = journal
+        self.site_key = site_key
+    
+    @property
+    def urls(self) -> Optional[List[str]]:
+        """Grant URLs discovered by a previous attempt, or None if the listing was not completed."""
+        return self.journal.site_urls.get(self.site_key)
+    
+    def get_grant(self, url: str) -> Optional[Dict[str, Any]]:
+        """Grant parsed from a URL by a previous attempt, if any."""
+        return self.journal.site_grants.get(self.site_key, {}).get(url)
+    
+    def record_urls(self, urls: List[str]):
+        """Record the grant URLs discovered for the site."""
+        self.journal.record_urls(self.site_key, urls)
+    
+    def record_grant(self, url: str, grant: Dict[str, Any]):
+        """Record a grant parsed from one of the site's detail pages."""
+        self.journal.record_grant(self.site_key, url, grant)
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from typing import Dict, Any
+from urllib.parse import urlparse
+
+import requests
+
+import config
+from core.site_config import find_site_config
+
+logger = logging.getLogger("CircuitBreaker")
+
+# States of a circuit
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker of a single host.
+    
+    The circuit opens after `failure_threshold` consecutive failed requests
+    (connection errors, timeouts and 5xx responses); requests are then rejected
+    without touching the network. After `recovery_timeout` seconds the circuit is
+    half-open and lets `half_open_max_calls` trial requests through: a success
+    closes it again, a failure reopens it for another recovery_timeout.
+    """
+    
+    def __init__(self, host: str, enabled: bool = True, failure_threshold: int = 5,
+                 recovery_timeout: float = 120, half_open_max_calls: int = 1):
+        """
+        Initialize a closed circuit with the settings of config.CIRCUIT_BREAKER.
+        
+        Args:
+            host (str): Host of the requests, used in log messages
+            enabled (bool): Reject requests while open (when False the circuit never opens)
+            failure_threshold (int): Consecutive failures opening the circuit
+            recovery_timeout (float): Seconds an open circuit waits before a trial request
+            half_open_max_calls (int): Trial requests allowed at once while half-open
+        """
+        self.host = host
+        self.enabled = enabled
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent, reserving a trial while half-open.
+        
+        Every allowed request must be followed by record_success, record_failure
+        or release_trial.
+        
+        Returns:
+            bool: False if the request must fail fast
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                logger.info(f"Circuit of {self.host} half-open, sending a trial request")
+                self.state = HALF_OPEN
+                self._trials = 0
+            
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return True
+            return False
+    
+    def record_success(self):
+        """Record a request answered by the host."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                logger.info(f"Circuit of {self.host} closed, the host answers again")
+                self.state = CLOSED
+            self.failures = 0
+    
+    def release_trial(self):
+        """Record a request that failed for a reason unrelated to the host (e.g. an invalid header)."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+    
+    def record_failure(self):
+        """Record a request that failed because of the host."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.enabled
+                                           and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit of {self.host} open after {self.failures} failed requests, "
+                               f"failing fast for {self.recovery_timeout:.0f}s")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+
+def get_breaker_settings(url: str) -> Dict[str, Any]:
+    """
+    Get the circuit breaker settings that apply to a URL.
+    
+    The global config.CIRCUIT_BREAKER values are overridden by the
+    "circuit_breaker" entry of the matching site configuration.
+    
+    Args:
+        url (str): Absolute URL
+    
+    Returns:
+        Dict[str, Any]: Keyword arguments of CircuitBreaker
+    """
+    settings = dict(config.CIRCUIT_BREAKER)
+    settings.update(find_site_config(url).get("circuit_breaker", {}))
+    return settings
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker shared by all crawlers and threads requesting a host.
+    
+    Args:
+        url (str): Absolute URL about to be requested
+    
+    Returns:
+        CircuitBreaker: Circuit breaker of the URL's host
+    """
+    host = urlparse(url).netloc
+    
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, **get_breaker_settings(url))
+            _breakers[host] = breaker
+        return breaker
@@ -0,0 +1,285 @@
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+# Common document types required for Italian grants, extended by each crawler
+# through BaseCrawler.document_target_words
+DOCUMENT_TARGET_WORDS = [
+    "carta d'identità", "documento identità", "copia carta identità",
+    "codice fiscale", "CF", "documento soci", "documenti anagrafici",
+    "attribuzione codice fiscale", "certificato codice fiscale",
+    "certificato partita IVA", "attribuzione P.IVA", "partita IVA",
+    "registro imprese", "iscrizione CCIAA", "certificato camera commercio",
+    "visura CCIAA", "visura camerale", "visura ordinaria",
+    "visura immobile", "visura catastale", "documento catastale",
+    "atto costitutivo", "statuto società", "atti sociali",
+    "atto nomina rappresentante", "nomina amministratore",
+    "delega firma", "delega sottoscrizione", "delega rappresentanza",
+    "DSAN", "dichiarazione sostitutiva", "autocertificazione",
+    "dichiarazione d'intenti", "manifestazione di interesse",
+    "certificato casellario", "casellario penale", "assenza condanne penali",
+    "DURC", "documento regolarità contributiva", "regolarità contributiva",
+    "certificato fiscale", "regolarità fiscale", "assenza carichi pendenti",
+    "dichiarazione antiriciclaggio", "dichiarazione antimafia",
+    "contributo ANAC", "pagamento ANAC", "ricevuta ANAC",
+    "piano finanziario", "budget", "preventivo economico",
+    "bilancio", "stato patrimoniale", "situazione economico-patrimoniale",
+    "dichiarazione redditi", "modello Redditi", "730",
+    "dichiarazioni IVA", "IVA annuale", "modello IVA",
+    "fideiussione bancaria", "fideiussione assicurativa", "garanzia fideiussoria",
+    "ricevute pagamento", "prova pagamento", "quietanze pagamento",
+    "fatture", "fatture elettroniche", "fatture PA", "e-fatture",
+    "giustificativi di spesa", "documenti di spesa", "pezze giustificative",
+    "scheda progetto", "sintesi progetto", "scheda descrittiva",
+    "programma operativo", "cronoprogramma", "piano attività",
+    "diagramma di Gantt", "gantt chart", "timeline progetto",
+    "relazione finale", "report finale", "rendicontazione finale",
+    "relazione lavori", "relazione attività", "stato avanzamento lavori",
+    "PSC", "piano sicurezza", "documento coordinamento sicurezza",
+    "dichiarazione localizzazione", "ubicazione intervento",
+    "assenso proprietario", "dichiarazione consenso", "nulla osta proprietà",
+    "contratto affitto", "contratto locazione", "contratto comodato",
+    "progetto impresa", "business plan", "piano d'impresa",
+    "pitch", "presentazione sintetica", "elevator pitch", "pitch deck",
+    "CV team", "curriculum", "profilo fondatori",
+    "attestato corso", "attestato formazione", "certificato partecipazione",
+    "certificazione qualità", "certificato ISO",
+    "certificato conformità", "conformità impianto", "conformità normativa",
+    "attestazione SOA", "certificazione SOA", "qualificazione per appalti pubblici",
+    "brevetto", "certificato di brevetto", "titolo brevettuale",
+    "IBAN", "certificato IBAN", "coordinate bancarie"
+]
+
+# Keywords that indicate a document is required when found near its mention
+VALIDATION_KEYWORDS = [
+    "allegare", "allegato", "presentare", "presentazione", "fornire",
+    "obbligatorio", "necessario", "richiesto", "documentazione",
+    "consegnare", "produrre", "trasmettere", "accompagnato da",
+    "corredato da", "da presentare", "dovranno essere allegati",
+    "è richiesto", "è necessario", "deve essere allegato",
+    "va allegato", "documenti da allegare", "è obbligatorio",
+    "completo di", "comprensivo di", "deve riportare",
+    "da compilare", "da firmare", "firmato", "sottoscritto",
+    "va presentato", "si richiede", "sarà necessario",
+    "documento richiesto", "da trasmettere", "occorre presentare",
+    "documento obbligatorio", "insieme a", "copia", "file", "modulo"
+]
+
+# Common false positive contexts to exclude
+EXCLUSION_CONTEXTS = [
+    "non è necessario", "non è richiesto", "non obbligatorio",
+    "facoltativo", "non è obbligatorio", "non deve essere allegato",
+    "non sarà richiesto", "non sono richiesti", "opzionale"
+]
+
+# High-priority documents that are almost always required if mentioned
+CRITICAL_DOCUMENTS = [
+    "codice fiscale", "carta d'identità", "documento identità",
+    "partita iva", "visura camerale", "durc", "iban", "preventivi"
+]
+
+
+def _trie_regex(strings: List[str], longest: bool) -> str:
+    """
+    Build a regex alternation of strings as a trie, so that a failed match costs
+    one branch per distinct character instead of one per string.
+    
+    With `longest`, the longest string followed by a word boundary is matched at
+    each position; otherwise the shortest string is matched, without boundaries.
+    """
+    trie = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def emit(node: Dict[str, dict]) -> str:
+        if '' in node and not longest:
+            return ''
+        alternatives = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            alternatives.append(r'\b')
+        return alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    
+    return emit(trie)
+
+
+class _SubstringIndex:
+    """
+    Positions of a fixed set of substrings in a text, found in a single regex pass.
+    
+    Answers "does any of the substrings occur entirely within text[start:end]"
+    with a binary search instead of scanning the window for every substring.
+    """
+    
+    def __init__(self, pattern: re.Pattern, text: str):
+        # The pattern reports the shortest substring starting at each position,
+        # i.e. the earliest end of an occurrence starting there
+        self.starts = []
+        ends = []
+        for match in pattern.finditer(text):
+            self.starts.append(match.start())
+            ends.append(match.end(1))
+        
+        # Earliest end among the occurrences starting at or after each position
+        self.min_end_from = ends
+        for i in range(len(ends) - 2, -1, -1):
+            if self.min_end_from[i + 1] < self.min_end_from[i]:
+                self.min_end_from[i] = self.min_end_from[i + 1]
+    
+    def any_within(self, start: int, end: int) -> bool:
+        i = bisect_left(self.starts, start)
+        # An occurrence ending by `end` necessarily starts before it
+        return i < len(self.starts) and self.min_end_from[i] <= end
+
+
+def _compile_substrings(substrings: List[str]) -> re.Pattern:
+    return re.compile(f"(?=({_trie_regex(substrings, longest=False)}))")
+
+
+class DocumentMatcher:
+    """
+    Precompiled matcher detecting required documents in grant text.
+    
+    All target words are found with a single compiled alternation, and the
+    validation keywords and exclusion contexts are located once per text, so
+    checking the context window of a match is a range lookup. Results are the
+    same as matching every target with its own word-boundary regex and scanning
+    each context window for every keyword.
+    """
+    
+    def __init__(self, target_words: List[str]):
+        """
+        Build the matcher for a list of target words.
+        
+        Args:
+            target_words (List[str]): Target words and phrases to search for
+        """
+        self.target_words = list(target_words)
+        
+        # Very short single words are ignored
+        self.targets = []
+        for target in dict.fromkeys(self.target_words):
+            target_lower = target.lower()
+            if ' ' in target_lower or len(target_lower) > 3:
+                self.targets.append((target, target_lower, re.compile(r'(?i)\b' + re.escape(target_lower) + r'\b')))
+        
+        # One pass over the text reports, at each position, the longest target
+        # matching there with its word boundaries
+        self._target_pattern = re.compile(
+            "(?i)(?=\\b(" + _trie_regex([t[1] for t in self.targets], longest=True) + "))"
+        ) if self.targets else None
+        
+        # Targets that can also match where a target matches: those equal (ignoring
+        # case) to one of its prefixes
+        self._prefix_targets = {}
+        for _, longer, _ in self.targets:
+            self._prefix_targets[longer] = [
+                t for t in self.targets
+                if len(t[1]) <= len(longer) and re.fullmatch(re.escape(t[1]), longer[:len(t[1])], re.IGNORECASE)
+            ]
+        
+        self._keyword_pattern = _compile_substrings(VALIDATION_KEYWORDS)
+        self._exclusion_pattern = _compile_substrings(EXCLUSION_CONTEXTS)
+    
+    def _target_matches(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Non-overlapping (start, end) matches of every target, as re.finditer would return them."""
+        matches = {}
+        last_end = {}
+        for match in self._target_pattern.finditer(text):
+            pos = match.start()
+            matched = match.group(1)
+            candidates = self._prefix_targets.get(matched)
+            if candidates is None:
+                # Matched through case folding (e.g. "ſ" for "s"): check every target that fits
+                candidates = [t for t in self.targets if len(t[1]) <= len(matched)]
+            for target, _, pattern in candidates:
+                if last_end.get(target, 0) > pos:
+                    continue
+                target_match = pattern.match(text, pos)
+                if target_match:
+                    matches.setdefault(target, []).append((pos, target_match.end()))
+                    last_end[target] = target_match.end()
+        return matches
+    
+    def find(self, text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Find the target words whose mentions are validated by their context.
+        
+        Args:
+            text (str): Text to analyze
+        
+        Returns:
+            Tuple[List[str], Dict[str, List[str]]]: List of found words and their contexts
+        """
+        found_words = []
+        context_dict = {}
+        
+        if not text or not text.strip() or self._target_pattern is None:
+            return found_words, context_dict
+        
+        # Normalize text
+        text = text.lower()
+        
+        target_matches = self._target_matches(text)
+        if not target_matches:
+            return found_words, context_dict
+        
+        keywords = _SubstringIndex(self._keyword_pattern, text)
+        exclusions = _SubstringIndex(self._exclusion_pattern, text)
+        
+        validated = {}
+        for target, target_lower, _ in self.targets:
+            # Only proceed if the target word is actually present in the text
+            if target not in target_matches or target_lower not in text:
+                continue
+            
+            # Increase the context window for critical documents
+            context_window = 300 if target_lower in CRITICAL_DOCUMENTS else 200
+            
+            contexts = []
+            for match_start, match_end in target_matches[target]:
+                start = max(0, match_start - context_window)
+                end = min(len(text), match_end + context_window)
+                
+                # Skip if in exclusion context, require a validation keyword otherwise
+                if exclusions.any_within(start, end) or not keywords.any_within(start, end):
+                    continue
+                
+                # Highlight the match in the context
+                highlighted = f"...{text[start:match_start]}**{text[match_start:match_end]}**{text[match_end:end]}..."
+                contexts.append(highlighted)
+            
+            if contexts:
+                validated[target] = contexts
+        
+        for target in self.target_words:
+            if target in validated:
+                found_words.append(target)
+                context_dict[target] = validated[target]
+        
+        return found_words, context_dict
+
+
+@lru_cache(maxsize=32)
+def _get_document_matcher(target_words: Tuple[str, ...]) -> DocumentMatcher:
+    return DocumentMatcher(list(target_words))
+
+
+def get_document_matcher(target_words: List[str]) -> DocumentMatcher:
+    """
+    Get the matcher of a list of target words, compiling it on first use.
+    
+    Args:
+        target_words (List[str]): Target words and phrases to search for
+    
+    Returns:
+        DocumentMatcher: Shared matcher of the target words
+    """
+    return _get_document_matcher(tuple(target_words))
+
+
+# Matcher of the common target words, compiled once at import
+DOCUMENT_MATCHER = get_document_matcher(DOCUMENT_TARGET_WORDS)
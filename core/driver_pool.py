@@ -0,0 +1,210 @@
+import atexit
+import logging
+import random
+import threading
+import time
+from typing import List, Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+import config
+from core.page_readiness import install_readiness_probe
+
+logger = logging.getLogger("WebDriverPool")
+
+
+class WebDriverPool:
+    """
+    Bounded pool of headless Chrome WebDrivers shared by all Selenium-based crawlers.
+    
+    Crawlers check a driver out for the duration of their crawl and check it back
+    in when done, so a run never starts more than `size` Chrome instances however
+    many sites and threads use Selenium; further checkouts wait for a free driver.
+    Drivers are health-checked on checkout, and restarted after `max_pages` page
+    loads or once their JavaScript heap grows beyond `max_memory_mb`.
+    """
+    
+    def __init__(self, size: int = 2, max_pages: int = 200, max_memory_mb: float = 1024,
+                 checkout_timeout: float = 600):
+        """
+        Initialize the pool. Drivers are started on demand.
+        
+        Args:
+            size (int): Maximum number of drivers alive at once
+            max_pages (int): Page loads after which a driver is restarted
+            max_memory_mb (float): JavaScript heap size above which a driver is restarted
+            checkout_timeout (float): Seconds checkout waits for a free driver
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.checkout_timeout = checkout_timeout
+        
+        self._idle: List[webdriver.Chrome] = []
+        self._page_loads: Dict[int, int] = {}
+        self._alive = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def _create_driver(self) -> webdriver.Chrome:
+        # Configure Chrome options
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in headless mode (no GUI)
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        
+        # Set a random user agent
+        user_agent = random.choice(config.USER_AGENTS)
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+        
+        # Network events of the pages, read to discover their JSON endpoints
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        install_readiness_probe(driver)
+        logger.info("Selenium WebDriver initialized successfully")
+        return driver
+    
+    def _is_healthy(self, driver: webdriver.Chrome) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    def _memory_mb(self, driver: webdriver.Chrome) -> float:
+        # performance.memory is a Chrome extension of the Performance API
+        heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0")
+        return (heap or 0) / (1024 * 1024)
+    
+    def _quit(self, driver: webdriver.Chrome):
+        self._page_loads.pop(id(driver), None)
+        try:
+            driver.quit()
+            logger.info("Selenium WebDriver closed")
+        except Exception as e:
+            logger.error(f"Error closing Selenium WebDriver: {e}")
+    
+    def _release_slot(self):
+        with self._condition:
+            self._alive -= 1
+            self._condition.notify()
+    
+    def checkout(self) -> webdriver.Chrome:
+        """
+        Take a driver from the pool, starting one if the pool is not full.
+        
+        Returns:
+            webdriver.Chrome: Healthy driver, reserved until checkin
+        
+        Raises:
+            TimeoutError: If no driver is free within checkout_timeout
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        driver = None
+        
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WebDriver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._alive < self.size:
+                    self._alive += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No WebDriver available after {self.checkout_timeout}s")
+                self._condition.wait(remaining)
+        
+        # Health checks and Chrome startup are slow, so they run outside the lock
+        if driver is not None and not self._is_healthy(driver):
+            logger.warning("Replacing unresponsive Selenium WebDriver")
+            self._quit(driver)
+            driver = None
+        
+        if driver is None:
+            try:
+                driver = self._create_driver()
+            except Exception as e:
+                logger.error(f"Failed to initialize Selenium WebDriver: {e}")
+                self._release_slot()
+                raise
+            self._page_loads[id(driver)] = 0
+        
+        return driver
+    
+    def record_page(self, driver: webdriver.Chrome):
+        """Count a page load of a checked out driver."""
+        self._page_loads[id(driver)] = self._page_loads.get(id(driver), 0) + 1
+    
+    def checkin(self, driver: webdriver.Chrome):
+        """
+        Return a driver to the pool, restarting it if it is worn out.
+        
+        Args:
+            driver (webdriver.Chrome): Driver obtained from checkout
+        """
+        page_loads = self._page_loads.get(id(driver), 0)
+        try:
+            memory_mb = self._memory_mb(driver)
+            recycle = page_loads >= self.max_pages or memory_mb > self.max_memory_mb
+            if recycle:
+                logger.info(f"Recycling Selenium WebDriver after {page_loads} pages ({memory_mb:.0f} MB heap)")
+        except Exception:
+            # The driver no longer responds
+            recycle = True
+        
+        if not recycle:
+            # Leave the last page so it does not keep running scripts while idle, and
+            # discard its unread performance log
+            try:
+                driver.get("about:blank")
+                driver.get_log("performance")
+            except Exception:
+                recycle = True
+        
+        with self._condition:
+            if not recycle and not self._closed:
+                self._idle.append(driver)
+                self._condition.notify()
+                return
+        
+        self._quit(driver)
+        self._release_slot()
+    
+    def close(self):
+        """Quit the idle drivers; drivers still checked out are quit on checkin."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+            self._condition.notify_all()
+        
+        for driver in idle:
+            self._quit(driver)
+
+
+_pool: Optional[WebDriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> WebDriverPool:
+    """
+    Get the WebDriver pool shared by all Selenium-based crawlers of the process.
+    
+    The pool is sized by config.SELENIUM_POOL and its drivers are quit at exit.
+    
+    Returns:
+        WebDriverPool: Shared pool
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is None:
+            _pool = WebDriverPool(**config.SELENIUM_POOL)
+            atexit.register(_pool.close)
+        return _pool
@@ -1,11 +1,65 @@
 import csv
+import hashlib
+import json
 import logging
 import os
-from typing import List, Dict, Any
-from datetime import datetime
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import List, Dict, Any, Optional
+from datetime import datetime, date
+
+from core.data_processor import EXPECTED_COLUMNS
+
+# pyarrow is only required by ParquetExporter, which imports it when instantiated
+# (see _import_pyarrow) so that CSV and SQLite runs never load it
+pa = None
+pq = None
 
 logger = logging.getLogger("Exporter")
 
+# Typed columns of the Parquet export; all other columns are strings
+NUMERIC_COLUMNS = [
+    "Dotazione",
+    "Percentuale fondo perduto number",
+    "Richiesta massima (number)",
+    "Richiesta minima (number)",
+]
+
+DATE_COLUMNS = [
+    "Scadenza interna",
+    "Data di apertura",
+    "Data creazione",
+]
+
+# String columns of the Parquet export keeping the values of DATE_COLUMNS that are
+# not ISO dates (null when the date was parsed), as written by the CSV and SQLite exports
+RAW_DATE_COLUMNS = {column: f"{column} (raw)" for column in DATE_COLUMNS}
+
+# Low-cardinality columns (controlled vocabularies and enumerations) stored dictionary-encoded
+DICTIONARY_COLUMNS = [
+    "Categoria del bando_MR",
+    "Spese ammissibili_MR",
+    "A chi si rivolge_MR",
+    "Settore_MR",
+    "Sezione",
+    "Regime di aiuto",
+    "Stato del bando",
+    "Tipo",
+    "Promotore del bando",
+    "Emanazione",
+    "Provincia",
+    "Località_MR",
+]
+
+# Columns of the SQLite sink indexed for the usual consumer queries
+SQLITE_INDEXED_COLUMNS = [
+    "Località_MR",
+    "Scadenza interna",
+    "Stato del bando",
+]
+
 class CSVExporter:
     """
     Exporter class to save grant data to CSV files.
@@ -20,6 +74,12 @@ class CSVExporter:
         """
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        
+        # State of the streaming export (see open_stream)
+        self._stream_file = None
+        self._stream_writer = None
+        self._stream_path = None
+        self._stream_rows = 0
     
     def export_to_csv(self, data: List[Dict[str, Any]], filename: str = None) -> str:
         """
@@ -62,6 +122,69 @@ class CSVExporter:
             logger.error(f"Error exporting to CSV: {e}")
             return None
     
+    def open_stream(self, filename: str = None) -> str:
+        """
+        Start a streaming export, to which grants are written as they are produced.
+        
+        Rows are written to a temporary ".part" file with a fixed header taken from
+        EXPECTED_COLUMNS, and the file is renamed to its final name by close().
+        
+        Args:
+            filename (str, optional): Output filename. If None, a timestamp-based name is used.
+            
+        Returns:
+            str: Path the CSV file will have once the stream is closed
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"grants_{timestamp}.csv"
+        
+        self._stream_path = os.path.join(self.output_dir, filename)
+        self._stream_rows = 0
+        self._stream_file = open(self._stream_path + ".part", 'w', newline='', encoding='utf-8')
+        self._stream_writer = csv.DictWriter(self._stream_file, fieldnames=EXPECTED_COLUMNS, extrasaction='ignore')
+        self._stream_writer.writeheader()
+        
+        return self._stream_path
+    
+    def write_row(self, grant: Dict[str, Any]):
+        """
+        Write a grant to the open stream and flush it to disk.
+        
+        Args:
+            grant (Dict[str, Any]): Processed grant data
+        """
+        # Convert None values to empty strings
+        sanitized_grant = {k: ('' if v is None else v) for k, v in grant.items()}
+        self._stream_writer.writerow(sanitized_grant)
+        self._stream_file.flush()
+        self._stream_rows += 1
+    
+    def close(self) -> Optional[str]:
+        """
+        Finish the streaming export, atomically renaming the file to its final name.
+        
+        Returns:
+            Optional[str]: Path to the saved CSV file, or None if no grant was written
+        """
+        if self._stream_file is None:
+            return None
+        
+        self._stream_file.flush()
+        os.fsync(self._stream_file.fileno())
+        self._stream_file.close()
+        self._stream_file = None
+        self._stream_writer = None
+        
+        if not self._stream_rows:
+            logger.warning("No data to export")
+            os.remove(self._stream_path + ".part")
+            return None
+        
+        os.replace(self._stream_path + ".part", self._stream_path)
+        logger.info(f"Successfully exported {self._stream_rows} grants to {self._stream_path}")
+        return self._stream_path
+    
     def export_errors_to_csv(self, errors: Dict[str, List[str]], filename: str = None) -> str:
         """
         Export validation errors to a CSV file.
@@ -97,4 +220,380 @@ class CSVExporter:
         
         except Exception as e:
             logger.error(f"Error exporting errors to CSV: {e}")
-            return None
\ No newline at end of file
+            return None
+
+def _import_pyarrow():
+    """
+    Import pyarrow into the module globals on first use.
+    
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    global pa, pq
+    
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is required for the Parquet export (pip install pyarrow)")
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+class ParquetExporter:
+    """
+    Exporter class to save grant data to Parquet files with typed columns.
+    
+    Numeric columns are stored as float64, date columns as date32, and the
+    low-cardinality vocabulary columns are dictionary-encoded. Dates that cannot
+    be parsed are kept as strings in the RAW_DATE_COLUMNS. Requires pyarrow.
+    """
+    
+    def __init__(self, output_dir: str = "output", compression: str = "zstd", row_group_size: int = 10000):
+        """
+        Initialize the Parquet exporter.
+        
+        Args:
+            output_dir (str): Directory to save Parquet files
+            compression (str): Parquet compression codec (e.g. "zstd", "snappy", "gzip")
+            row_group_size (int): Number of grants buffered before a row group is written
+        """
+        _import_pyarrow()
+        
+        self.output_dir = output_dir
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.columns = EXPECTED_COLUMNS + list(RAW_DATE_COLUMNS.values())
+        self.schema = pa.schema([(column, self._column_type(column)) for column in self.columns])
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # State of the streaming export (see open_stream)
+        self._stream_writer = None
+        self._stream_path = None
+        self._stream_rows = 0
+        self._buffer = []
+    
+    @staticmethod
+    def _column_type(column: str):
+        if column in NUMERIC_COLUMNS:
+            return pa.float64()
+        if column in DATE_COLUMNS:
+            return pa.date32()
+        if column in DICTIONARY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.string()
+    
+    @staticmethod
+    def _to_float(value: Any) -> Optional[float]:
+        if value is None or value == "":
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _to_date(value: Any) -> Optional[date]:
+        if not value:
+            return None
+        if isinstance(value, date):
+            return value
+        # process_grant_data normalizes dates to YYYY-MM-DD (raises ValueError otherwise)
+        return date.fromisoformat(str(value))
+    
+    def _convert_row(self, grant: Dict[str, Any]) -> Dict[str, Any]:
+        row = {}
+        for column in EXPECTED_COLUMNS:
+            value = grant.get(column)
+            if column in NUMERIC_COLUMNS:
+                row[column] = self._to_float(value)
+            elif column in DATE_COLUMNS:
+                try:
+                    row[column] = self._to_date(value)
+                    row[RAW_DATE_COLUMNS[column]] = None
+                except ValueError:
+                    logger.warning(f"Unparseable {column} '{value}' of {grant.get('Link Bando')}, "
+                                   f"kept in '{RAW_DATE_COLUMNS[column]}'")
+                    row[column] = None
+                    row[RAW_DATE_COLUMNS[column]] = str(value)
+            else:
+                row[column] = None if value is None else str(value)
+        return row
+    
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        
+        table = pa.Table.from_arrays(
+            [pa.array([row[column] for row in self._buffer], type=field.type)
+             for column, field in zip(self.columns, self.schema)],
+            schema=self.schema
+        )
+        self._stream_writer.write_table(table)
+        self._buffer = []
+    
+    def export_to_parquet(self, data: List[Dict[str, Any]], filename: str = None) -> str:
+        """
+        Export grant data to a Parquet file.
+        
+        Args:
+            data (List[Dict]): List of grant data dictionaries
+            filename (str, optional): Output filename. If None, a timestamp-based name is used.
+            
+        Returns:
+            str: Path to the saved Parquet file
+        """
+        if not data:
+            logger.warning("No data to export")
+            return None
+        
+        try:
+            self.open_stream(filename)
+            for grant in data:
+                self.write_row(grant)
+            return self.close()
+        
+        except Exception as e:
+            logger.error(f"Error exporting to Parquet: {e}")
+            return None
+    
+    def open_stream(self, filename: str = None) -> str:
+        """
+        Start a streaming export, to which grants are written as they are produced.
+        
+        Rows are buffered and written one row group at a time to a temporary
+        ".part" file, which is renamed to its final name by close().
+        
+        Args:
+            filename (str, optional): Output filename. If None, a timestamp-based name is used.
+            
+        Returns:
+            str: Path the Parquet file will have once the stream is closed
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"grants_{timestamp}.parquet"
+        
+        self._stream_path = os.path.join(self.output_dir, filename)
+        self._stream_rows = 0
+        self._buffer = []
+        self._stream_writer = pq.ParquetWriter(
+            self._stream_path + ".part",
+            self.schema,
+            compression=self.compression,
+            use_dictionary=DICTIONARY_COLUMNS
+        )
+        
+        return self._stream_path
+    
+    def write_row(self, grant: Dict[str, Any]):
+        """
+        Write a grant to the open stream.
+        
+        Args:
+            grant (Dict[str, Any]): Processed grant data
+        """
+        self._buffer.append(self._convert_row(grant))
+        self._stream_rows += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush_buffer()
+    
+    def close(self) -> Optional[str]:
+        """
+        Finish the streaming export, atomically renaming the file to its final name.
+        
+        Returns:
+            Optional[str]: Path to the saved Parquet file, or None if no grant was written
+        """
+        if self._stream_writer is None:
+            return None
+        
+        self._flush_buffer()
+        self._stream_writer.close()
+        self._stream_writer = None
+        
+        if not self._stream_rows:
+            logger.warning("No data to export")
+            os.remove(self._stream_path + ".part")
+            return None
+        
+        os.replace(self._stream_path + ".part", self._stream_path)
+        logger.info(f"Successfully exported {self._stream_rows} grants to {self._stream_path}")
+        return self._stream_path
+
+
+class SQLiteExporter:
+    """
+    Exporter class to upsert grant data into a SQLite database keyed on "Link Bando".
+    
+    The database holds the current state of every grant across runs. Each row
+    stores a hash of its content, and the upsert only rewrites rows whose hash
+    changed, so re-exporting unchanged grants costs no writes.
+    """
+    
+    def __init__(self, output_dir: str = "output", batch_size: int = 500):
+        """
+        Initialize the SQLite exporter.
+        
+        Args:
+            output_dir (str): Directory to save the database
+            batch_size (int): Number of grants buffered before they are upserted in one transaction
+        """
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # State of the streaming export (see open_stream)
+        self._conn = None
+        self._stream_path = None
+        self._stream_rows = 0
+        self._changed_rows = 0
+        self._buffer = []
+        self._upsert_sql = self._build_upsert_sql()
+    
+    @staticmethod
+    def _quote(column: str) -> str:
+        return '"' + column.replace('"', '""') + '"'
+    
+    def _build_upsert_sql(self) -> str:
+        columns = EXPECTED_COLUMNS + ["row_hash", "updated_at"]
+        updates = ", ".join(
+            f"{self._quote(column)} = excluded.{self._quote(column)}"
+            for column in columns if column != "Link Bando"
+        )
+        return (
+            f"INSERT INTO grants ({', '.join(self._quote(column) for column in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(\"Link Bando\") DO UPDATE SET {updates} "
+            f"WHERE grants.row_hash IS NOT excluded.row_hash"
+        )
+    
+    def _create_schema(self):
+        column_defs = []
+        for column in EXPECTED_COLUMNS:
+            if column == "Link Bando":
+                column_defs.append(f"{self._quote(column)} TEXT PRIMARY KEY")
+            elif column in NUMERIC_COLUMNS:
+                column_defs.append(f"{self._quote(column)} REAL")
+            else:
+                column_defs.append(f"{self._quote(column)} TEXT")
+        column_defs += ["row_hash TEXT", "updated_at REAL"]
+        
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS grants ({', '.join(column_defs)})")
+        for column in SQLITE_INDEXED_COLUMNS:
+            ascii_name = unicodedata.normalize("NFKD", column).encode("ascii", "ignore").decode("ascii")
+            index_name = "idx_grants_" + re.sub(r'\W+', '_', ascii_name).strip('_').lower()
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON grants ({self._quote(column)})")
+        self._conn.commit()
+    
+    def _convert_row(self, grant: Dict[str, Any], now: float) -> tuple:
+        values = []
+        for column in EXPECTED_COLUMNS:
+            value = grant.get(column)
+            if column in NUMERIC_COLUMNS:
+                try:
+                    value = None if value in (None, "") else float(value)
+                except (TypeError, ValueError):
+                    value = None
+            elif value is not None:
+                value = str(value)
+            values.append(value)
+        
+        row_hash = hashlib.sha256(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return tuple(values) + (row_hash, now)
+    
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        
+        changes_before = self._conn.total_changes
+        with self._conn:
+            self._conn.executemany(self._upsert_sql, self._buffer)
+        self._changed_rows += self._conn.total_changes - changes_before
+        self._buffer = []
+    
+    def export_to_sqlite(self, data: List[Dict[str, Any]], filename: str = None) -> str:
+        """
+        Upsert grant data into a SQLite database.
+        
+        Args:
+            data (List[Dict]): List of grant data dictionaries
+            filename (str, optional): Database filename. Defaults to "grants.sqlite".
+            
+        Returns:
+            str: Path to the database
+        """
+        if not data:
+            logger.warning("No data to export")
+            return None
+        
+        try:
+            self.open_stream(filename)
+            for grant in data:
+                self.write_row(grant)
+            return self.close()
+        
+        except Exception as e:
+            logger.error(f"Error exporting to SQLite: {e}")
+            return None
+    
+    def open_stream(self, filename: str = None) -> str:
+        """
+        Start a streaming export, to which grants are written as they are produced.
+        
+        Args:
+            filename (str, optional): Database filename. Defaults to "grants.sqlite".
+            
+        Returns:
+            str: Path to the database
+        """
+        self._stream_path = os.path.join(self.output_dir, filename or "grants.sqlite")
+        self._stream_rows = 0
+        self._changed_rows = 0
+        self._buffer = []
+        
+        self._conn = sqlite3.connect(self._stream_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+        
+        return self._stream_path
+    
+    def write_row(self, grant: Dict[str, Any]):
+        """
+        Write a grant to the open stream.
+        
+        Grants without a "Link Bando" cannot be keyed and are skipped.
+        
+        Args:
+            grant (Dict[str, Any]): Processed grant data
+        """
+        if not grant.get("Link Bando"):
+            logger.warning(f"Skipping grant without Link Bando: {grant.get('Nome del bando')}")
+            return
+        
+        self._buffer.append(self._convert_row(grant, time.time()))
+        self._stream_rows += 1
+        if len(self._buffer) >= self.batch_size:
+            self._flush_buffer()
+    
+    def close(self) -> Optional[str]:
+        """
+        Finish the streaming export, upserting the remaining buffered grants.
+        
+        Returns:
+            Optional[str]: Path to the database, or None if no grant was written
+        """
+        if self._conn is None:
+            return None
+        
+        self._flush_buffer()
+        self._conn.close()
+        self._conn = None
+        
+        if not self._stream_rows:
+            logger.warning("No data to export")
+            return None
+        
+        logger.info(f"Successfully upserted {self._stream_rows} grants into {self._stream_path} "
+                    f"({self._changed_rows} new or changed)")
+        return self._stream_path
@@ -0,0 +1,233 @@
+import atexit
+import gzip
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from typing import Dict, Any, NamedTuple, Optional, Tuple, Union
+
+import config
+
+# Modes of config.FETCH_ARCHIVE
+RECORD = "record"
+REPLAY = "replay"
+
+# Renderer of the archived page: the raw HTTP response, or the DOM rendered by Selenium
+HTTP = "http"
+SELENIUM = "selenium"
+
+# Headers describing the transfer of the original body, which is archived decoded
+_TRANSFER_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+class ArchivedResponse(NamedTuple):
+    """A response read from the archive."""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: str
+    elapsed: float  # Seconds the original request took
+    
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+
+def parse_latency(value: str) -> Union[float, str]:
+    """
+    Parse the latency injected in replayed responses (command line --replay-latency).
+    
+    Args:
+        value (str): Seconds, or "recorded" for the latency of the original requests
+    
+    Returns:
+        Union[float, str]: Seconds or "recorded"
+    """
+    return value if value == "recorded" else float(value)
+
+
+class FetchArchive:
+    """
+    Compressed WARC file of the pages fetched by a run, for offline replay.
+    
+    In record mode every page fetched by BaseCrawler.fetch_page is appended as a
+    WARC/1.0 "response" record (status line, headers and decoded body), and every
+    page rendered by SeleniumCrawler.get_page_with_selenium as a "resource" record
+    holding the rendered HTML. Each record is a separate gzip member, as in .warc.gz
+    files, and carries the duration of the original request.
+    
+    In replay mode the records are loaded once and served instead of the network,
+    after an optional injected latency: a fixed number of seconds, or the recorded
+    duration of each request.
+    """
+    
+    def __init__(self, path: str, mode: str, latency: Union[float, str] = 0.0):
+        """
+        Open the archive.
+        
+        Args:
+            path (str): Path of the .warc.gz file
+            mode (str): RECORD (appends to the file) or REPLAY (reads it)
+            latency (Union[float, str]): Seconds added to each replayed response, or
+                "recorded" for the duration of the original request
+        """
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._records: Dict[Tuple[str, str, str], ArchivedResponse] = {}
+        self._file = None
+        
+        if mode == REPLAY:
+            self._load()
+        elif mode == RECORD:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, 'ab')
+        else:
+            raise ValueError(f"Unknown fetch archive mode: {mode}")
+    
+    def _write(self, warc_type: str, url: str, content_type: str, block: bytes, fields: Dict[str, Any]):
+        header = {
+            "WARC-Type": warc_type,
+            "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+            "WARC-Date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "WARC-Target-URI": url,
+            "Content-Type": content_type,
+        }
+        header.update(fields)
+        header["Content-Length"] = len(block)
+        
+        record = "WARC/1.0\r\n" + "".join(f"{name}: {value}\r\n" for name, value in header.items()) + "\r\n"
+        with self._lock:
+            self._file.write(gzip.compress(record.encode('utf-8') + block + b"\r\n\r\n"))
+            self._file.flush()
+    
+    def record(self, url: str, status: int, headers: Dict[str, str], body: str, elapsed: float = 0.0):
+        """
+        Archive an HTTP response.
+        
+        Args:
+            url (str): Request URL (including query string)
+            status (int): HTTP status code
+            headers (Dict[str, str]): Response headers
+            body (str): Decoded response body
+            elapsed (float): Seconds the request took
+        """
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()
+                        if name.lower() not in _TRANSFER_HEADERS)
+        block = (head + "\r\n").encode('utf-8') + body.encode('utf-8')
+        self._write("response", url, "application/http; msgtype=response", block,
+                    {"WARC-Crawler-Elapsed": f"{elapsed:.3f}"})
+    
+    def record_rendered(self, url: str, html: str, root_selector: Optional[str] = None, elapsed: float = 0.0):
+        """
+        Archive a page rendered with Selenium.
+        
+        Args:
+            url (str): URL of the page
+            html (str): Rendered HTML returned to the crawler
+            root_selector (str, optional): Selector the HTML was limited to
+            elapsed (float): Seconds the page took to load and settle
+        """
+        fields = {"WARC-Crawler-Renderer": SELENIUM, "WARC-Crawler-Elapsed": f"{elapsed:.3f}"}
+        if root_selector:
+            fields["WARC-Crawler-Root-Selector"] = root_selector
+        self._write("resource", url, "text/html; charset=utf-8", html.encode('utf-8'), fields)
+    
+    def _load(self):
+        with gzip.open(self.path, 'rb') as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                if not line.startswith(b"WARC/"):
+                    continue
+                
+                fields = {}
+                for line in iter(f.readline, b"\r\n"):
+                    if not line:
+                        break
+                    name, _, value = line.decode('utf-8').partition(":")
+                    fields[name.strip()] = value.strip()
+                block = f.read(int(fields.get("Content-Length", 0)))
+                
+                url = fields.get("WARC-Target-URI")
+                elapsed = float(fields.get("WARC-Crawler-Elapsed", 0))
+                if fields.get("WARC-Type") == "response":
+                    head, _, body = block.partition(b"\r\n\r\n")
+                    status_line, *header_lines = head.decode('utf-8').split("\r\n")
+                    headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+                    key = (HTTP, url, "")
+                    response = ArchivedResponse(url, int(status_line.split()[1]), headers, body.decode('utf-8'), elapsed)
+                elif fields.get("WARC-Type") == "resource":
+                    key = (fields.get("WARC-Crawler-Renderer", SELENIUM), url, fields.get("WARC-Crawler-Root-Selector", ""))
+                    response = ArchivedResponse(url, 200, {}, block.decode('utf-8'), elapsed)
+                else:
+                    continue
+                
+                # Later records of a URL replace earlier ones
+                self._records[key] = response
+    
+    def lookup(self, url: str, renderer: str = HTTP, root_selector: Optional[str] = None) -> Optional[ArchivedResponse]:
+        """
+        Get an archived response without delay.
+        
+        Args:
+            url (str): Request URL (including query string)
+            renderer (str): HTTP or SELENIUM
+            root_selector (str, optional): Selector of a Selenium page
+        
+        Returns:
+            Optional[ArchivedResponse]: Response, or None if the URL was not recorded
+        """
+        return self._records.get((renderer, url, root_selector or ""))
+    
+    def delay(self, response: Optional[ArchivedResponse]) -> float:
+        """Latency to inject before serving a replayed response."""
+        if self.latency == "recorded":
+            return response.elapsed if response is not None else 0.0
+        return float(self.latency or 0)
+    
+    def replay(self, url: str, renderer: str = HTTP, root_selector: Optional[str] = None) -> Optional[ArchivedResponse]:
+        """
+        Get an archived response after the injected latency (see lookup).
+        """
+        response = self.lookup(url, renderer, root_selector)
+        delay = self.delay(response)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+    
+    def close(self):
+        """Close the file of a recording archive."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_archive: Optional[FetchArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_fetch_archive() -> Optional[FetchArchive]:
+    """
+    Get the process-wide fetch archive configured by config.FETCH_ARCHIVE.
+    
+    Returns:
+        Optional[FetchArchive]: Shared archive, or None if pages are neither recorded nor replayed
+    """
+    global _archive
+    
+    settings = config.FETCH_ARCHIVE
+    if not settings["mode"]:
+        return None
+    
+    with _archive_lock:
+        if _archive is None:
+            _archive = FetchArchive(settings["path"], settings["mode"], settings["latency"])
+            atexit.register(_archive.close)
+        return _archive
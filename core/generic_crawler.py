@@ -0,0 +1,252 @@
+import logging
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from core.base_crawler import BaseCrawler
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector once for the whole process.
+    
+    Args:
+        selector (str): CSS selector
+    
+    Returns:
+        soupsieve.SoupSieve: Compiled selector
+    """
+    return soupsieve.compile(selector)
+
+
+class GenericCrawler(BaseCrawler):
+    """
+    Crawler driven entirely by the "selectors" entry of a site configuration.
+    
+    Sites whose configuration sets "crawler": "generic" are crawled with this
+    class instead of a dedicated subclass. The selector schema is documented
+    above config.REGIONAL_SITES.
+    """
+    
+    # Keywords marking an attachment as a form to fill in
+    COMPILATIVE_KEYWORDS = ["modulo", "modell", "compil", "domanda", "richiesta"]
+    
+    # Listing pages followed when the site configuration has no "max_listing_pages"
+    DEFAULT_MAX_LISTING_PAGES = 20
+    
+    def __init__(self, site_config: Dict[str, Any], max_pages: int = 10, delay: float = 1.0):
+        """
+        Initialize the generic crawler.
+        
+        Args:
+            site_config (Dict[str, Any]): Site configuration (REGIONAL_SITES, COMMERCE_SITES or NATIONAL_SITES entry)
+            max_pages (int): Maximum number of pages to crawl
+            delay (float): Delay between requests in seconds
+        """
+        super().__init__(
+            base_url=site_config["base_url"],
+            max_pages=max_pages,
+            delay=delay
+        )
+        self.site_config = site_config
+        self.logger = logging.getLogger(f"GenericCrawler.{site_config['name']}")
+        
+        selectors = site_config["selectors"]
+        self.fingerprint_selector = selectors.get("fingerprint")
+        self.max_listing_pages = site_config.get("max_listing_pages", self.DEFAULT_MAX_LISTING_PAGES)
+        self.document_target_words = site_config.get("document_target_words", [])
+        
+        # Compile every selector of the site once, up front
+        self.list_items = compile_selector(selectors["list_items"])
+        self.link = compile_selector(selectors["link"])
+        self.next_page = compile_selector(selectors["next_page"]) if selectors.get("next_page") else None
+        self.attachments = compile_selector(selectors["attachments"]) if selectors.get("attachments") else None
+        
+        fields = dict(selectors.get("fields", {}))
+        if "Nome del bando" not in fields and selectors.get("title"):
+            fields["Nome del bando"] = selectors["title"]
+        self.fields = {column: compile_selector(selector) for column, selector in fields.items()}
+        self.dates = {column: compile_selector(selector) for column, selector in selectors.get("dates", {}).items()}
+    
+    def get_grant_listing_urls(self) -> List[str]:
+        """
+        Get URLs for individual grant listings, following the next page links.
+        
+        Pagination stops after max_listing_pages list pages, or as soon as max_pages
+        grant URLs have been found.
+        
+        Returns:
+            List[str]: List of URLs to individual grant pages
+        """
+        grant_urls = []
+        page_url = self.first_listing_page()
+        page = 0
+        
+        while page_url:
+            urls, page_url = self.get_listing_page(page_url, page)
+            for url in urls or []:
+                if url not in grant_urls:
+                    grant_urls.append(url)
+            
+            # Grants beyond max_pages would not be crawled
+            if len(grant_urls) >= self.max_pages:
+                break
+            page += 1
+        
+        self.logger.info(f"Found {len(grant_urls)} grant URLs")
+        return grant_urls
+    
+    def first_listing_page(self) -> Optional[str]:
+        """
+        Get the URL of the first page of the grants list.
+        
+        Returns:
+            Optional[str]: The configured "grants_url"
+        """
+        return self.site_config["grants_url"]
+    
+    def get_listing_page(self, page_url: str, page: int) -> Tuple[Optional[List[str]], Optional[str]]:
+        """
+        Get the grant URLs of a page of the grants list and the link to the next one.
+        
+        Args:
+            page_url (str): URL of the list page
+            page (int): Number of the page, starting from 0
+        
+        Returns:
+            Tuple[Optional[List[str]], Optional[str]]: Grant URLs of the page (None on
+            failure), and URL of the next page (None after the last page, after
+            max_listing_pages pages or on failure)
+        """
+        soup = self.get_page(page_url)
+        if not soup:
+            self.logger.error(f"Failed to fetch grants list page: {page_url}")
+            return None, None
+        
+        grant_urls = []
+        for element in soup.select(self.list_items):
+            link = element if element.name == "a" and element.has_attr("href") else element.select_one(self.link)
+            if link and link.has_attr("href"):
+                url = self.absolute_url(link["href"])
+                if url not in grant_urls:
+                    grant_urls.append(url)
+        
+        next_link = soup.select_one(self.next_page) if self.next_page and page + 1 < self.max_listing_pages else None
+        if not next_link or not next_link.has_attr("href"):
+            return grant_urls, None
+        return grant_urls, self.absolute_url(next_link["href"])
+    
+    def parse_grant_details(self, url: str) -> Dict[str, Any]:
+        """
+        Parse the details of a grant with the configured field selectors.
+        
+        Args:
+            url (str): URL of the grant detail page
+        
+        Returns:
+            Dict[str, Any]: Grant details in the required format
+        """
+        soup = self.get_page(url, regions=self.detail_regions)
+        
+        if not soup:
+            self.logger.error(f"Failed to fetch grant page: {url}")
+            return {}
+        
+        grant_data = {
+            "Link Bando": url,
+            "Link al sito del bando": url,
+            "Data creazione": datetime.now().strftime("%Y-%m-%d")
+        }
+        grant_data.update(self.site_config.get("static", {}))
+        
+        text_parts = []
+        for column, selector in self.fields.items():
+            element = soup.select_one(selector)
+            if element:
+                text = element.get_text(" ", strip=True)
+                grant_data[column] = self._map_grant_type(text) if column == "Tipo" else text
+                text_parts.append(text)
+        
+        # If we still don't have a description, use the title as a fallback
+        if "Descrizione breve (Plain text)" not in grant_data and "Nome del bando" in grant_data:
+            grant_data["Descrizione breve (Plain text)"] = grant_data["Nome del bando"]
+        
+        if "Descrizione del bando" not in grant_data and "Descrizione breve (Plain text)" in grant_data:
+            grant_data["Descrizione del bando"] = grant_data["Descrizione breve (Plain text)"]
+        
+        # Extract dates, deriving the internal deadline from the displayed one
+        for column, selector in self.dates.items():
+            element = soup.select_one(selector)
+            if element:
+                grant_data[column] = element.get_text(" ", strip=True)
+        
+        if "Scadenza" in grant_data and "Scadenza interna" not in grant_data:
+            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', grant_data["Scadenza"])
+            if date_match:
+                grant_data["Scadenza interna"] = date_match.group(1)
+        
+        # Extract attachments (if any)
+        if self.attachments:
+            attachments_section = soup.select_one(self.attachments)
+            if attachments_section:
+                attachments = self._extract_attachments(attachments_section)
+                if attachments.get("compilativi"):
+                    grant_data["Allegato Compilativo - X"] = ", ".join(attachments["compilativi"])
+                if attachments.get("informativi"):
+                    grant_data["Allegato informativo - X"] = ", ".join(attachments["informativi"])
+                text_parts.append(attachments_section.get_text(" ", strip=True))
+        
+        # Extract document requirements
+        doc_requirements, doc_contexts = self._extract_document_requirements("\n\n".join(text_parts))
+        if doc_requirements:
+            grant_data["Documentazione necessaria"] = "\n".join(f"- {doc}" for doc in doc_requirements)
+        
+        return grant_data
+    
+    def _map_grant_type(self, type_text: str) -> str:
+        """
+        Map the raw grant type text to standardized categories.
+        
+        Args:
+            type_text (str): Raw grant type text
+        
+        Returns:
+            str: Standardized grant type
+        """
+        type_text = type_text.lower()
+        
+        if any(keyword in type_text for keyword in ["sportello", "a sportello", "procedura sportello"]):
+            return "Procedura a sportello"
+        elif any(keyword in type_text for keyword in ["esaurimento", "fondi", "fino esaurimento"]):
+            return "Esaurimento fondi"
+        elif any(keyword in type_text for keyword in ["click", "clickday", "click day"]):
+            return "Clickday"
+        else:
+            return "Data di chiusura"  # Default type
+    
+    def _extract_attachments(self, attachments_section: BeautifulSoup) -> Dict[str, List[str]]:
+        """
+        Extract attachment links from the grant page.
+        
+        Args:
+            attachments_section (BeautifulSoup): Parsed HTML of the attachments section
+        
+        Returns:
+            Dict[str, List[str]]: Dictionary with attachment types and links
+        """
+        attachments = {
+            "compilativi": [],
+            "informativi": []
+        }
+        
+        for link in attachments_section.select("a[href]"):
+            link_text = link.text.lower()
+            attachment_type = "compilativi" if any(keyword in link_text for keyword in self.COMPILATIVE_KEYWORDS) else "informativi"
+            attachments[attachment_type].append(self.absolute_url(link["href"]))
+        
+        return attachments
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import config
+from core.site_config import find_site_config
+
+logger = logging.getLogger("HTTPCache")
+
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache backed by SQLite.
+    
+    Stores the body, headers, ETag and Last-Modified of every successful GET so
+    that later runs can revalidate with If-None-Match / If-Modified-Since and
+    serve 304 responses from disk. Entries older than the TTL are evicted, and
+    the least recently used entries are evicted once the cache exceeds its size.
+    """
+    
+    # Number of stores between two eviction passes
+    PRUNE_INTERVAL = 200
+    
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600, max_size_mb: int = 500):
+        """
+        Initialize the response cache.
+        
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (int): Seconds after which an entry is evicted
+            max_size_mb (int): Maximum total size of cached bodies in megabytes
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._stores_since_prune = 0
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                headers TEXT,
+                body TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+        self.conn.commit()
+        self.prune()
+    
+    def get(self, url: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            url (str): Request URL (including query string)
+            ttl (int, optional): Site-specific TTL; entries older than it are ignored
+        
+        Returns:
+            Optional[Dict[str, Any]]: Cached entry with body, headers, etag, last_modified
+            and stored_at, or None if the URL is not cached
+        """
+        ttl = self.ttl if ttl is None else ttl
+        
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if not row or time.time() - row[5] > ttl:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        
+        return {
+            "status": row[0],
+            "headers": json.loads(row[1]),
+            "body": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "stored_at": row[5],
+        }
+    
+    def store(self, url: str, status: int, headers: Dict[str, str], body: str):
+        """
+        Store (or replace) a response.
+        
+        Args:
+            url (str): Request URL (including query string)
+            status (int): HTTP status code
+            headers (Dict[str, str]): Response headers
+            body (str): Decoded response body
+        """
+        now = time.time()
+        
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(dict(headers)), body, headers.get("ETag"),
+                 headers.get("Last-Modified"), now, now, len(body.encode("utf-8")))
+            )
+            self.conn.commit()
+            self._stores_since_prune += 1
+            prune = self._stores_since_prune >= self.PRUNE_INTERVAL
+        
+        if prune:
+            self.prune()
+    
+    def mark_revalidated(self, url: str):
+        """
+        Refresh an entry after the server answered 304 Not Modified.
+        
+        Args:
+            url (str): Request URL (including query string)
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+    
+    def prune(self):
+        """Evict expired entries, then least recently used entries above the size limit."""
+        with self._lock:
+            self._stores_since_prune = 0
+            self.conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+            
+            total_size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total_size > self.max_size:
+                evicted = 0
+                for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall():
+                    if total_size <= self.max_size:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    total_size -= size
+                    evicted += 1
+                logger.info(f"Evicted {evicted} responses to keep the cache under {self.max_size // (1024 * 1024)} MB")
+            
+            self.conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self.conn.close()
+
+
+def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build the revalidation headers for a cached entry.
+    
+    Args:
+        entry (Dict[str, Any]): Entry returned by ResponseCache.get
+    
+    Returns:
+        Dict[str, str]: If-None-Match / If-Modified-Since headers
+    """
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def get_cache_settings(url: str) -> Dict[str, Any]:
+    """
+    Get the cache settings that apply to a URL.
+    
+    The global config.HTTP_CACHE values are overridden by the "cache" entry of
+    the matching site configuration.
+    
+    Args:
+        url (str): Absolute URL
+    
+    Returns:
+        Dict[str, Any]: Settings with "enabled", "max_age" and "ttl" keys
+    """
+    settings = dict(config.HTTP_CACHE)
+    settings.update(find_site_config(url).get("cache", {}))
+    return settings
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+    
+    Returns:
+        Optional[ResponseCache]: Shared cache, or None if caching is disabled globally
+    """
+    global _cache
+    
+    if not config.HTTP_CACHE["enabled"]:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                path=config.HTTP_CACHE["path"],
+                ttl=config.HTTP_CACHE["ttl"],
+                max_size_mb=config.HTTP_CACHE["max_size_mb"]
+            )
+        return _cache
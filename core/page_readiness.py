@@ -0,0 +1,115 @@
+import logging
+import time
+from typing import Optional
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+logger = logging.getLogger("PageReadiness")
+
+# Installed in every new document through CDP, before the page's own scripts run:
+# counts in-flight fetch/XMLHttpRequest calls and records the time of the last
+# network and DOM activity
+READINESS_PROBE = """
+(function () {
+    if (window.__crawlerProbe) return;
+    var probe = window.__crawlerProbe = {pending: 0, lastNetwork: Date.now(), lastMutation: Date.now()};
+    function networkActivity() { probe.lastNetwork = Date.now(); }
+    
+    new MutationObserver(function () { probe.lastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            probe.pending++;
+            networkActivity();
+            return originalFetch.apply(this, arguments).finally(function () {
+                probe.pending--;
+                networkActivity();
+            });
+        };
+    }
+    
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.pending++;
+        networkActivity();
+        this.addEventListener("loadend", function () {
+            probe.pending--;
+            networkActivity();
+        });
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+_STATE_SCRIPT = """
+var probe = window.__crawlerProbe;
+return {
+    readyState: document.readyState,
+    found: arguments[0] ? document.querySelector(arguments[0]) !== null : true,
+    pending: probe ? probe.pending : 0,
+    lastActivity: probe ? Math.max(probe.lastNetwork, probe.lastMutation) : 0,
+    now: Date.now()
+};
+"""
+
+
+def install_readiness_probe(driver):
+    """
+    Install READINESS_PROBE in every document the driver loads from now on.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_PROBE})
+    except (WebDriverException, AttributeError) as e:
+        # Without the probe, readiness falls back to document.readyState and the selector
+        logger.warning(f"Could not install the page readiness probe: {e}")
+
+
+def wait_until_ready(driver, timeout: float, selector: Optional[str] = None, quiet_period: float = 0.5,
+                     after_action: bool = False, poll_interval: float = 0.1) -> bool:
+    """
+    Wait until the current page is ready to be read, at most `timeout` seconds.
+    
+    The page is ready when document.readyState is "complete", the selector (if any)
+    is present, no fetch/XHR request is in flight and neither the network nor the
+    DOM has changed for `quiet_period` seconds.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver
+        timeout (float): Upper bound of the wait in seconds
+        selector (str, optional): CSS selector that must be present
+        quiet_period (float): Seconds without network or DOM activity
+        after_action (bool): Count the quiet period from now at the earliest, for waits
+            following a click, scroll or submit whose effects may not have started yet
+        poll_interval (float): Seconds between checks
+    
+    Returns:
+        bool: True if the page became ready, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    started = None
+    
+    while True:
+        try:
+            state = driver.execute_script(_STATE_SCRIPT, selector)
+        except JavascriptException:
+            raise
+        except WebDriverException:
+            # The document is being replaced by a navigation
+            state = None
+        
+        if state is not None:
+            if started is None:
+                started = state["now"] if after_action else 0
+            quiet_for = (state["now"] - max(state["lastActivity"], started)) / 1000
+            if (state["readyState"] == "complete" and state["found"]
+                    and state["pending"] <= 0 and quiet_for >= quiet_period):
+                return True
+        
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval)
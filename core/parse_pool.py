@@ -0,0 +1,185 @@
+import logging
+import logging.config
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple, Union
+
+import config
+from core.base_crawler import BaseCrawler
+from core.data_processor import process_grant_data, validate_grant_data
+
+# Crawlers of the sites parsed by a worker process, created on first use
+_worker_crawlers: Dict[str, BaseCrawler] = {}
+
+
+class ParseTask(NamedTuple):
+    """Work item of the parse stage: a fetched grant detail page."""
+    url: str
+    site: str  # "<site_type>.<site_name>"
+    body: str
+
+
+def _init_worker(settings: Dict[str, Any]):
+    # Worker processes may be spawned without the command line overrides of config
+    for name, value in settings.items():
+        setattr(config, name, value)
+    logging.config.dictConfig(config.LOGGING_CONFIG)
+
+
+def _get_worker_crawler(site: str) -> Optional[BaseCrawler]:
+    if site not in _worker_crawlers:
+        from crawlers.registry import create_crawler
+        
+        site_type, site_name = site.split(".", 1)
+        _worker_crawlers[site], _ = create_crawler(site_type, site_name)
+    return _worker_crawlers[site]
+
+
+def parse_grant_page(task: ParseTask) -> Dict[str, Any]:
+    """
+    Parse, process and validate a grant detail page (runs in a worker process).
+    
+    The page is handed to the site's crawler through prefetch_page, so its
+    parse_grant_details implementation runs unchanged.
+    
+    Args:
+        task (ParseTask): Fetched grant detail page
+    
+    Returns:
+        Dict[str, Any]: Plain result dict with the raw "grant" returned by the crawler,
+        the "processed" grant and its validation "errors" (grant None if parsing failed)
+    """
+    result = {"url": task.url, "grant": None, "processed": None, "errors": []}
+    
+    crawler = _get_worker_crawler(task.site)
+    if crawler is None:
+        return result
+    
+    try:
+        crawler.prefetch_page(task.url, task.body)
+        grant = crawler.parse_grant_details(task.url)
+    except Exception as e:
+        crawler.logger.error(f"Error parsing grant details from {task.url}: {e}")
+        return result
+    
+    if grant:
+        processed_grant = process_grant_data(grant)
+        result.update(grant=grant, processed=processed_grant, errors=validate_grant_data(processed_grant))
+    return result
+
+
+class ParsePool:
+    """
+    Process pool running the CPU-bound stage of a crawl: parsing detail pages,
+    extracting their fields and document requirements, processing and validating.
+    
+    Crawler threads only fetch raw pages and submit them as ParseTask items, so
+    parsing scales across cores instead of being serialized on the GIL. A single
+    pool is shared by all the sites of a run.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Start the worker processes.
+        
+        Args:
+            max_workers (int, optional): Number of worker processes (default: number of CPUs)
+        """
+        settings = {name: getattr(config, name) for name in config.RUNTIME_SETTINGS}
+        # Workers are started on demand by fetcher threads: forking would copy locks held
+        # by other threads (logging, caches, rate limiters) into the children
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker, initargs=(settings,))
+    
+    def submit(self, task: ParseTask) -> Future:
+        """Submit a fetched page to the parse stage; the future returns the parse_grant_page result."""
+        return self.executor.submit(parse_grant_page, task)
+    
+    def crawl(self, crawler: BaseCrawler, site: str,
+              concurrency: int = 1) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[Dict[str, Any], List[str]]]]:
+        """
+        Crawl a site, fetching its detail pages in threads and parsing them in the pool.
+        
+        Pages are submitted as soon as they are downloaded, so parsing overlaps with
+        the remaining fetches. Grants known from the checkpoint or the state store
+        are returned without being parsed, as with BaseCrawler.crawl.
+        
+        Args:
+            crawler (BaseCrawler): Crawler of the site, used for listing and fetching
+            site (str): Site identifier ("<site_type>.<site_name>")
+            concurrency (int): Number of detail pages fetched in parallel
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Tuple[Dict[str, Any], List[str]]]]: Raw grants
+            in listing order, and the processed grant and validation errors of every grant
+            parsed in the pool, keyed by URL (see main.process_grants)
+        """
+        crawler.logger.info(f"Starting to crawl {crawler.base_url} (parse pool)")
+        
+        grant_urls = crawler.discover_grant_urls()[:crawler.max_pages]
+        crawler.logger.info(f"Found {len(grant_urls)} grant listings")
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix=crawler.__class__.__name__) as fetchers:
+            pending = [(url, fetchers.submit(self.fetch, crawler, site, url)) for url in grant_urls]
+            grants, parsed = self.collect(crawler, [(url, fetched.result()) for url, fetched in pending])
+        
+        crawler.logger.info(f"Successfully crawled {len(grants)} grants")
+        return grants, parsed
+    
+    def fetch(self, crawler: BaseCrawler, site: str, url: str) -> Union[Future, Optional[Dict[str, Any]]]:
+        """
+        Fetch a grant detail page and submit it to the pool.
+        
+        Args:
+            crawler (BaseCrawler): Crawler of the site
+            site (str): Site identifier ("<site_type>.<site_name>")
+            url (str): URL of the grant detail page
+        
+        Returns:
+            Union[Future, Optional[Dict[str, Any]]]: Future of the parse result, or the grant
+            known from the checkpoint or state store (None if the fetch failed)
+        """
+        html, grant = crawler.fetch_grant_page(url)
+        if html is None:
+            return grant
+        return self.submit(ParseTask(url, site, html))
+    
+    def collect(self, crawler: BaseCrawler, outcomes: List[Tuple[str, Union[Future, Optional[Dict[str, Any]]]]]
+                ) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[Dict[str, Any], List[str]]]]:
+        """
+        Wait for the parse results of a site's pages, checkpointing the parsed grants.
+        
+        Args:
+            crawler (BaseCrawler): Crawler of the site
+            outcomes (List[Tuple[str, ...]]): (url, fetch result) pairs in listing order
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Tuple[Dict[str, Any], List[str]]]]: Raw grants
+            and processed results keyed by URL, as returned by crawl
+        """
+        grants = []
+        parsed = {}
+        for url, outcome in outcomes:
+            if isinstance(outcome, Future):
+                try:
+                    result = outcome.result()
+                except Exception as e:
+                    crawler.logger.error(f"Error parsing grant details from {url}: {e}")
+                    continue
+                outcome = result["grant"]
+                if outcome:
+                    crawler._checkpoint_grant(url, outcome)
+                    parsed[url] = (result["processed"], result["errors"])
+            if outcome:
+                grants.append(outcome)
+        return grants, parsed
+    
+    def close(self):
+        """Shut the worker processes down."""
+        self.executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,238 @@
+import logging
+import re
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import PARSER_BACKENDS
+
+try:
+    import lxml  # noqa: F401 (BeautifulSoup "lxml" tree builder)
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # selectolax is only required by the "selectolax" backend
+    LexborHTMLParser = None
+
+logger = logging.getLogger("ParserBackends")
+
+_warned_fallbacks = set()
+
+
+def _selector_string(selector) -> str:
+    # Selectors precompiled with soupsieve keep their source in `pattern`
+    return getattr(selector, "pattern", selector)
+
+
+class SelectolaxNode:
+    """
+    Minimal BeautifulSoup-like view of a selectolax (lexbor) node.
+    
+    Supports what most crawlers need: select, select_one, text, get_text,
+    name and attribute access. Navigation (find, find_all, parents, siblings)
+    and the non-standard :contains pseudo-class are not available, so the
+    "selectolax" backend must only be enabled for crawlers that do not use them.
+    """
+    
+    __slots__ = ("_node",)
+    
+    def __init__(self, node):
+        self._node = node
+    
+    @property
+    def name(self) -> str:
+        return self._node.tag
+    
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return {name: value or "" for name, value in self._node.attributes.items()}
+    
+    def has_attr(self, name: str) -> bool:
+        return name in self._node.attributes
+    
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        if name not in self._node.attributes:
+            return default
+        return self._node.attributes[name] or ""
+    
+    def __getitem__(self, name: str) -> str:
+        return self._node.attributes[name] or ""
+    
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+    
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+    
+    def select(self, selector) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(_selector_string(selector))]
+    
+    def select_one(self, selector) -> Optional["SelectolaxNode"]:
+        node = self._node.css_first(_selector_string(selector))
+        return SelectolaxNode(node) if node is not None else None
+    
+    def __str__(self) -> str:
+        return self._node.html or ""
+
+
+class SelectolaxDocument(SelectolaxNode):
+    """Parsed document of the "selectolax" backend."""
+    
+    __slots__ = ("_parser",)
+    
+    def __init__(self, html: str):
+        self._parser = LexborHTMLParser(html)
+        super().__init__(self._parser.root)
+
+
+# Compound selector made of an optional tag name followed by classes, ids and attributes
+_COMPOUND_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:\.[\w-]+|#[\w-]+|\[[\w-]+(?:=["\']?[^"\'\]]*["\']?)?\])*)$')
+_SELECTOR_PART = re.compile(r'\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:=["\']?([^"\'\]]*)["\']?)?\]')
+
+
+class RegionStrainer(SoupStrainer):
+    """
+    SoupStrainer building only the subtrees of the regions of a page.
+    
+    A region is a simple CSS selector: a tag name, classes, an id and attributes
+    ("h1", ".lead", "div.scheda-informativa", "#content", "section[role=main]").
+    Elements matching any region are built with all their descendants, everything
+    outside them is skipped by the tree builder. For selectors with combinators
+    only the first compound is used, so "main .lead" keeps the whole <main>.
+    """
+    
+    def __init__(self, regions: List[str]):
+        """
+        Compile the region selectors.
+        
+        Args:
+            regions (List[str]): Region selectors
+        
+        Raises:
+            ValueError: If a selector is not a simple selector
+        """
+        super().__init__()
+        self.regions = list(regions)
+        self._rules = [self._compile(region) for region in self.regions]
+    
+    @staticmethod
+    def _compile(region: str) -> Tuple[Optional[str], List[str], Optional[str], Dict[str, Optional[str]]]:
+        compound = re.split(r'\s*[\s>+~]\s*', region.strip())[0]
+        match = _COMPOUND_SELECTOR.match(compound)
+        if not compound or not match:
+            raise ValueError(f"Unsupported region selector: {region!r}")
+        
+        tag = match.group(1) if match.group(1) != "*" else None
+        classes, element_id, attrs = [], None, {}
+        for class_name, id_value, attr, attr_value in _SELECTOR_PART.findall(match.group(2)):
+            if class_name:
+                classes.append(class_name)
+            elif id_value:
+                element_id = id_value
+            else:
+                attrs[attr] = attr_value or None
+        return tag.lower() if tag else None, classes, element_id, attrs
+    
+    def _matches(self, name: str, attrs: Dict[str, str]) -> bool:
+        attrs = attrs or {}
+        for tag, classes, element_id, required in self._rules:
+            if tag and tag != name:
+                continue
+            if classes:
+                element_classes = attrs.get("class") or ""
+                if isinstance(element_classes, str):
+                    element_classes = element_classes.split()
+                if not all(class_name in element_classes for class_name in classes):
+                    continue
+            if element_id and attrs.get("id") != element_id:
+                continue
+            if any(attr not in attrs or (value is not None and attrs[attr] != value) for attr, value in required.items()):
+                continue
+            return True
+        return False
+    
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, str]]) -> bool:
+        return self._matches(name, attrs)
+    
+    def allow_string_creation(self, string: str) -> bool:
+        # Text outside every region is never needed
+        return False
+    
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # Tree builder hook of beautifulsoup4 < 4.13
+        return self._matches(markup_name, markup_attrs)
+
+
+@lru_cache(maxsize=64)
+def get_region_strainer(regions: Tuple[str, ...]) -> RegionStrainer:
+    """
+    Get the strainer of a set of regions, compiling it on first use.
+    
+    Args:
+        regions (Tuple[str, ...]): Region selectors
+    
+    Returns:
+        RegionStrainer: Shared strainer of the regions
+    """
+    return RegionStrainer(list(regions))
+
+
+def _fallback(backend: str, reason: str) -> str:
+    if backend not in _warned_fallbacks:
+        _warned_fallbacks.add(backend)
+        logger.warning(f"Parser backend '{backend}' unavailable ({reason}), using html.parser")
+    return "html.parser"
+
+
+def strip_tags(document: Union[BeautifulSoup, SelectolaxDocument], tags: List[str]):
+    """
+    Remove the elements with the given tag names, with their content, from a document.
+    
+    Args:
+        document (Union[BeautifulSoup, SelectolaxDocument]): Document returned by parse_html
+        tags (List[str]): Tag names, e.g. ["script", "style"]
+    """
+    if isinstance(document, SelectolaxNode):
+        document._node.strip_tags(tags)
+    else:
+        for element in document(tags):
+            element.decompose()
+
+
+def parse_html(html: str, backend: str = "html.parser",
+               regions: Optional[List[str]] = None) -> Union[BeautifulSoup, SelectolaxDocument]:
+    """
+    Parse HTML with the requested backend.
+    
+    Args:
+        html (str): Raw HTML
+        backend (str): One of PARSER_BACKENDS. Unavailable backends fall back to html.parser
+        regions (List[str], optional): Region selectors (see RegionStrainer) limiting the
+            tree to the subtrees of the page that are needed. The whole page is parsed
+            when none of them is found, and with the "selectolax" backend
+    
+    Returns:
+        Union[BeautifulSoup, SelectolaxDocument]: Parsed document
+    """
+    if backend == "selectolax":
+        if LexborHTMLParser is not None:
+            return SelectolaxDocument(html)
+        backend = _fallback(backend, "pip install selectolax")
+    elif backend == "lxml" and not LXML_AVAILABLE:
+        backend = _fallback(backend, "pip install lxml")
+    elif backend not in PARSER_BACKENDS:
+        backend = _fallback(backend, "unknown backend")
+    
+    if regions:
+        soup = BeautifulSoup(html, backend, parse_only=get_region_strainer(tuple(regions)))
+        if soup.find() is not None:
+            return soup
+        logger.debug(f"None of the regions {regions} found, parsing the whole page")
+    
+    return BeautifulSoup(html, backend)
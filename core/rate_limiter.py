@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from core.site_config import find_site_config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate to a single host.
+    
+    Callers reserve a token before sending a request. When the bucket is empty
+    the reservation is still granted, but the caller is told how long to wait,
+    so concurrent callers queue up at the configured rate instead of sleeping
+    after every response.
+    """
+    
+    def __init__(self, requests_per_second: Optional[float], burst: int = 1):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            requests_per_second (float, optional): Refill rate. None or <= 0 disables limiting
+            burst (int): Maximum number of requests that can be sent back to back
+        """
+        self.rate = requests_per_second if requests_per_second and requests_per_second > 0 else None
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self) -> float:
+        """
+        Reserve a token.
+        
+        Returns:
+            float: Seconds the caller must wait before sending its request
+        """
+        if self.rate is None:
+            return 0.0
+        
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def ready_in(self) -> float:
+        """
+        Time until a request may be sent, without reserving a token.
+        
+        Returns:
+            float: Seconds until a token is available (0 if one is available now)
+        """
+        if self.rate is None:
+            return 0.0
+        
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) / self.rate
+    
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str, default_delay: float = 1.0) -> TokenBucket:
+    """
+    Get the rate limiter shared by all crawlers and threads requesting a host.
+    
+    Limits are read from the "rate_limit" entry of the matching site in
+    config.REGIONAL_SITES / COMMERCE_SITES / NATIONAL_SITES. Missing values fall
+    back to one request every `default_delay` seconds with no burst.
+    
+    Args:
+        url (str): Absolute URL about to be requested
+        default_delay (float): Delay between requests used when the site has no configured rate
+    
+    Returns:
+        TokenBucket: Rate limiter of the URL's host
+    """
+    host = urlparse(url).netloc
+    
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            limits = find_site_config(url).get("rate_limit", {})
+            default_rate = 1.0 / default_delay if default_delay and default_delay > 0 else None
+            bucket = TokenBucket(
+                requests_per_second=limits.get("requests_per_second", default_rate),
+                burst=limits.get("burst", 1)
+            )
+            _buckets[host] = bucket
+        return bucket
@@ -0,0 +1,76 @@
+import logging
+from typing import List, Dict, Any
+
+from selenium.common.exceptions import WebDriverException
+
+import config
+from core.site_config import find_site_config
+
+logger = logging.getLogger("ResourceBlocking")
+
+# URL patterns of the resource types of config.SELENIUM_BLOCKING
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+    "media": ["*.mp4*", "*.webm*", "*.ogg*", "*.mp3*", "*.wav*", "*.m3u8*", "*.mov*"],
+}
+
+
+def get_blocking_settings(url: str) -> Dict[str, Any]:
+    """
+    Get the resource blocking settings that apply to a URL.
+    
+    The global config.SELENIUM_BLOCKING values are overridden by the
+    "block_resources" entry of the matching site configuration.
+    
+    Args:
+        url (str): Absolute URL
+    
+    Returns:
+        Dict[str, Any]: Settings with "resource_types" and "url_patterns" keys
+    """
+    settings = dict(config.SELENIUM_BLOCKING)
+    settings.update(find_site_config(url).get("block_resources", {}))
+    return settings
+
+
+def get_blocked_url_patterns(url: str) -> List[str]:
+    """
+    Get the Chrome URL patterns blocked while rendering a site's pages.
+    
+    Args:
+        url (str): Absolute URL of the site
+    
+    Returns:
+        List[str]: Patterns for Network.setBlockedURLs
+    """
+    settings = get_blocking_settings(url)
+    
+    patterns = []
+    for resource_type in settings["resource_types"]:
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            logger.warning(f"Unknown resource type to block: {resource_type}")
+            continue
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(settings["url_patterns"])
+    return patterns
+
+
+def apply_resource_blocking(driver, url: str):
+    """
+    Block the resources configured for a site in a Chrome WebDriver.
+    
+    The blocklist replaces the one of the site previously rendered by the driver,
+    so it must be applied every time a pooled driver is checked out.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver
+        url (str): Absolute URL of the site about to be rendered
+    """
+    patterns = get_blocked_url_patterns(url)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except (WebDriverException, AttributeError) as e:
+        logger.warning(f"Could not block resources for {url}: {e}")
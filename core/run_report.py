@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, List
+
+# Outcomes of a site
+CRAWLED = "crawled"
+SKIPPED = "skipped"  # Hosts of the site had an open circuit (see core.circuit_breaker)
+RESUMED = "resumed"  # Completed by a previous attempt of the run (checkpoint)
+FAILED = "failed"
+PARTIAL = "partial"  # Exported, but listing pages could not be fetched (crawled again on resume)
+
+
+class RunReport:
+    """
+    Outcome of every site of a run, logged and saved as JSON when the run ends.
+    """
+    
+    def __init__(self, run_id: str):
+        """
+        Initialize an empty report.
+        
+        Args:
+            run_id (str): Identifier of the run
+        """
+        self.run_id = run_id
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.sites: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def record_site(self, site: str, status: str, grants: int = 0, skipped_hosts: Iterable[str] = ()):
+        """
+        Record the outcome of a site.
+        
+        Args:
+            site (str): Site identifier ("<site_type>.<site_name>")
+            status (str): CRAWLED, SKIPPED, RESUMED, FAILED or PARTIAL
+            grants (int): Number of grants exported for the site
+            skipped_hosts (Iterable[str]): Hosts whose open circuit made requests fail fast
+        """
+        entry = {"status": status, "grants": grants}
+        if skipped_hosts:
+            entry["skipped_hosts"] = sorted(skipped_hosts)
+        with self._lock:
+            self.sites[site] = entry
+    
+    def sites_with_status(self, status: str) -> List[str]:
+        """Sites recorded with the given status."""
+        with self._lock:
+            return [site for site, entry in self.sites.items() if entry["status"] == status]
+    
+    def summary(self) -> str:
+        """Number of sites of each status, e.g. "16 crawled, 1 resumed, 1 skipped"."""
+        with self._lock:
+            statuses = [entry["status"] for entry in self.sites.values()]
+        return ", ".join(f"{statuses.count(status)} {status}" for status in sorted(set(statuses)))
+    
+    def save(self, directory: str) -> str:
+        """
+        Write the report to run_report_<run_id>.json.
+        
+        Args:
+            directory (str): Directory of the report file
+        
+        Returns:
+            str: Path of the report
+        
+        Raises:
+            OSError: If the report cannot be written
+        """
+        with self._lock:
+            report = {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "sites": dict(self.sites),
+            }
+        
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"run_report_{self.run_id}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
@@ -0,0 +1,319 @@
+import heapq
+import itertools
+import logging
+import queue
+import threading
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import config
+from core.base_crawler import BaseCrawler
+from core.rate_limiter import get_rate_limiter
+from core.adaptive_concurrency import get_concurrency_limiter
+
+# Task priorities: listings first, so every site's detail pages join the queue early
+LISTING = 0
+DETAIL = 1
+
+
+class CrawlTask(NamedTuple):
+    """Fetch task of the scheduler: a listing page of a site or one of its detail pages."""
+    priority: int  # LISTING or DETAIL
+    site: str  # "<site_type>.<site_name>"
+    url: str
+    index: int  # Number of the listing page, or position of the detail page in the listing
+
+
+class _SiteState:
+    """Progress of a site within the scheduler."""
+    
+    def __init__(self, crawler: BaseCrawler, max_in_flight: int, paged: bool):
+        self.crawler = crawler
+        self.max_in_flight = max_in_flight
+        self.paged = paged  # Listing read one page per task (see BaseCrawler.get_listing_page)
+        self.in_flight = 0
+        self.pending = 0  # Tasks queued or running
+        self.outcomes: List[Tuple[str, Any]] = []
+        self.seen: Set[str] = set()  # Grant URLs already queued
+        self.listing_complete = True  # No listing page failed
+
+
+class CrawlScheduler:
+    """
+    URL-level scheduler sharing a pool of worker threads between all sites of a run.
+    
+    Each site starts with a listing task. For crawlers with a paged listing (see
+    BaseCrawler.first_listing_page) every listing page is a task of its own, which
+    queues the grant URLs it finds as detail tasks and the next listing page as a new
+    listing task. Other crawlers collect their whole listing in a single task with
+    get_grant_listing_urls, holding a worker through all their listing pages.
+    
+    Workers always pull a task of a host that is eligible right now (under its
+    per_host and adaptive concurrency limits and with a token in its rate limiter, see
+    core.adaptive_concurrency and core.rate_limiter), preferring listings and then the
+    host with the most queued tasks. A slow site therefore never holds a worker while
+    it waits for its rate limit, and the run takes about as long as the slowest host
+    needs on its own.
+    
+    Selenium-based crawlers hold a WebDriver of the shared pool from their first page
+    until they are closed, so no more of their sites are started at once than the pool
+    has drivers (config.SELENIUM_POOL); otherwise workers would wait for a free driver
+    instead of crawling other hosts. Each crawler is closed as soon as its last page
+    is fetched.
+    """
+    
+    def __init__(self, workers: int = 4, per_host: int = 2, site_concurrency: int = 1, parse_pool=None):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            workers (int): Number of worker threads
+            per_host (int): Maximum number of tasks running at once per host
+            site_concurrency (int): Maximum number of tasks running at once per site (lowered
+                to the crawler's max_concurrency if it has one)
+            parse_pool (ParsePool, optional): Process pool parsing the detail pages, which are
+                then only fetched by the workers
+        """
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.site_concurrency = max(1, site_concurrency)
+        self.parse_pool = parse_pool
+        self.driver_slots = max(1, config.SELENIUM_POOL["size"])
+        self.logger = logging.getLogger("CrawlScheduler")
+        
+        self._sites: Dict[str, _SiteState] = {}
+        self._queues: Dict[str, List[Tuple[int, int, CrawlTask]]] = {}
+        self._host_in_flight: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._open_sites = 0
+        self._driver_sites: Set[str] = set()  # Started sites holding a WebDriver
+        self._condition = threading.Condition()
+        self._completed: "queue.Queue[Tuple[str, BaseCrawler, List[Tuple[str, Any]]]]" = queue.Queue()
+    
+    def add_site(self, site: str, crawler: BaseCrawler):
+        """
+        Schedule the crawl of a site, starting with its listing.
+        
+        Args:
+            site (str): Site identifier ("<site_type>.<site_name>")
+            crawler (BaseCrawler): Crawler of the site
+        """
+        max_in_flight = min(self.site_concurrency, crawler.max_concurrency or self.site_concurrency)
+        
+        # Grant URLs of a checkpointed attempt are reused as a whole by discover_grant_urls
+        first_page = crawler.first_listing_page()
+        if crawler.checkpoint is not None and crawler.checkpoint.urls is not None:
+            first_page = None
+        
+        with self._condition:
+            self._sites[site] = _SiteState(crawler, max_in_flight, paged=first_page is not None)
+            self._open_sites += 1
+            self._push(CrawlTask(LISTING, site, first_page or crawler.base_url, 0))
+            self._condition.notify()
+    
+    def _host(self, task: CrawlTask) -> str:
+        return urlparse(self._sites[task.site].crawler.absolute_url(task.url)).netloc
+    
+    def _push(self, task: CrawlTask):
+        # Called with the condition held
+        heapq.heappush(self._queues.setdefault(self._host(task), []), (task.priority, next(self._sequence), task))
+        self._sites[task.site].pending += 1
+    
+    def _site_ready(self, name: str) -> bool:
+        # Called with the condition held
+        site = self._sites[name]
+        if site.in_flight >= site.max_in_flight:
+            return False
+        # A Selenium site not started yet needs a free WebDriver of the pool
+        return (not site.crawler.uses_webdriver or name in self._driver_sites
+                or len(self._driver_sites) < self.driver_slots)
+    
+    def _next_task(self) -> Optional[CrawlTask]:
+        """Wait for a task whose host is eligible, or return None once all sites are done."""
+        with self._condition:
+            while True:
+                if self._open_sites == 0:
+                    return None
+                
+                best = None
+                wait = None
+                for host, host_queue in self._queues.items():
+                    # Tasks of other sites sharing the host do not wait behind a site
+                    # held back by its own limits
+                    entry = min((entry for entry in host_queue if self._site_ready(entry[2].site)), default=None)
+                    if entry is None:
+                        continue
+                    priority, sequence, task = entry
+                    site = self._sites[task.site]
+                    url = site.crawler.absolute_url(task.url)
+                    
+                    # The adaptive limit of the host may be below per_host
+                    limiter = get_concurrency_limiter(url)
+                    if self._host_in_flight.get(host, 0) >= min(self.per_host, limiter.max_in_flight or self.per_host):
+                        continue
+                    
+                    ready_in = max(limiter.ready_in(), get_rate_limiter(url, site.crawler.delay).ready_in())
+                    if ready_in > 0:
+                        wait = ready_in if wait is None else min(wait, ready_in)
+                        continue
+                    
+                    # Longest queue first, so the host with the most work left is never idle
+                    key = (priority, -len(host_queue), sequence)
+                    if best is None or key < best[0]:
+                        best = (key, host, entry)
+                
+                if best is not None:
+                    _, host, entry = best
+                    host_queue = self._queues[host]
+                    host_queue.remove(entry)
+                    heapq.heapify(host_queue)
+                    task = entry[2]
+                    self._host_in_flight[host] = self._host_in_flight.get(host, 0) + 1
+                    self._sites[task.site].in_flight += 1
+                    if self._sites[task.site].crawler.uses_webdriver:
+                        self._driver_sites.add(task.site)
+                    return task
+                
+                # Sleep until a rate limiter refills or a running task ends
+                self._condition.wait(wait)
+    
+    def _finish(self, task: CrawlTask):
+        with self._condition:
+            host = self._host(task)
+            self._host_in_flight[host] -= 1
+            site = self._sites[task.site]
+            site.in_flight -= 1
+            site.pending -= 1
+            done = site.pending == 0
+            self._condition.notify_all()
+        
+        if not done:
+            return
+        
+        # The WebDriver is back in the pool before another Selenium site may start
+        try:
+            site.crawler.close()
+        except Exception as e:
+            self.logger.error(f"Error closing the crawler of {task.site}: {e}")
+        
+        with self._condition:
+            self._driver_sites.discard(task.site)
+            self._open_sites -= 1
+            self._completed.put((task.site, site.crawler, site.outcomes))
+            self._condition.notify_all()
+    
+    def _queue_details(self, site: str, grant_urls: List[str]):
+        # Called with the condition held; outcomes keep the listing order
+        state = self._sites[site]
+        for url in grant_urls:
+            if len(state.outcomes) >= state.crawler.max_pages:
+                break
+            # Items repeated on several listing pages are fetched once
+            if state.paged and url in state.seen:
+                continue
+            state.seen.add(url)
+            state.outcomes.append((url, None))
+            self._push(CrawlTask(DETAIL, site, url, len(state.outcomes) - 1))
+    
+    def _run_listing(self, task: CrawlTask):
+        state = self._sites[task.site]
+        crawler = state.crawler
+        if task.index == 0:
+            crawler.logger.info(f"Starting to crawl {crawler.base_url} (scheduled)")
+        
+        if state.paged:
+            self._run_listing_page(task)
+            return
+        
+        try:
+            grant_urls = crawler.discover_grant_urls()
+        except Exception as e:
+            crawler.logger.error(f"Error getting grant listings: {e}")
+            grant_urls = []
+        
+        with self._condition:
+            self._queue_details(task.site, grant_urls)
+            found = len(state.outcomes)
+        crawler.logger.info(f"Found {found} grant listings")
+    
+    def _run_listing_page(self, task: CrawlTask):
+        state = self._sites[task.site]
+        crawler = state.crawler
+        
+        try:
+            grant_urls, next_page = crawler.get_listing_page(task.url, task.index)
+        except Exception as e:
+            crawler.logger.error(f"Error getting grant listings from {task.url}: {e}")
+            grant_urls, next_page = None, None
+        
+        with self._condition:
+            if grant_urls is None:
+                state.listing_complete = False
+                grant_urls = []
+            self._queue_details(task.site, grant_urls)
+            if next_page and len(state.outcomes) < crawler.max_pages:
+                self._push(CrawlTask(LISTING, task.site, next_page, task.index + 1))
+                return
+            found = [url for url, _ in state.outcomes]
+        
+        # Last listing page of the site (detail fetches of the site may already have
+        # failed, so failed_fetches does not tell whether the listing is complete)
+        crawler.logger.info(f"Found {len(found)} grant listings")
+        crawler.record_listing(found, state.listing_complete)
+    
+    def _run_detail(self, task: CrawlTask):
+        crawler = self._sites[task.site].crawler
+        
+        if self.parse_pool is not None:
+            try:
+                outcome = self.parse_pool.fetch(crawler, task.site, task.url)
+            except Exception as e:
+                crawler.logger.error(f"Error fetching grant page {task.url}: {e}")
+                outcome = None
+        else:
+            outcome = crawler.crawl_grant(task.url)
+        
+        self._sites[task.site].outcomes[task.index] = (task.url, outcome)
+    
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            try:
+                if task.priority == LISTING:
+                    self._run_listing(task)
+                else:
+                    self._run_detail(task)
+            except Exception as e:
+                self.logger.error(f"Unexpected error in task {task.url} of {task.site}: {e}", exc_info=True)
+            finally:
+                self._finish(task)
+    
+    def run(self) -> Iterator[Tuple[str, BaseCrawler, List[Tuple[str, Any]]]]:
+        """
+        Crawl all added sites, yielding each one as soon as its last task is done.
+        
+        Crawlers are yielded already closed, their pages having all been fetched.
+        
+        Yields:
+            Tuple[str, BaseCrawler, List[Tuple[str, Any]]]: Site identifier, crawler and
+            (url, outcome) pairs in listing order. Outcomes are the grant returned by
+            BaseCrawler.crawl_grant (None on failure), or with a parse pool the result
+            of ParsePool.fetch, to be passed to ParsePool.collect
+        """
+        with self._condition:
+            remaining = len(self._sites)
+        
+        threads = [
+            threading.Thread(target=self._work, name=f"CrawlScheduler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        for _ in range(remaining):
+            yield self._completed.get()
+        
+        for thread in threads:
+            thread.join()
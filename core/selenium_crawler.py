@@ -1,29 +1,85 @@
+import json
 import logging
 import time
-import random
 from typing import List, Dict, Any, Optional
-from abc import ABC, abstractmethod
+from abc import ABC
+import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 
-import config
+from core.api_capture import extract_api_requests, get_api_endpoint_store
 from core.base_crawler import BaseCrawler
+from core.circuit_breaker import get_circuit_breaker
+from core.driver_pool import WebDriverPool, get_driver_pool
+from core.fetch_archive import REPLAY, SELENIUM, get_fetch_archive
+from core.page_readiness import wait_until_ready
+from core.resource_blocking import apply_resource_blocking
+from core.rate_limiter import get_rate_limiter
+
+
+# outerHTML of the elements matching a selector, serialized in the browser
+_SUBTREE_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (element) {
+    return element.outerHTML;
+}).join("");
+"""
+
+# Text or attribute of fields within each item matching a selector
+_EXTRACT_SCRIPT = """
+var fields = arguments[1];
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (item) {
+    var data = {};
+    Object.keys(fields).forEach(function (name) {
+        var parts = fields[name].split("@");
+        var element = parts[0] ? item.querySelector(parts[0]) : item;
+        if (!element) {
+            data[name] = null;
+        } else if (parts.length > 1) {
+            data[name] = element.getAttribute(parts[1]);
+        } else {
+            data[name] = element.textContent.trim();
+        }
+    });
+    return data;
+});
+"""
 
 
 class SeleniumCrawler(BaseCrawler, ABC):
     """
     Selenium-based crawler for JavaScript-heavy websites.
     Inherits from BaseCrawler and extends its functionality.
+    
+    The WebDriver is checked out of the run's shared WebDriverPool on first use
+    and returned to it when the crawl ends (or on close_driver).
+    
+    Pages are read as soon as they are ready (see core.page_readiness) rather than
+    after fixed sleeps; the configured waits are only upper bounds. Images, fonts,
+    media and trackers are not loaded (config.SELENIUM_BLOCKING).
+    
+    The JSON endpoints called by rendered pages can be recorded and then requested
+    directly with get_api_json, skipping the browser on later runs. Methods returning
+    the rendered page accept a root_selector limiting it to the needed subtree, and
+    extract_with_selenium returns structured data without transferring any HTML.
     """
     
+    # Seconds without network or DOM activity after which a page is considered settled
+    quiet_period: float = 0.5
+    
+    # Record the JSON endpoints called by every page rendered with get_page_with_selenium
+    capture_api_endpoints: bool = False
+    
+    # A WebDriver instance is not thread-safe
+    max_concurrency: Optional[int] = 1
+    
+    uses_webdriver: bool = True
+    
     def __init__(self, base_url: str, max_pages: int = 10, delay: float = 1.0, timeout: int = 30):
         """
         Initialize the Selenium crawler.
@@ -36,30 +92,22 @@ class SeleniumCrawler(BaseCrawler, ABC):
         """
         super().__init__(base_url, max_pages, delay, timeout)
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.driver = None
-        self.initialize_driver()
+        self.driver_pool: WebDriverPool = get_driver_pool()
+        self._driver: Optional[webdriver.Chrome] = None
+    
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """WebDriver of the crawler, checked out of the pool on first use."""
+        if self._driver is None:
+            self.initialize_driver()
+        return self._driver
     
     def initialize_driver(self):
-        """Initialize the Selenium WebDriver."""
+        """Check a Selenium WebDriver out of the shared pool, waiting for a free one."""
         try:
-            # Configure Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  # Run in headless mode (no GUI)
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            # Set a random user agent
-            user_agent = random.choice(config.USER_AGENTS)
-            chrome_options.add_argument(f"--user-agent={user_agent}")
-            
-            # Initialize the WebDriver
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(self.timeout)
-            
-            self.logger.info("Selenium WebDriver initialized successfully")
-        
+            self._driver = self.driver_pool.checkout()
+            self._driver.set_page_load_timeout(self.timeout)
+            apply_resource_blocking(self._driver, self.base_url)
         except Exception as e:
             self.logger.error(f"Failed to initialize Selenium WebDriver: {e}")
             # Re-raise the exception to allow the caller to handle it
@@ -70,15 +118,51 @@ class SeleniumCrawler(BaseCrawler, ABC):
         self.close_driver()
     
     def close_driver(self):
-        """Close the WebDriver if it exists."""
-        if self.driver:
-            try:
-                self.driver.quit()
-                self.logger.info("Selenium WebDriver closed")
-            except Exception as e:
-                self.logger.error(f"Error closing Selenium WebDriver: {e}")
+        """Return the WebDriver to the pool if the crawler holds one."""
+        if getattr(self, "_driver", None) is not None:
+            driver, self._driver = self._driver, None
+            self.driver_pool.checkin(driver)
+    
+    def close(self):
+        """Return the WebDriver to the pool and close the HTTP session."""
+        self.close_driver()
+        super().close()
+    
+    def crawl(self, concurrency: int = 1) -> List[Dict[str, Any]]:
+        """
+        Crawl the website and collect grant data, releasing the WebDriver afterwards.
+        
+        Args:
+            concurrency (int): Ignored for Selenium-based crawlers
+            
+        Returns:
+            List[Dict[str, Any]]: List of grant details
+        """
+        try:
+            return super().crawl(concurrency)
+        finally:
+            self.close_driver()
     
-    def get_page_with_selenium(self, url: str, wait_for_selector: Optional[str] = None, wait_time: int = 10) -> BeautifulSoup:
+    def crawl_grants(self, grant_urls: List[str], concurrency: int = 1) -> List[Dict[str, Any]]:
+        """
+        Parse the detail pages of the given grants.
+        
+        A WebDriver instance is not thread-safe, so detail pages are always
+        processed sequentially regardless of the requested concurrency.
+        
+        Args:
+            grant_urls (List[str]): URLs of the grant detail pages
+            concurrency (int): Ignored for Selenium-based crawlers
+            
+        Returns:
+            List[Dict[str, Any]]: List of grant details
+        """
+        if concurrency > 1:
+            self.logger.info("Selenium crawlers fetch detail pages sequentially, ignoring concurrency")
+        return super().crawl_grants(grant_urls, concurrency=1)
+    
+    def get_page_with_selenium(self, url: str, wait_for_selector: Optional[str] = None, wait_time: int = 10,
+                               capture_api: bool = False, root_selector: Optional[str] = None) -> BeautifulSoup:
         """
         Fetch a page using Selenium and return its BeautifulSoup object.
         
@@ -86,6 +170,9 @@ class SeleniumCrawler(BaseCrawler, ABC):
             url (str): URL to fetch
             wait_for_selector (str, optional): CSS selector to wait for before parsing
             wait_time (int): Maximum time to wait for selector in seconds
+            capture_api (bool): Record the JSON endpoints called by the page (always
+                done when capture_api_endpoints is set)
+            root_selector (str, optional): Only return the subtrees matching this CSS selector
             
         Returns:
             BeautifulSoup: Parsed HTML
@@ -93,42 +180,198 @@ class SeleniumCrawler(BaseCrawler, ABC):
         if not url.startswith(('http://', 'https://')):
             url = urljoin(self.base_url, url)
             
+        # Offline replay of a recorded run, without starting Chrome (see core.fetch_archive)
+        archive = get_fetch_archive()
+        if archive is not None and archive.mode == REPLAY:
+            archived = archive.replay(url, SELENIUM, root_selector)
+            if archived is None:
+                self.logger.error(f"Page not in fetch archive: {url}")
+                self.failed_fetches += 1
+                return None
+            return self.parse_html(archived.body)
+        
         self.logger.info(f"Fetching page with Selenium: {url}")
         
+        # Hosts that stopped answering are not waited for, nor given a driver (see core.circuit_breaker)
+        breaker = get_circuit_breaker(url)
+        if not breaker.allow_request():
+            self.skipped_hosts.add(breaker.host)
+            self.logger.error(f"Skipping {url}: circuit of {breaker.host} is open")
+            self.failed_fetches += 1
+            return None
+        
         try:
+            try:
+                # Respect the host's rate limit (shared with other crawlers and threads)
+                get_rate_limiter(url, self.delay).acquire()
+                
+                # Discard the network events of previous pages (checking a driver out of
+                # the pool on first use)
+                self.driver.get_log("performance")
+            except BaseException:
+                # The host was not contacted
+                breaker.release_trial()
+                raise
+            
             # Navigate to the URL
-            self.driver.get(url)
+            started = time.monotonic()
+            try:
+                self.driver.get(url)
+            except WebDriverException:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release_trial()
+                raise
+            breaker.record_success()
+            self.driver_pool.record_page(self.driver)
             
-            # Wait for specific element if requested
-            if wait_for_selector:
-                try:
-                    WebDriverWait(self.driver, wait_time).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_selector))
-                    )
-                except TimeoutException:
-                    self.logger.warning(f"Timeout waiting for selector '{wait_for_selector}' on {url}")
+            # Wait for the document, its requests and the specific element if requested
+            if not wait_until_ready(self.driver, wait_time, wait_for_selector, self.quiet_period):
+                self.logger.warning(f"Timeout waiting for {wait_for_selector or 'page load'} on {url}")
             
-            # Additional delay to ensure JS execution
-            time.sleep(self.delay)
+            if capture_api or self.capture_api_endpoints:
+                self._record_api_endpoints(url)
             
-            # Get page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            return BeautifulSoup(page_source, 'html.parser')
+            html = self._get_rendered_html(root_selector)
+            if archive is not None:
+                archive.record_rendered(url, html, root_selector, time.monotonic() - started)
+            return self.parse_html(html)
             
         except WebDriverException as e:
             self.logger.error(f"Selenium error fetching {url}: {e}")
+            self.failed_fetches += 1
             return None
         except Exception as e:
             self.logger.error(f"Unexpected error fetching {url} with Selenium: {e}")
+            self.failed_fetches += 1
             return None
     
-    def click_element_and_get_content(self, selector: str, wait_time: int = 10) -> BeautifulSoup:
+    def _record_api_endpoints(self, url: str):
+        endpoints = extract_api_requests(self.driver.get_log("performance"))
+        get_api_endpoint_store().record(url, endpoints)
+        self.logger.info(f"Recorded {len(endpoints)} JSON endpoints called by {url}")
+    
+    def get_api_json(self, url: str, match: Optional[str] = None, wait_for_selector: Optional[str] = None) -> Optional[Any]:
+        """
+        Get the data that a JavaScript page loads from a JSON endpoint, without rendering it.
+        
+        The endpoints recorded for the page by a previous run are requested with the
+        crawler's requests session. If none is recorded, or the recorded one fails,
+        the page is rendered once with Selenium to discover them.
+        
+        Args:
+            url (str): URL of the page
+            match (str, optional): Substring identifying the endpoint among those called by
+                the page (default: the first one)
+            wait_for_selector (str, optional): CSS selector to wait for when rendering the page
+            
+        Returns:
+            Optional[Any]: Decoded JSON response, or None if no endpoint is found or answers
+        """
+        url = self.absolute_url(url)
+        store = get_api_endpoint_store()
+        
+        for attempt in range(2):
+            endpoints = [e for e in store.get(url) if match is None or match in e["url"]]
+            if endpoints:
+                data = self.fetch_api_json(endpoints[0])
+                if data is not None:
+                    return data
+                # The endpoint changed since it was recorded
+                store.forget(url)
+            if attempt == 0:
+                self.get_page_with_selenium(url, wait_for_selector, capture_api=True)
+        
+        self.logger.warning(f"No JSON endpoint{f' matching {match!r}' if match else ''} found for {url}")
+        return None
+    
+    def fetch_api_json(self, endpoint: Dict[str, Any]) -> Optional[Any]:
+        """
+        Request a recorded JSON endpoint with the crawler's requests session.
+        
+        Args:
+            endpoint (Dict[str, Any]): Endpoint recorded by core.api_capture
+            
+        Returns:
+            Optional[Any]: Decoded JSON response, or None if the request failed
+        """
+        if endpoint["method"] == "GET":
+            # GET endpoints go through the response cache and rate limiter of fetch_page
+            body = self.fetch_page(endpoint["url"])
+        else:
+            try:
+                headers = {"Content-Type": endpoint["content_type"]} if endpoint.get("content_type") else None
+                response = self.send_request(endpoint["url"], endpoint["method"], data=endpoint.get("post_data"),
+                                             headers=headers)
+                response.raise_for_status()
+                body = response.text
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"Error requesting {endpoint['url']}: {e}")
+                body = None
+        
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            self.logger.error(f"Endpoint {endpoint['url']} did not return JSON")
+            return None
+    
+    def _get_rendered_html(self, root_selector: Optional[str] = None) -> str:
+        """
+        Get the HTML of the rendered page, or only of its subtrees matching root_selector.
+        
+        The subtrees are serialized in the browser, so neither the WebDriver transfer
+        nor the parse includes the rest of the page. The whole page is returned when
+        no element matches.
+        
+        Args:
+            root_selector (str, optional): CSS selector of the needed subtrees
+        
+        Returns:
+            str: Rendered HTML
+        """
+        if root_selector:
+            html = self.driver.execute_script(_SUBTREE_SCRIPT, root_selector)
+            if html:
+                return html
+            self.logger.warning(f"No element matches '{root_selector}', parsing the whole page")
+        
+        return self.driver.page_source
+    
+    def _get_rendered_content(self, root_selector: Optional[str] = None) -> BeautifulSoup:
+        """Parse the rendered page, or only its subtrees matching root_selector (see _get_rendered_html)."""
+        return self.parse_html(self._get_rendered_html(root_selector))
+    
+    def extract_with_selenium(self, item_selector: str, fields: Dict[str, str]) -> List[Dict[str, Optional[str]]]:
+        """
+        Extract structured data from the rendered page in a single script call.
+        
+        Args:
+            item_selector (str): CSS selector of the items (e.g. the cards of a grants list)
+            fields (Dict[str, str]): Map of field names to a CSS selector within the item,
+                optionally followed by "@attribute" to read an attribute instead of the text
+                ("a@href"; "@data-id" reads the item itself)
+        
+        Returns:
+            List[Dict[str, Optional[str]]]: One dict per item, with None for missing fields
+        """
+        try:
+            return self.driver.execute_script(_EXTRACT_SCRIPT, item_selector, fields) or []
+        except WebDriverException as e:
+            self.logger.error(f"Error extracting '{item_selector}': {e}")
+            return []
+    
+    def click_element_and_get_content(self, selector: str, wait_time: int = 10,
+                                      root_selector: Optional[str] = None) -> BeautifulSoup:
         """
         Click on an element and return the resulting page content.
         
         Args:
             selector (str): CSS selector of the element to click
-            wait_time (int): Maximum time to wait after clicking
+            wait_time (int): Maximum time to wait for the element to be clickable
+            root_selector (str, optional): Only return the subtrees matching this CSS selector
             
         Returns:
             BeautifulSoup: Parsed HTML after click
@@ -140,24 +383,24 @@ class SeleniumCrawler(BaseCrawler, ABC):
             )
             element.click()
             
-            # Wait for the page to load
-            time.sleep(self.delay)
+            # Wait for the content loaded by the click, at most the crawler delay
+            wait_until_ready(self.driver, self.delay, quiet_period=self.quiet_period, after_action=True)
             
-            # Get updated page source
-            page_source = self.driver.page_source
-            return BeautifulSoup(page_source, 'html.parser')
+            return self._get_rendered_content(root_selector)
             
         except Exception as e:
             self.logger.error(f"Error clicking element '{selector}': {e}")
             return None
     
-    def scroll_to_bottom(self, scroll_pause_time: float = 1.0, max_scrolls: int = 10) -> BeautifulSoup:
+    def scroll_to_bottom(self, scroll_pause_time: float = 1.0, max_scrolls: int = 10,
+                         root_selector: Optional[str] = None) -> BeautifulSoup:
         """
         Scroll to the bottom of the page to load lazy-loaded content.
         
         Args:
-            scroll_pause_time (float): Time to pause between scrolls
+            scroll_pause_time (float): Maximum time to wait for content after each scroll
             max_scrolls (int): Maximum number of scroll operations
+            root_selector (str, optional): Only return the subtrees matching this CSS selector
             
         Returns:
             BeautifulSoup: Parsed HTML after scrolling
@@ -170,8 +413,9 @@ class SeleniumCrawler(BaseCrawler, ABC):
                 # Scroll down
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 
-                # Wait for page to load
-                time.sleep(scroll_pause_time)
+                # Wait for lazy-loaded content to settle
+                wait_until_ready(self.driver, scroll_pause_time, quiet_period=min(self.quiet_period, scroll_pause_time),
+                                 after_action=True)
                 
                 # Calculate new scroll height and compare with last scroll height
                 new_height = self.driver.execute_script("return document.body.scrollHeight")
@@ -181,21 +425,21 @@ class SeleniumCrawler(BaseCrawler, ABC):
                     
                 last_height = new_height
             
-            # Get final page source
-            page_source = self.driver.page_source
-            return BeautifulSoup(page_source, 'html.parser')
+            return self._get_rendered_content(root_selector)
             
         except Exception as e:
             self.logger.error(f"Error scrolling page: {e}")
             return None
     
-    def fill_form_and_submit(self, form_data: Dict[str, str], submit_selector: str) -> BeautifulSoup:
+    def fill_form_and_submit(self, form_data: Dict[str, str], submit_selector: str,
+                             root_selector: Optional[str] = None) -> BeautifulSoup:
         """
         Fill in a form and submit it.
         
         Args:
             form_data (Dict[str, str]): Map of field selectors to values
             submit_selector (str): CSS selector for the submit button
+            root_selector (str, optional): Only return the subtrees matching this CSS selector
             
         Returns:
             BeautifulSoup: Parsed HTML after form submission
@@ -206,18 +450,15 @@ class SeleniumCrawler(BaseCrawler, ABC):
                 element = self.driver.find_element(By.CSS_SELECTOR, selector)
                 element.clear()
                 element.send_keys(value)
-                time.sleep(0.5)  # Small delay between fields
             
             # Submit the form
             submit_button = self.driver.find_element(By.CSS_SELECTOR, submit_selector)
             submit_button.click()
             
-            # Wait for the page to load
-            time.sleep(self.delay * 2)  # Double delay after form submission
+            # Wait for the results, at most double the crawler delay
+            wait_until_ready(self.driver, self.delay * 2, quiet_period=self.quiet_period, after_action=True)
             
-            # Get updated page source
-            page_source = self.driver.page_source
-            return BeautifulSoup(page_source, 'html.parser')
+            return self._get_rendered_content(root_selector)
             
         except Exception as e:
             self.logger.error(f"Error filling form: {e}")
@@ -0,0 +1,43 @@
+import re
+from functools import lru_cache
+from typing import Dict, Any
+from urllib.parse import urlparse
+
+import config
+
+
+def _normalize_host(netloc: str) -> str:
+    """Strip the port and a leading www/www2/www3 label from a netloc."""
+    host = netloc.lower().split(':')[0]
+    return re.sub(r'^www\d*\.', '', host)
+
+
+@lru_cache(maxsize=None)
+def _find_site_config_for_host(host: str) -> Dict[str, Any]:
+    all_sites = list(config.REGIONAL_SITES.values()) + list(config.COMMERCE_SITES.values()) + list(config.NATIONAL_SITES.values())
+    
+    # Exact host match first
+    for site in all_sites:
+        if _normalize_host(urlparse(site["base_url"]).netloc) == host:
+            return site
+    
+    # Then subdomains of a configured site (e.g. portalebandi.regione.basilicata.it)
+    for site in all_sites:
+        if host.endswith("." + _normalize_host(urlparse(site["base_url"]).netloc)):
+            return site
+    
+    return {}
+
+
+def find_site_config(url: str) -> Dict[str, Any]:
+    """
+    Find the site configuration (REGIONAL_SITES, COMMERCE_SITES or NATIONAL_SITES entry)
+    that a URL belongs to.
+    
+    Args:
+        url (str): Absolute URL
+    
+    Returns:
+        Dict[str, Any]: Site configuration, or an empty dict if the host is not configured
+    """
+    return _find_site_config_for_host(_normalize_host(urlparse(url).netloc))
@@ -0,0 +1,90 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class StoredGrant(dict):
+    """
+    Processed grant row reused from a previous run.
+    
+    Crawlers return it instead of raw grant data when a page is unchanged, so
+    callers know to skip processing and validation.
+    """
+    pass
+
+
+class CrawlStateStore:
+    """
+    SQLite store of previously crawled grant pages for incremental runs.
+    
+    Each grant URL is stored with the fingerprint of its detail section and the
+    processed row produced from it.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the state store.
+        
+        Args:
+            path (str): Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS grants (
+                url TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                processed TEXT,
+                updated_at REAL
+            )
+        """)
+        self.conn.commit()
+    
+    def lookup(self, url: str, fingerprint: str) -> Optional[StoredGrant]:
+        """
+        Get the stored processed row of a page if its fingerprint is unchanged.
+        
+        Args:
+            url (str): Grant page URL
+            fingerprint (str): Fingerprint of the page as fetched now
+        
+        Returns:
+            Optional[StoredGrant]: Stored processed row, or None if the page is new or changed
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT fingerprint, processed FROM grants WHERE url = ?", (url,)).fetchone()
+        
+        if row and row[0] == fingerprint:
+            return StoredGrant(json.loads(row[1]))
+        return None
+    
+    def save_many(self, entries: List[Tuple[str, str, Dict[str, Any]]]):
+        """
+        Store the processed rows of new or changed pages.
+        
+        Args:
+            entries (List[Tuple[str, str, Dict[str, Any]]]): (url, fingerprint, processed row) tuples
+        """
+        now = time.time()
+        
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO grants VALUES (?, ?, ?, ?)",
+                [(url, fingerprint, json.dumps(processed, ensure_ascii=False), now)
+                 for url, fingerprint, processed in entries]
+            )
+            self.conn.commit()
+    
+    def close(self):
+        """Checkpoint the write-ahead log into the database and close the connection."""
+        with self._lock:
+            self.conn.commit()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
@@ -1,7 +1,7 @@
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
-from bs4 import BeautifulSoup, Tag
+from typing import List, Dict, Any
+from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime
 
@@ -13,6 +13,12 @@ class AbruzzoCrawler(BaseCrawler):
     Crawler for Regione Abruzzo grants.
     """
     
+    detail_regions = [
+        "h1.titolo-bando", ".descrizione-breve", ".contenuto-bando", ".scadenza",
+        ".data-apertura", ".destinatari", ".procedura-presentazione", ".tipo-procedura",
+        ".dotazione-finanziaria", ".spese-ammissibili", ".allegati", ".sezione-bando"
+    ]
+    
     def __init__(self, max_pages: int = 10, delay: float = 1.0):
         """
         Initialize the Abruzzo crawler.
@@ -110,7 +116,7 @@ class AbruzzoCrawler(BaseCrawler):
         Returns:
             Dict[str, Any]: Grant details in the required format
         """
-        soup = self.get_page(url)
+        soup = self.get_page(url, regions=self.detail_regions)
         
         if not soup:
             self.logger.error(f"Failed to fetch grant page: {url}")
@@ -331,171 +337,3 @@ class AbruzzoCrawler(BaseCrawler):
             text_parts.append(section.text.strip())
         
         return "\n\n".join(text_parts)
-    
-    def _extract_document_requirements(self, text: str) -> Tuple[List[str], Dict[str, List[str]]]:
-        """
-        Extract document requirements from text using improved detection.
-        
-        Args:
-            text (str): Text to analyze
-            
-        Returns:
-            Tuple[List[str], Dict[str, List[str]]]: List of required documents and their contexts
-        """
-        target_words = self._get_document_target_words()
-        return self.find_target_words(text, target_words)
-    
-    def _get_document_target_words(self) -> List[str]:
-        """Return list of target words to search for in documents."""
-        # Common document types required for Italian grants
-        return [
-            "carta d'identità", "documento identità", "copia carta identità", 
-            "codice fiscale", "CF", "documento soci", "documenti anagrafici",
-            "attribuzione codice fiscale", "certificato codice fiscale",
-            "certificato partita IVA", "attribuzione P.IVA", "partita IVA",
-            "registro imprese", "iscrizione CCIAA", "certificato camera commercio", 
-            "visura CCIAA", "visura camerale", "visura ordinaria", 
-            "visura immobile", "visura catastale", "documento catastale",
-            "atto costitutivo", "statuto società", "atti sociali", 
-            "atto nomina rappresentante", "nomina amministratore", 
-            "delega firma", "delega sottoscrizione", "delega rappresentanza",
-            "DSAN", "dichiarazione sostitutiva", "autocertificazione", 
-            "dichiarazione d'intenti", "manifestazione di interesse",
-            "certificato casellario", "casellario penale", "assenza condanne penali",
-            "DURC", "documento regolarità contributiva", "regolarità contributiva",
-            "certificato fiscale", "regolarità fiscale", "assenza carichi pendenti",
-            "dichiarazione antiriciclaggio", "dichiarazione antimafia", 
-            "contributo ANAC", "pagamento ANAC", "ricevuta ANAC",
-            "piano finanziario", "budget", "preventivo economico", 
-            "bilancio", "stato patrimoniale", "situazione economico-patrimoniale",
-            "dichiarazione redditi", "modello Redditi", "730", 
-            "dichiarazioni IVA", "IVA annuale", "modello IVA",
-            "fideiussione bancaria", "fideiussione assicurativa", "garanzia fideiussoria",
-            "ricevute pagamento", "prova pagamento", "quietanze pagamento",
-            "fatture", "fatture elettroniche", "fatture PA", "e-fatture",
-            "giustificativi di spesa", "documenti di spesa", "pezze giustificative",
-            "scheda progetto", "sintesi progetto", "scheda descrittiva",
-            "programma operativo", "cronoprogramma", "piano attività",
-            "diagramma di Gantt", "gantt chart", "timeline progetto",
-            "relazione finale", "report finale", "rendicontazione finale",
-            "relazione lavori", "relazione attività", "stato avanzamento lavori",
-            "PSC", "piano sicurezza", "documento coordinamento sicurezza",
-            "dichiarazione localizzazione", "ubicazione intervento", 
-            "assenso proprietario", "dichiarazione consenso", "nulla osta proprietà",
-            "contratto affitto", "contratto locazione", "contratto comodato",
-            "progetto impresa", "business plan", "piano d'impresa", 
-            "pitch", "presentazione sintetica", "elevator pitch", "pitch deck",
-            "CV team", "curriculum", "profilo fondatori", 
-            "attestato corso", "attestato formazione", "certificato partecipazione",
-            "certificazione qualità", "certificato ISO", 
-            "certificato conformità", "conformità impianto", "conformità normativa",
-            "attestazione SOA", "certificazione SOA", "qualificazione per appalti pubblici",
-            "brevetto", "certificato di brevetto", "titolo brevettuale",
-            "IBAN", "certificato IBAN", "coordinate bancarie"
-        ]
-        
-    def find_target_words(self, text: str, target_words: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
-        """
-        Find target words and phrases in text using advanced context verification.
-        
-        Args:
-            text (str): Text to analyze
-            target_words (List[str]): List of target words to search for
-            
-        Returns:
-            Tuple[List[str], Dict[str, List[str]]]: List of found words and their contexts
-        """
-        found_words = []
-        context_dict = {}
-        
-        if not text or not text.strip():
-            return found_words, context_dict
-        
-        # Normalize text
-        text = text.lower()
-        
-        # Define validation keywords that would indicate a document is required
-        validation_keywords = [
-            "allegare", "allegato", "presentare", "presentazione", "fornire", 
-            "obbligatorio", "necessario", "richiesto", "documentazione", 
-            "consegnare", "produrre", "trasmettere", "accompagnato da", 
-            "corredato da", "da presentare", "dovranno essere allegati", 
-            "è richiesto", "è necessario", "deve essere allegato", 
-            "va allegato", "documenti da allegare", "è obbligatorio", 
-            "completo di", "comprensivo di", "deve riportare", 
-            "da compilare", "da firmare", "firmato", "sottoscritto", 
-            "va presentato", "si richiede", "sarà necessario", 
-            "documento richiesto", "da trasmettere", "occorre presentare", 
-            "documento obbligatorio", "insieme a", "copia", "file", "modulo"
-        ]
-        
-        # Define common false positive contexts to exclude
-        exclusion_contexts = [
-            "non è necessario", "non è richiesto", "non obbligatorio", 
-            "facoltativo", "non è obbligatorio", "non deve essere allegato", 
-            "non sarà richiesto", "non sono richiesti", "opzionale"
-        ]
-        
-        # High-priority documents that are almost always required if mentioned
-        critical_documents = [
-            "codice fiscale", "carta d'identità", "documento identità", 
-            "partita iva", "visura camerale", "durc", "iban", "preventivi"
-        ]
-        
-        for target in target_words:
-            target_lower = target.lower()
-            
-            # Increase the context window for critical documents
-            context_window = 300 if target_lower in critical_documents else 200
-            
-            # Only proceed if the target word is actually present in the text
-            if target_lower in text:
-                # For multi-word phrases, use regex with word boundaries
-                if ' ' in target_lower or len(target_lower) > 3:  # Ignore very short single words
-                    # Create pattern with word boundaries that's case insensitive
-                    escaped_target = re.escape(target_lower)
-                    pattern = r'(?i)\b' + escaped_target + r'\b'
-                    
-                    try:
-                        matches = list(re.finditer(pattern, text))
-                        
-                        if matches:
-                            # Analyze context to confirm it's actually required
-                            valid_match = False
-                            contexts = []
-                            
-                            for match in matches:
-                                # Extract a context window
-                                start = max(0, match.start() - context_window)
-                                end = min(len(text), match.end() + context_window)
-                                context = text[start:end]
-                                
-                                # Skip if in exclusion context
-                                if any(excl in context for excl in exclusion_contexts):
-                                    continue
-                                
-                                # For critical documents, we have relaxed validation requirements
-                                if target_lower in critical_documents:
-                                    if any(kw in context for kw in validation_keywords):
-                                        valid_match = True
-                                        # Highlight the match in the context
-                                        matched_text = text[match.start():match.end()]
-                                        highlighted = f"...{text[start:match.start()]}**{matched_text}**{text[match.end():end]}..."
-                                        contexts.append(highlighted)
-                                else:
-                                    # For non-critical documents, require stricter validation
-                                    found_keywords = [kw for kw in validation_keywords if kw in context]
-                                    if found_keywords:
-                                        valid_match = True
-                                        # Highlight the match in the context
-                                        matched_text = text[match.start():match.end()]
-                                        highlighted = f"...{text[start:match.start()]}**{matched_text}**{text[match.end():end]}..."
-                                        contexts.append(highlighted)
-                            
-                            if valid_match:
-                                found_words.append(target)
-                                context_dict[target] = contexts
-                    except re.error:
-                        self.logger.warning(f"Regex error for pattern '{target_lower}'")
-        
-        return found_words, context_dict
\ No newline at end of file
@@ -0,0 +1,166 @@
+import importlib
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import config
+from core.checkpoint import CheckpointJournal
+from core.site_config import find_site_config
+from core.state_store import CrawlStateStore
+
+logger = logging.getLogger("CrawlerRegistry")
+
+# Crawler class of each configured site ("module:Class"), keyed like config.REGIONAL_SITES,
+# COMMERCE_SITES and NATIONAL_SITES. Modules are only imported when their site is crawled
+SITE_CRAWLERS = {
+    "regional": {
+        "vda": "crawlers.regional.ValleDAosta_crawler:ValleDAostaCrawler",
+        "piemonte": "crawlers.regional.piemonte_crawler:PiemonteCrawler",
+        "lombardia": "crawlers.regional.lombardia_crawler:LombardiaCrawler",
+        "veneto": "crawlers.regional.Veneto_crawler:VenetoCrawler",
+        "liguria": "crawlers.regional.Liguria_crawler:LiguriaCrawler",
+        "emilia_romagna": "crawlers.regional.EmiliaRomagna_crawler:EmiliaRomagnaCrawler",
+        "trentino_alto_adige": "crawlers.regional.Trentino_crawler:TrentinoCrawler",
+        "friuli_venezia_giulia": "crawlers.regional.FriuliVeneziaGiulia_Crawler:FriuliVeneziaGiuliaCrawler",
+        "toscana": "crawlers.regional.Toscana_crawler:ToscanaCrawler",
+        "umbria": "crawlers.regional.Umbria_crawler:UmbriaCrawler",
+        "marche": "crawlers.regional.Marche_crawler:MarcheCrawler",
+        "lazio": "crawlers.regional.Lazio_crawler:LazioCrawler",
+        "abruzzo": "crawlers.regional.Abruzzo_Crawler:AbruzzoCrawler",
+        "molise": "crawlers.regional.Molise_crawler:MoliseCrawler",
+        "puglia": "crawlers.regional.Puglia_crawler:PugliaCrawler",
+        "basilicata": "crawlers.regional.Basilicata_crawler:BasilicataCrawler",
+        "calabria": "crawlers.regional.Calabria_crawler:CalabriaCrawler",
+        "sicilia": "crawlers.regional.Sicilia_crawler:SiciliaCrawler",
+    },
+    "commerce": {},
+    "national": {},
+}
+
+# Crawlers selected by the "crawler" key of a site configuration, built from the
+# configuration alone instead of a dedicated class
+CONFIG_CRAWLERS = {
+    "generic": "core.generic_crawler:GenericCrawler",
+}
+
+
+@lru_cache(maxsize=None)
+def load_class(path: str) -> Optional[type]:
+    """
+    Import the class of a "module:Class" path.
+    
+    Args:
+        path (str): Module and class name separated by a colon
+    
+    Returns:
+        Optional[type]: The class, or None if it cannot be imported
+    """
+    module_name, _, class_name = path.partition(":")
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        logger.error(f"Could not import crawler {path}: {e}")
+        return None
+
+
+def get_crawler_class(site_type: str, site_name: str) -> Optional[type]:
+    """
+    Get the dedicated crawler class of a site, importing its module on first use.
+    
+    Args:
+        site_type (str): Type of site (regional, commerce, national)
+        site_name (str): Name of the site (key of its configuration)
+    
+    Returns:
+        Optional[type]: Crawler class, or None if the site has none
+    """
+    path = SITE_CRAWLERS.get(site_type, {}).get(site_name)
+    return load_class(path) if path else None
+
+
+def get_config_crawler_class(name: str) -> Optional[type]:
+    """
+    Get the class of a configuration-driven crawler ("crawler" key of a site).
+    
+    Args:
+        name (str): Name of the crawler (key of CONFIG_CRAWLERS)
+    
+    Returns:
+        Optional[type]: Crawler class, or None if the name is unknown
+    """
+    path = CONFIG_CRAWLERS.get(name)
+    return load_class(path) if path else None
+
+
+def get_site_config(site_type: str, site_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the configuration of a specific site.
+    
+    Args:
+        site_type (str): Type of site (regional, commerce, national)
+        site_name (str): Name of the site
+        
+    Returns:
+        Optional[Dict[str, Any]]: Site configuration or None if not found
+    """
+    if site_type == "regional":
+        return config.REGIONAL_SITES.get(site_name)
+    elif site_type == "commerce":
+        return config.COMMERCE_SITES.get(site_name)
+    elif site_type == "national":
+        return config.NATIONAL_SITES.get(site_name)
+    return None
+
+
+def create_crawler(site_type: str, site_name: str, max_pages: int = 10,
+                   state_store: Optional[CrawlStateStore] = None,
+                   journal: Optional[CheckpointJournal] = None) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+    """
+    Instantiate the crawler of a specific site.
+    
+    Args:
+        site_type (str): Type of site (regional, commerce, national)
+        site_name (str): Name of the site
+        max_pages (int): Maximum number of grant pages to crawl
+        state_store (CrawlStateStore, optional): State store enabling incremental crawling
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        
+    Returns:
+        Tuple[Optional[BaseCrawler], Optional[Dict[str, Any]]]: Crawler and site configuration,
+        or (None, None) if the site cannot be crawled
+    """
+    logger = logging.getLogger(f"crawl_site.{site_type}.{site_name}")
+    
+    # Get site configuration
+    site_config = get_site_config(site_type, site_name)
+    if not site_config:
+        logger.error(f"No configuration found for {site_type}.{site_name}")
+        return None, None
+    
+    # Sites without a dedicated crawler are driven by their configuration alone
+    if site_config.get("crawler"):
+        crawler_class = get_config_crawler_class(site_config["crawler"])
+        if not crawler_class:
+            logger.error(f"Unknown crawler '{site_config['crawler']}' configured for {site_type}.{site_name}")
+            return None, None
+        
+        crawler = crawler_class(site_config, max_pages=max_pages)
+    else:
+        # Get crawler class
+        crawler_class = get_crawler_class(site_type, site_name)
+        if not crawler_class:
+            logger.error(f"No crawler implementation found for {site_type}.{site_name}")
+            return None, None
+        
+        crawler = crawler_class(max_pages=max_pages)
+    
+    # Per-site settings (rate_limit, cache, circuit_breaker, ...) are found from the host of each request
+    if find_site_config(crawler.base_url) is not site_config:
+        logger.warning(f"Host of {crawler.base_url} does not match the base_url of {site_type}.{site_name} "
+                       f"({site_config['base_url']}), its per-site settings will not apply")
+    
+    crawler.state_store = state_store
+    if journal is not None:
+        crawler.checkpoint = journal.site(f"{site_type}.{site_name}")
+    
+    return crawler, site_config
@@ -3,38 +3,18 @@ import os
 import argparse
 import logging
 import logging.config
-import importlib
-import concurrent.futures
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
 import config
 from core.data_processor import process_grant_data, validate_grant_data
-from core.exporter import CSVExporter
-
-# Import crawlers
-from crawlers.regional.lombardia_crawler import LombardiaCrawler
-from crawlers.regional.piemonte_crawler import PiemonteCrawler
-from crawlers.regional.FriuliVeneziaGiulia_Crawler import FriuliVeneziaGiuliaCrawler
-from crawlers.regional.Veneto_crawler import VenetoCrawler
-from crawlers.regional.Trentino_crawler import TrentinoCrawler
-from crawlers.regional.ValleDAosta_crawler import ValleDAostaCrawler
-from crawlers.regional.Lazio_crawler import LazioCrawler
-from crawlers.regional.Toscana_crawler import ToscanaCrawler
-from crawlers.regional.Umbria_crawler import UmbriaCrawler
-from crawlers.regional.Molise_crawler import MoliseCrawler
-from crawlers.regional.Calabria_crawler import CalabriaCrawler
-from crawlers.regional.Sicilia_crawler import SiciliaCrawler
-from crawlers.regional.Puglia_crawler import PugliaCrawler
-from crawlers.regional.Abruzzo_Crawler import AbruzzoCrawler
-from crawlers.regional.Basilicata_crawler import BasilicataCrawler
-from crawlers.regional.Marche_crawler import MarcheCrawler
-from crawlers.regional.Liguria_crawler import LiguriaCrawler
-from crawlers.regional.EmiliaRomagna_crawler import EmiliaRomagnaCrawler
-
-# Import other crawlers as needed
-# Note: The dynamic import in get_crawler_class will find the other regional crawlers
-# when they are implemented
+from core.exporter import CSVExporter, ParquetExporter, SQLiteExporter
+from core.checkpoint import CheckpointJournal
+from core.state_store import CrawlStateStore, StoredGrant
+from core.run_report import RunReport, CRAWLED, SKIPPED, RESUMED, FAILED, PARTIAL
+from core.fetch_archive import RECORD, REPLAY, parse_latency
+from crawlers.registry import create_crawler
 
 
 def setup_logging():
@@ -43,35 +23,108 @@ def setup_logging():
     logging.config.dictConfig(config.LOGGING_CONFIG)
 
 
-def get_crawler_class(site_type: str, site_name: str) -> Optional[type]:
+def process_grants(grants: List[Dict[str, Any]], logger: logging.Logger, crawler=None,
+                   parsed: Optional[Dict[str, Tuple[Dict[str, Any], List[str]]]] = None) -> List[Dict[str, Any]]:
     """
-    Dynamically import and return the crawler class for a specific site.
+    Process and validate the raw grants returned by a crawler.
+    
+    In incremental runs, grants reused from the state store are passed through
+    unchanged and the new or changed ones are saved back to it.
     
     Args:
-        site_type (str): Type of site (regional, commerce, national)
-        site_name (str): Name of the site
+        grants (List[Dict[str, Any]]): Raw grant data dictionaries
+        logger (logging.Logger): Logger of the site being processed
+        crawler (BaseCrawler, optional): Crawler that produced the grants
+        parsed (dict, optional): Processed grant and validation errors of the grants
+            already processed by the parse pool, keyed by URL
         
     Returns:
-        Optional[type]: Crawler class or None if not found
+        List[Dict[str, Any]]: Processed grant data dictionaries
     """
-    try:
-        module_name = f"crawlers.{site_type}.{site_name}_crawler"
-        module = importlib.import_module(module_name)
+    processed_grants = []
+    validation_errors = {}
+    state_entries = []
+    unchanged = 0
+    
+    for i, grant in enumerate(grants):
+        # Grants unchanged since the last incremental run are already processed
+        if isinstance(grant, StoredGrant):
+            processed_grants.append(dict(grant))
+            unchanged += 1
+            continue
         
-        # Find the crawler class in the module (assuming it ends with "Crawler")
-        for attr_name in dir(module):
-            if attr_name.endswith("Crawler") and attr_name != "BaseCrawler":
-                return getattr(module, attr_name)
+        if parsed and grant.get("Link Bando") in parsed:
+            # Processed and validated in a parse worker process
+            processed_grant, errors = parsed[grant["Link Bando"]]
+        else:
+            # Process grant data
+            processed_grant = process_grant_data(grant)
+            
+            # Validate
+            errors = validate_grant_data(processed_grant)
         
-        logging.error(f"No crawler class found in module {module_name}")
-        return None
+        if errors:
+            grant_id = processed_grant.get("Nome del bando", f"Grant_{i}")
+            validation_errors[grant_id] = errors
+            logger.warning(f"Validation errors for {grant_id}: {', '.join(errors)}")
+        
+        processed_grants.append(processed_grant)
+        
+        if crawler is not None and crawler.state_store is not None:
+            url = grant.get("Link Bando")
+            fingerprint = crawler.page_fingerprints.get(url)
+            if fingerprint:
+                state_entries.append((url, fingerprint, processed_grant))
+    
+    if crawler is not None and crawler.state_store is not None:
+        crawler.state_store.save_many(state_entries)
+        logger.info(f"Incremental crawl: {unchanged} grants unchanged, {len(grants) - unchanged} new or changed")
     
-    except ImportError as e:
-        logging.error(f"Could not import crawler for {site_type}.{site_name}: {e}")
-        return None
+    return processed_grants
 
 
-def crawl_site(site_type: str, site_name: str, max_pages: int = 10) -> List[Dict[str, Any]]:
+def finish_site(site: str, crawler, processed_grants: List[Dict[str, Any]],
+                journal: Optional[CheckpointJournal] = None, report: Optional[RunReport] = None):
+    """
+    Record a crawled site in the checkpoint journal and the run report.
+    
+    Sites whose requests failed fast because of an open circuit are reported as
+    skipped, sites whose listing could not be fetched as failed, and sites whose
+    listing could only be fetched in part as partial. None of them is marked done
+    in the journal, so resuming the run crawls them again.
+    
+    Args:
+        site (str): Site identifier ("<site_type>.<site_name>")
+        crawler (BaseCrawler): Crawler of the site
+        processed_grants (List[Dict[str, Any]]): Processed grants of the site
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        report (RunReport, optional): Report of the run
+    """
+    if crawler.skipped_hosts:
+        if report is not None:
+            report.record_site(site, SKIPPED, len(processed_grants), crawler.skipped_hosts)
+        return
+    
+    if crawler.listing_failed:
+        if report is not None:
+            report.record_site(site, FAILED)
+        return
+    
+    if crawler.listing_incomplete:
+        if report is not None:
+            report.record_site(site, PARTIAL, len(processed_grants))
+        return
+    
+    if journal is not None:
+        journal.record_site_done(site, processed_grants)
+    if report is not None:
+        report.record_site(site, CRAWLED, len(processed_grants))
+
+
+def crawl_site(site_type: str, site_name: str, max_pages: int = 10, concurrency: int = 1,
+               state_store: Optional[CrawlStateStore] = None,
+               journal: Optional[CheckpointJournal] = None,
+               parse_pool=None, report: Optional[RunReport] = None) -> List[Dict[str, Any]]:
     """
     Crawl a specific site for grants.
     
@@ -79,72 +132,226 @@ def crawl_site(site_type: str, site_name: str, max_pages: int = 10) -> List[Dict
         site_type (str): Type of site (regional, commerce, national)
         site_name (str): Name of the site
         max_pages (int): Maximum number of grant pages to crawl
+        concurrency (int): Number of grant detail pages fetched in parallel within the site
+        state_store (CrawlStateStore, optional): State store enabling incremental crawling
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        parse_pool (ParsePool, optional): Process pool parsing the detail pages, which are
+            then only fetched by this thread
+        report (RunReport, optional): Report of the run, receiving the outcome of the site
         
     Returns:
         List[Dict[str, Any]]: List of grant data dictionaries
     """
     logger = logging.getLogger(f"crawl_site.{site_type}.{site_name}")
     
-    # Get crawler class
-    crawler_class = get_crawler_class(site_type, site_name)
-    if not crawler_class:
-        logger.error(f"No crawler implementation found for {site_type}.{site_name}")
-        return []
-    
-    # Get site configuration
-    site_config = None
-    if site_type == "regional":
-        site_config = config.REGIONAL_SITES.get(site_name)
-    elif site_type == "commerce":
-        site_config = config.COMMERCE_SITES.get(site_name)
-    elif site_type == "national":
-        site_config = config.NATIONAL_SITES.get(site_name)
-    
-    if not site_config:
-        logger.error(f"No configuration found for {site_type}.{site_name}")
-        return []
-    
     try:
         # Initialize crawler
-        crawler = crawler_class(max_pages=max_pages)
-        
-        # Crawl site
-        logger.info(f"Starting to crawl {site_config['name']} ({site_config['base_url']})")
-        grants = crawler.crawl()
-        
-        # Process and validate grant data
-        processed_grants = []
-        validation_errors = {}
+        crawler, site_config = create_crawler(site_type, site_name, max_pages, state_store, journal)
+        if not crawler:
+            if report is not None:
+                report.record_site(f"{site_type}.{site_name}", FAILED)
+            return []
         
-        for i, grant in enumerate(grants):
-            # Process grant data
-            processed_grant = process_grant_data(grant)
+        try:
+            # Crawl site
+            logger.info(f"Starting to crawl {site_config['name']} ({site_config['base_url']})")
+            if parse_pool is not None:
+                grants, parsed = parse_pool.crawl(crawler, f"{site_type}.{site_name}", concurrency)
+            else:
+                grants, parsed = crawler.crawl(concurrency=concurrency), None
             
-            # Validate
-            errors = validate_grant_data(processed_grant)
-            if errors:
-                grant_id = processed_grant.get("Nome del bando", f"Grant_{i}")
-                validation_errors[grant_id] = errors
-                logger.warning(f"Validation errors for {grant_id}: {', '.join(errors)}")
+            # Process and validate grant data
+            processed_grants = process_grants(grants, logger, crawler, parsed)
+            finish_site(f"{site_type}.{site_name}", crawler, processed_grants, journal, report)
+            
+            logger.info(f"Finished crawling {site_config['name']}: {len(processed_grants)} grants found")
             
-            processed_grants.append(processed_grant)
+            return processed_grants
+        finally:
+            crawler.close()
+    
+    except Exception as e:
+        logger.error(f"Error crawling {site_type}.{site_name}: {e}", exc_info=True)
+        if report is not None:
+            report.record_site(f"{site_type}.{site_name}", FAILED)
+        return []
+
+
+async def crawl_site_async(engine, site_type: str, site_name: str, max_pages: int = 10,
+                           state_store: Optional[CrawlStateStore] = None,
+                           journal: Optional[CheckpointJournal] = None,
+                           report: Optional[RunReport] = None) -> List[Dict[str, Any]]:
+    """
+    Crawl a specific site for grants using the shared async fetch engine.
+    
+    Args:
+        engine (AsyncFetchEngine): Fetch engine shared by all sites of the run
+        site_type (str): Type of site (regional, commerce, national)
+        site_name (str): Name of the site
+        max_pages (int): Maximum number of grant pages to crawl
+        state_store (CrawlStateStore, optional): State store enabling incremental crawling
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        report (RunReport, optional): Report of the run, receiving the outcome of the site
         
-        logger.info(f"Finished crawling {site_config['name']}: {len(processed_grants)} grants found")
+    Returns:
+        List[Dict[str, Any]]: List of grant data dictionaries
+    """
+    logger = logging.getLogger(f"crawl_site.{site_type}.{site_name}")
+    
+    try:
+        crawler, site_config = create_crawler(site_type, site_name, max_pages, state_store, journal)
+        if not crawler:
+            if report is not None:
+                report.record_site(f"{site_type}.{site_name}", FAILED)
+            return []
         
-        return processed_grants
+        try:
+            logger.info(f"Starting to crawl {site_config['name']} ({site_config['base_url']})")
+            grants = await engine.crawl(crawler)
+            
+            processed_grants = process_grants(grants, logger, crawler)
+            finish_site(f"{site_type}.{site_name}", crawler, processed_grants, journal, report)
+            
+            logger.info(f"Finished crawling {site_config['name']}: {len(processed_grants)} grants found")
+            
+            return processed_grants
+        finally:
+            crawler.close()
     
     except Exception as e:
         logger.error(f"Error crawling {site_type}.{site_name}: {e}", exc_info=True)
+        if report is not None:
+            report.record_site(f"{site_type}.{site_name}", FAILED)
         return []
 
 
+async def crawl_sites_async(sites_to_crawl: List[Tuple[str, str]], args, exporter: Union[CSVExporter, ParquetExporter, SQLiteExporter],
+                            state_store: Optional[CrawlStateStore] = None,
+                            journal: Optional[CheckpointJournal] = None,
+                            report: Optional[RunReport] = None) -> int:
+    """
+    Crawl all selected sites concurrently on a single event loop.
+    
+    Args:
+        sites_to_crawl (List[Tuple[str, str]]): (site_type, site_name) pairs
+        args: Parsed command line arguments
+        exporter (CSVExporter, ParquetExporter or SQLiteExporter): Exporter with an open stream receiving the grants of each site
+        state_store (CrawlStateStore, optional): State store enabling incremental crawling
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        report (RunReport, optional): Report of the run, receiving the outcome of each site
+        
+    Returns:
+        int: Number of grants exported
+    """
+    from core.async_engine import AsyncFetchEngine
+    
+    exported = 0
+    
+    async with AsyncFetchEngine(max_in_flight=args.max_in_flight, per_host=args.per_host) as engine:
+        tasks = [
+            crawl_site_async(engine, site_type, site_name, args.max_pages, state_store, journal, report)
+            for site_type, site_name in sites_to_crawl
+        ]
+        for task in asyncio.as_completed(tasks):
+            for grant in await task:
+                exporter.write_row(grant)
+                exported += 1
+    
+    return exported
+
+
+def crawl_sites_scheduled(sites_to_crawl: List[Tuple[str, str]], args, exporter: Union[CSVExporter, ParquetExporter, SQLiteExporter],
+                          state_store: Optional[CrawlStateStore] = None,
+                          journal: Optional[CheckpointJournal] = None,
+                          parse_pool=None, report: Optional[RunReport] = None) -> int:
+    """
+    Crawl all selected sites with a shared pool of worker threads pulling listing and
+    detail page fetches of whichever host is eligible under its rate limit.
+    
+    Args:
+        sites_to_crawl (List[Tuple[str, str]]): (site_type, site_name) pairs
+        args: Parsed command line arguments
+        exporter (CSVExporter, ParquetExporter or SQLiteExporter): Exporter with an open stream receiving the grants of each site
+        state_store (CrawlStateStore, optional): State store enabling incremental crawling
+        journal (CheckpointJournal, optional): Checkpoint journal of the run
+        parse_pool (ParsePool, optional): Process pool parsing the detail pages
+        report (RunReport, optional): Report of the run, receiving the outcome of each site
+        
+    Returns:
+        int: Number of grants exported
+    """
+    from core.scheduler import CrawlScheduler
+    
+    scheduler = CrawlScheduler(workers=args.max_workers, per_host=args.per_host,
+                               site_concurrency=args.concurrency, parse_pool=parse_pool)
+    site_names = {}
+    for site_type, site_name in sites_to_crawl:
+        logger = logging.getLogger(f"crawl_site.{site_type}.{site_name}")
+        try:
+            crawler, site_config = create_crawler(site_type, site_name, args.max_pages, state_store, journal)
+        except Exception as e:
+            # A broken site must not keep the others from being scheduled
+            logger.error(f"Error crawling {site_type}.{site_name}: {e}", exc_info=True)
+            crawler = None
+        
+        if not crawler:
+            if report is not None:
+                report.record_site(f"{site_type}.{site_name}", FAILED)
+        else:
+            logger.info(f"Starting to crawl {site_config['name']} ({site_config['base_url']})")
+            site_names[f"{site_type}.{site_name}"] = site_config["name"]
+            scheduler.add_site(f"{site_type}.{site_name}", crawler)
+    
+    exported = 0
+    
+    # Sites are processed and exported in this thread as soon as their last page is fetched
+    # (their crawlers are closed by the scheduler)
+    for site, crawler, outcomes in scheduler.run():
+        logger = logging.getLogger(f"crawl_site.{site}")
+        try:
+            if parse_pool is not None:
+                grants, parsed = parse_pool.collect(crawler, outcomes)
+            else:
+                grants, parsed = [grant for _, grant in outcomes if grant], None
+            crawler.logger.info(f"Successfully crawled {len(grants)} grants")
+            
+            processed_grants = process_grants(grants, logger, crawler, parsed)
+            finish_site(site, crawler, processed_grants, journal, report)
+            
+            logger.info(f"Finished crawling {site_names[site]}: {len(processed_grants)} grants found")
+        except Exception as e:
+            logger.error(f"Error crawling {site}: {e}", exc_info=True)
+            if report is not None:
+                report.record_site(site, FAILED)
+            processed_grants = []
+        
+        for grant in processed_grants:
+            exporter.write_row(grant)
+        exported += len(processed_grants)
+    
+    return exported
+
+
 def run_crawler(args):
     """Run the crawler with the provided arguments."""
     setup_logging()
     logger = logging.getLogger("main")
     
+    # Overridable settings are listed in config.RUNTIME_SETTINGS
+    if args.no_cache:
+        config.HTTP_CACHE["enabled"] = False
+    if args.parser:
+        config.PARSER_BACKEND = args.parser
+    if args.selenium_pool_size:
+        config.SELENIUM_POOL["size"] = args.selenium_pool_size
+    if args.record or args.replay:
+        config.FETCH_ARCHIVE.update(mode=RECORD if args.record else REPLAY, path=args.record or args.replay)
+        # Recorded pages and latencies come from the portals, replayed ones from the archive only
+        config.HTTP_CACHE["enabled"] = False
+    if args.replay_latency is not None:
+        config.FETCH_ARCHIVE["latency"] = args.replay_latency
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    exporter = CSVExporter(output_dir=config.OUTPUT_DIR)
     
     # Collect all sites to crawl
     sites_to_crawl = []
@@ -184,44 +391,100 @@ def run_crawler(args):
                 continue
             sites_to_crawl.append(("national", site_name))
     
+    # Checkpoint journal of the run, used to resume it after a crash
+    run_id = args.resume or timestamp
+    checkpoint_path = os.path.join(config.CHECKPOINT_DIR, f"{run_id}.jsonl")
+    if args.resume and not os.path.exists(checkpoint_path):
+        logger.warning(f"No checkpoint found for run {run_id}, starting from scratch")
+    journal = CheckpointJournal(run_id, config.CHECKPOINT_DIR)
+    logger.info(f"Run id: {run_id} (resume with --resume {run_id})")
+    report = RunReport(run_id)
+    
+    # Grants are streamed to the output file as each site completes
+    if args.format == "parquet":
+        exporter = ParquetExporter(output_dir=config.OUTPUT_DIR)
+        default_output = f"grants_{timestamp}.parquet"
+    elif args.format == "sqlite":
+        # The database keeps the current state of all grants across runs
+        exporter = SQLiteExporter(output_dir=config.OUTPUT_DIR)
+        default_output = "grants.sqlite"
+    else:
+        exporter = CSVExporter(output_dir=config.OUTPUT_DIR)
+        default_output = f"grants_{timestamp}.csv"
+    exporter.open_stream(args.output or default_output)
+    exported = 0
+    
+    # Sites completed by a previous attempt of the run are not crawled again
+    remaining_sites = []
+    for site_type, site_name in sites_to_crawl:
+        completed_grants = journal.completed_sites.get(f"{site_type}.{site_name}")
+        if completed_grants is not None:
+            logger.info(f"Skipping {site_type}.{site_name}, completed in checkpoint: {len(completed_grants)} grants")
+            for grant in completed_grants:
+                exporter.write_row(grant)
+                exported += 1
+            report.record_site(f"{site_type}.{site_name}", RESUMED, len(completed_grants))
+        else:
+            remaining_sites.append((site_type, site_name))
+    sites_to_crawl = remaining_sites
+    
     logger.info(f"Preparing to crawl {len(sites_to_crawl)} sites")
     
-    all_grants = []
+    # Detail pages are parsed in worker processes if enabled
+    parse_pool = None
+    if args.parse_workers and not args.use_async:
+        from core.parse_pool import ParsePool
+        parse_pool = ParsePool(args.parse_workers)
     
-    # Use parallel processing if enabled
-    if args.parallel and args.max_workers > 1:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-            # Submit crawling tasks
-            future_to_site = {
-                executor.submit(crawl_site, site_type, site_name, args.max_pages): (site_type, site_name)
-                for site_type, site_name in sites_to_crawl
-            }
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_site):
-                site_type, site_name = future_to_site[future]
-                try:
-                    grants = future.result()
-                    all_grants.extend(grants)
-                    logger.info(f"Completed crawling {site_type}.{site_name}: {len(grants)} grants")
-                except Exception as e:
-                    logger.error(f"Exception crawling {site_type}.{site_name}: {e}")
-    else:
-        # Sequential processing
-        for site_type, site_name in sites_to_crawl:
-            grants = crawl_site(site_type, site_name, args.max_pages)
-            all_grants.extend(grants)
-    
-    # Export all grants to CSV
-    if all_grants:
-        output_file = f"grants_{timestamp}.csv"
-        if args.output:
-            output_file = args.output
-        
-        filepath = exporter.export_to_csv(all_grants, filename=output_file)
-        logger.info(f"Exported {len(all_grants)} grants to {filepath}")
+    state_store = CrawlStateStore(config.INCREMENTAL_STATE_PATH) if args.incremental else None
+    
+    try:
+        # Use the async fetch engine if enabled
+        if args.use_async:
+            exported += asyncio.run(crawl_sites_async(sites_to_crawl, args, exporter, state_store, journal, report))
+        # Schedule the pages of all sites on a shared pool of worker threads if enabled
+        elif args.parallel and args.max_workers > 1:
+            exported += crawl_sites_scheduled(sites_to_crawl, args, exporter, state_store, journal, parse_pool, report)
+        else:
+            # Sequential processing
+            for site_type, site_name in sites_to_crawl:
+                grants = crawl_site(site_type, site_name, args.max_pages, args.concurrency, state_store, journal, parse_pool, report)
+                for grant in grants:
+                    exporter.write_row(grant)
+                exported += len(grants)
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        # Flush the last fingerprints of an incremental run to its state database
+        if state_store is not None:
+            state_store.close()
+    
+    # Move the streamed output file to its final name
+    filepath = exporter.close()
+    if filepath:
+        logger.info(f"Exported {exported} grants to {filepath}")
     else:
         logger.warning("No grants found to export")
+    
+    # Outcome of each site, with the sites skipped because their portal was down
+    try:
+        logger.info(f"Run report: {report.summary()} ({report.save(config.OUTPUT_DIR)})")
+    except OSError as e:
+        logger.error(f"Could not write the run report: {e}")
+    skipped_sites = report.sites_with_status(SKIPPED)
+    for site in skipped_sites:
+        entry = report.sites[site]
+        logger.warning(f"Skipped {site}, {', '.join(entry['skipped_hosts'])} not answering ({entry['grants']} grants)")
+    
+    for site in report.sites_with_status(PARTIAL):
+        logger.warning(f"Listing of {site} incomplete ({report.sites[site]['grants']} grants)")
+    
+    # The run completed, its checkpoint is no longer needed unless sites were skipped, failed or partial
+    journal.close()
+    if skipped_sites or report.sites_with_status(FAILED) or report.sites_with_status(PARTIAL):
+        logger.info(f"Crawl the skipped, failed and partial sites again with --resume {run_id}")
+    else:
+        os.remove(checkpoint_path)
 
 
 if __name__ == "__main__":
@@ -235,11 +498,28 @@ if __name__ == "__main__":
     
     # Crawling parameters
     parser.add_argument("--max-pages", type=int, default=10, help="Maximum number of grant pages to crawl per site")
-    parser.add_argument("--parallel", action="store_true", help="Enable parallel processing")
-    parser.add_argument("--max-workers", type=int, default=4, help="Maximum number of worker threads for parallel processing")
+    parser.add_argument("--parallel", action="store_true", help="Crawl all sites at once, sharing worker threads between the pages of all hosts")
+    parser.add_argument("--max-workers", type=int, default=4, help="Number of worker threads with --parallel")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of grant detail pages fetched in parallel within each site")
+    parser.add_argument("--parse-workers", type=int, metavar="N", help="Parse, process and validate grant pages in N worker processes, leaving the crawler threads to fetching (not used with --async)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Fetch grant pages of all sites concurrently on an asyncio event loop (requires aiohttp)")
+    parser.add_argument("--max-in-flight", type=int, default=50, help="Maximum number of concurrent requests with --async")
+    parser.add_argument("--per-host", type=int, default=2, help="Maximum number of concurrent requests per host with --parallel or --async")
+    
+    parser.add_argument("--incremental", action="store_true", help="Skip parsing and processing of grants whose page is unchanged since the last incremental run")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Resume an interrupted run from its checkpoint")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the persistent HTTP response cache")
+    parser.add_argument("--parser", choices=config.PARSER_BACKENDS, help="HTML parser backend used by all sites without a \"parser\" in config")
+    archive_mode = parser.add_mutually_exclusive_group()
+    archive_mode.add_argument("--record", type=str, metavar="ARCHIVE", help="Record every fetched and rendered page in a compressed WARC archive (disables the HTTP cache)")
+    archive_mode.add_argument("--replay", type=str, metavar="ARCHIVE", help="Serve pages from an archive made with --record instead of the network")
+    parser.add_argument("--replay-latency", type=parse_latency, metavar="SECONDS", help="Latency added to each replayed page, or \"recorded\" for the latency of the recording")
+    parser.add_argument("--selenium-pool-size", type=int, metavar="N", help="Maximum number of headless Chrome instances shared by the Selenium-based crawlers")
     
     # Output options
-    parser.add_argument("--output", type=str, help="Output CSV filename")
+    parser.add_argument("--output", type=str, help="Output filename")
+    parser.add_argument("--format", choices=["csv", "parquet", "sqlite"], default="csv",
+                        help="Output format: timestamped CSV or Parquet file, or upsert into a SQLite database (parquet requires pyarrow)")
     
     args = parser.parse_args()
     run_crawler(args)
\ No newline at end of file
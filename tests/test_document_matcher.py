@@ -0,0 +1,152 @@
+"""
+Equivalence of the single-pass document matcher with the per-target linear scan
+it replaced (find_target_words of the regional crawlers before core.document_matcher).
+"""
+import json
+import os
+import random
+import re
+from typing import List, Dict, Tuple
+
+import pytest
+
+from core.base_crawler import BaseCrawler
+from core.document_matcher import DOCUMENT_TARGET_WORDS, VALIDATION_KEYWORDS, EXCLUSION_CONTEXTS, CRITICAL_DOCUMENTS
+from crawlers.registry import SITE_CRAWLERS, load_class
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def linear_find_target_words(text: str, target_words: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Original implementation: one regex scan and one keyword scan per target and match."""
+    found_words = []
+    context_dict = {}
+    
+    if not text or not text.strip():
+        return found_words, context_dict
+    
+    text = text.lower()
+    
+    for target in target_words:
+        target_lower = target.lower()
+        context_window = 300 if target_lower in CRITICAL_DOCUMENTS else 200
+        
+        if target_lower in text:
+            if ' ' in target_lower or len(target_lower) > 3:
+                pattern = r'(?i)\b' + re.escape(target_lower) + r'\b'
+                matches = list(re.finditer(pattern, text))
+                
+                if matches:
+                    valid_match = False
+                    contexts = []
+                    
+                    for match in matches:
+                        start = max(0, match.start() - context_window)
+                        end = min(len(text), match.end() + context_window)
+                        context = text[start:end]
+                        
+                        if any(excl in context for excl in EXCLUSION_CONTEXTS):
+                            continue
+                        
+                        if any(kw in context for kw in VALIDATION_KEYWORDS):
+                            valid_match = True
+                            matched_text = text[match.start():match.end()]
+                            contexts.append(f"...{text[start:match.start()]}**{matched_text}**{text[match.end():end]}...")
+                    
+                    if valid_match:
+                        found_words.append(target)
+                        context_dict[target] = contexts
+    
+    return found_words, context_dict
+
+
+class _Crawler(BaseCrawler):
+    def get_grant_listing_urls(self):
+        return []
+    
+    def parse_grant_details(self, url):
+        return {}
+
+
+def _target_words() -> List[str]:
+    # Shared targets plus the extra ones of every crawler that can be imported here
+    words = list(DOCUMENT_TARGET_WORDS)
+    for path in SITE_CRAWLERS["regional"].values():
+        crawler_class = load_class(path)
+        if crawler_class is not None:
+            words += [word for word in crawler_class.document_target_words if word not in words]
+    return words
+
+
+def _fixture_texts() -> List[str]:
+    with open(os.path.join(FIXTURES_DIR, "document_texts.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _window_texts() -> List[str]:
+    # A keyword or exclusion at every distance around the edges of both context windows
+    texts = []
+    for target in ("visura camerale", "business plan"):
+        for phrase in ("allegare", "è richiesto", "non è necessario"):
+            for distance in range(190, 312):
+                filler = ("x" * (distance - 1)) + " "
+                texts.append(f"{target} {filler}{phrase}")
+                texts.append(f"{phrase} {filler}{target}")
+    return texts
+
+
+def _random_texts(count: int = 3000, seed: int = 1234) -> List[str]:
+    # Random mixes of targets (in any case), keywords, exclusions, accents and filler
+    rng = random.Random(seed)
+    vocabulary = DOCUMENT_TARGET_WORDS + VALIDATION_KEYWORDS + EXCLUSION_CONTEXTS
+    filler = ["il", "la", "domanda", "bando", "impresa", "è", "À", "perché", "più", "cf.", "iva,",
+              "(", ")", "«", "»", "-", "_", "'", "’", "\n", "2024", "x" * 150, "İ", "ß", "ﬁ"]
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 120)):
+            word = rng.choice(vocabulary) if rng.random() < 0.35 else rng.choice(filler)
+            case = rng.random()
+            if case < 0.15:
+                word = word.upper()
+            elif case < 0.3:
+                word = word.title()
+            words.append(word)
+        separator = rng.choice([" ", "  ", "", ", "])
+        texts.append(separator.join(words))
+    return texts
+
+
+TARGET_WORDS = _target_words()
+
+
+@pytest.fixture(scope="module")
+def crawler():
+    crawler = _Crawler("http://localhost")
+    yield crawler
+    crawler.close()
+
+
+@pytest.mark.parametrize("text", _fixture_texts())
+def test_fixture_corpus(crawler, text):
+    assert crawler.find_target_words(text, TARGET_WORDS) == linear_find_target_words(text, TARGET_WORDS)
+
+
+def test_context_window_edges(crawler):
+    for text in _window_texts():
+        assert crawler.find_target_words(text, TARGET_WORDS) == linear_find_target_words(text, TARGET_WORDS), text
+
+
+def test_random_texts(crawler):
+    for text in _random_texts():
+        assert crawler.find_target_words(text, TARGET_WORDS) == linear_find_target_words(text, TARGET_WORDS), text
+
+
+def test_overlapping_and_duplicate_targets(crawler):
+    # Targets that contain each other, given in both orders and repeated
+    targets = ["codice fiscale", "certificato codice fiscale", "attribuzione codice fiscale",
+               "pitch", "pitch deck", "elevator pitch", "IVA annuale", "partita IVA", "partita iva", "pitch"]
+    for text in _fixture_texts() + _random_texts(500, seed=99):
+        for ordered in (targets, targets[::-1]):
+            assert crawler.find_target_words(text, ordered) == linear_find_target_words(text, ordered), text
+